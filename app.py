@@ -1,21 +1,48 @@
 import streamlit as st
-import requests
-from io import BytesIO
-from collections import Counter
-from datetime import datetime
-
-# PDF Generation
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
-
-# DOCX Generation
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+import os
+import time
+from datetime import date, datetime, timedelta
+
+from desinfo.analysis import AnalysisError, analyze_statements, iter_analysis, previous_results
+from desinfo.api import (
+    BATCH_MAX_WORKERS,
+    BATCH_SIZE,
+    DEFAULT_API_BASE_URL,
+    TRANSPORT_GET,
+    TRANSPORT_POST_NDJSON,
+    ApiClient,
+    build_http_session,
+)
+from desinfo.cache import ResultCache
+from desinfo.catalog import ModelCatalog
+from desinfo.compare import ModelComparison, compare_models, model_label
+from desinfo.history import HistoryStore
+from desinfo.ingest import (
+    SUPPORTED_TYPES,
+    IngestError,
+    csv_columns,
+    default_csv_column,
+    file_type,
+    iter_file_statements,
+)
+from desinfo.jobs import JOB_CANCELLED, JOB_DONE, Job, JobQueue, JobStore
+from desinfo.limiter import AdaptiveLimiter
+from desinfo.metrics import METRICS
+# PDF/DOCX Generation: reportlab und python-docx werden erst beim Generieren
+# eines Reports importiert (siehe desinfo/reports.py), damit Kaltstart und
+# Reruns sie nicht laden müssen.
+from desinfo.reports import ReportCache, comparison_digest, read_report, report_digest
+from desinfo.scoring import (
+    CATEGORIES,
+    CATEGORY_DESCRIPTIONS,
+    SCORE_GRADES,
+    AnalysisResult,
+    RunningSummary,
+    StatementResult,
+    calculate_summary,
+    get_category_hex,
+)
+from desinfo.text import SPLIT_LINES, SPLIT_SENTENCES, parse_statements
 
 # ============================================
 # KONFIGURATION
@@ -23,42 +50,80 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 try:
     API_BASE_URL = st.secrets["API_BASE_URL"]
 except:
-    API_BASE_URL = "http://217.154.156.197:8003"
+    API_BASE_URL = DEFAULT_API_BASE_URL
 
-MODELS_ENDPOINT = f"{API_BASE_URL}/desInfo/models"
-ANALYZE_ENDPOINT = f"{API_BASE_URL}/desInfo/generateReport"
+# HTTP: Connect- und Read-Timeouts getrennt konfigurierbar (st.secrets), Werte in Sekunden
+def get_secret(key: str, default):
+    """Read an optional setting from st.secrets, falling back to the default"""
+    try:
+        return type(default)(st.secrets[key])
+    except Exception:
+        return default
 
-LOGO_URL = "https://uzimkjbynnadffyvsohi.supabase.co/storage/v1/object/public/bilder/di_logo_300.png"
+CONNECT_TIMEOUT = get_secret("CONNECT_TIMEOUT", 5.0)
+MODELS_READ_TIMEOUT = get_secret("MODELS_READ_TIMEOUT", 10.0)
+ANALYZE_READ_TIMEOUT = get_secret("ANALYZE_READ_TIMEOUT", 300.0)
+HTTP_POOL_SIZE = get_secret("HTTP_POOL_SIZE", 32)      # Keep-Alive-Verbindungen pro Host, für alle Sessions
+HTTP_RETRIES = get_secret("HTTP_RETRIES", 3)           # bei 502/503/504 und Verbindungsaufbau-Fehlern
+HTTP_RETRY_BACKOFF = get_secret("HTTP_RETRY_BACKOFF", 0.5)
 
-# Debug Mode
-DEBUG_MODE = False  # Set to True to see debug output
+# Adaptives Limit paralleler Analyse-Requests, gemeinsam für alle Sessions
+LIMITER_INITIAL = get_secret("LIMITER_INITIAL", 8)
+LIMITER_MAX = get_secret("LIMITER_MAX", 64)
+LIMITER_LATENCY_TARGET = get_secret("LIMITER_LATENCY_TARGET", 60.0)  # Sekunden pro Request
 
-# Kategorie Scoring
-CATEGORY_POINTS = {
-    'FALSCH': 5,
-    'DELEGITIMIERUNG': 4,
-    'VERZERRUNG': 3,
-    'FRAME': 1,
-    'WAHR': 0
-}
+LOGO_URL = "https://uzimkjbynnadffyvsohi.supabase.co/storage/v1/object/public/bilder/di_logo_300.png"
 
-# Score-Grade Mapping
-SCORE_GRADES = {
-    'A': (0.0, 0.4, 'wahr', 'Die Aussagen entsprechen nachprüfbaren Fakten und sind wahrheitsgetreu.'),
-    'B': (0.5, 1.4, 'geframed', 'Die Aussagen enthalten wahre Kernaussagen, die durch normative Framings eingefärbt werden.'),
-    'C': (1.5, 2.4, 'verzerrend', 'Die Aussagen enthalten formal richtige Kernaussagen, die durch Übertreibung, Verkürzung oder Kontextausblendung ein schiefes Bild erzeugen.'),
-    'D': (2.5, 3.4, 'demokratisch dysfunktional', 'Die Aussagen enthalten substanzielle Falschbehauptungen und delegitimierende Elemente, die den demokratischen Diskurs belasten.'),
-    'E': (3.5, 5.0, 'demokratisch destruktiv', 'Die Aussagen sind überwiegend falsch und delegitimierend, untergraben systematisch Vertrauen und demokratische Institutionen.')
+# Transport: GET mit Query-Parameter (kompatibel) oder POST mit gzip-JSON und NDJSON-Antwort
+TRANSPORT_OPTIONS = {
+    "GET (kompatibel)": TRANSPORT_GET,
+    "POST + NDJSON-Stream": TRANSPORT_POST_NDJSON
 }
 
-CATEGORY_DESCRIPTIONS = {
-    'FALSCH': 'Objektiv widerlegte Behauptungen. Es liegen belastbare Daten oder Ereignisprotokolle vor, die das Gegenteil zeigen.',
-    'DELEGITIMIERUNG': 'Abwertung oder Untergrabung von Personen, Gruppen oder Institutionen. Sprachliche Diskreditierungen, Kampfbegriffe oder systematische Diffamierungen.',
-    'VERZERRUNG': 'Formal richtige Kernaussagen, die durch Übertreibung, Verkürzung oder Kontextausblendung ein schiefes Bild erzeugen.',
-    'FRAME': 'Sprachliche Deutungsrahmen, die neutrale Sachverhalte emotional oder normativ aufladen.',
-    'WAHR': 'Sachlich zutreffende Aussagen, die überprüfbar sind und keinen überzogenen Frame, keine Verzerrung oder Delegitimierung enthalten.'
+# Live-Ansicht: pro Kategorie werden während der Analyse nur die neuesten Aussagen gezeigt
+LIVE_PREVIEW_ITEMS = 3
+LIVE_RENDER_INTERVAL = 0.5  # Sekunden zwischen zwei Aktualisierungen der Live-Ansicht
+
+# Aufteilung des Eingabetexts in Aussagen
+SPLIT_OPTIONS = {
+    "Eine Aussage pro Zeile oder mit | getrennt": SPLIT_LINES,
+    "Fließtext in Sätze teilen": SPLIT_SENTENCES
 }
 
+# Modellvergleich: abweichende Bewertungen, die direkt angezeigt werden
+DISAGREEMENT_PREVIEW_ITEMS = 50
+
+# Datei-Upload: Zähler der gefundenen Aussagen alle n Aussagen aktualisieren
+COUNTER_UPDATE_EVERY = 100
+
+# Ergebnisseite: Aussagen pro Kategorie seitenweise anzeigen
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+
+# Ergebnis-Cache: bereits bewertete Aussagen werden pro Model auf der Platte gespeichert
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+RESULT_CACHE_PATH = os.path.join(CACHE_DIR, "results.sqlite3")
+
+# Report-Cache: fertige PDF/DOCX-Dateien, adressiert über den Hash der Analyse
+REPORT_CACHE_DIR = os.path.join(CACHE_DIR, "reports")  # None = nicht auslagern
+# Reports in eigenen Prozessen rendern, damit andere Sessions nicht warten (0 = im Skript-Thread)
+REPORT_PROCESSES = get_secret("REPORT_PROCESSES", 2)
+
+# Model-Liste: letzter bekannter Stand, überlebt Neustarts des Prozesses
+MODELS_CACHE_PATH = os.path.join(CACHE_DIR, "models.json")
+
+# Hintergrund-Jobs: Analysen laufen im Prozess weiter, die Seite fragt den Stand ab
+JOB_STORE_PATH = os.path.join(CACHE_DIR, "jobs.sqlite3")
+JOB_POLL_INTERVAL = 1.0  # Sekunden
+
+# Verlauf: gespeicherte Analysen mit Sprecher:in, Medium und Datum für Trends
+HISTORY_PATH = os.path.join(CACHE_DIR, "history.sqlite3")
+HISTORY_DEFAULT_DAYS = 365  # voreingestellter Zeitraum der Verlaufsansicht
+HISTORY_PERIODS = {"Tag": 'day', "Woche": 'week', "Monat": 'month', "Jahr": 'year'}
+
+# Metriken zusätzlich als Prometheus-Text auf localhost:<Port>/metrics ausliefern (0 = aus)
+METRICS_PORT = get_secret("METRICS_PORT", 0)
+
 # ============================================
 # PAGE CONFIG - Force dark theme
 # ============================================
@@ -242,21 +307,23 @@ st.markdown("""
         text-align: center;
     }
     
+    /* Comparison Tables */
+    .compare-table {
+        width: 100%;
+        border-collapse: collapse;
+        margin: 1rem 0;
+    }
+    
+    .compare-table th, .compare-table td {
+        border: 1px solid #ddd;
+        padding: 0.5rem;
+        text-align: center;
+    }
+    
     /* Hide Streamlit Elements */
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
     .stDeployButton {display:none;}
-    
-    /* Debug Box */
-    .debug-box {
-        background: #f0f0f0;
-        border: 2px solid #666;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-        font-family: monospace;
-        font-size: 0.85rem;
-    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -264,352 +331,661 @@ st.markdown("""
 # HELPER FUNCTIONS
 # ============================================
 
-def debug_log(message):
-    """Print debug message if DEBUG_MODE is enabled"""
-    if DEBUG_MODE:
-        st.sidebar.markdown(f'<div class="debug-box">🐛 {message}</div>', unsafe_allow_html=True)
+@st.cache_resource
+def start_metrics_server(port: int):
+    """Serve the process-wide metrics once per process"""
+    return METRICS.serve(port)
+
+@st.cache_resource
+def get_api_client() -> ApiClient:
+    """Process-wide API client with one HTTP session shared by all Streamlit sessions"""
+    session = build_http_session(HTTP_POOL_SIZE, HTTP_RETRIES, HTTP_RETRY_BACKOFF)
+    limiter = AdaptiveLimiter(LIMITER_INITIAL, max_limit=LIMITER_MAX, latency_target=LIMITER_LATENCY_TARGET)
+    # Die Session wiederholt bereits; keine zweite Retry-Ebene pro Teilpaket
+    return ApiClient(API_BASE_URL, session, CONNECT_TIMEOUT, MODELS_READ_TIMEOUT, ANALYZE_READ_TIMEOUT,
+                     limiter=limiter, retries=0)
+
+@st.cache_resource
+def get_model_catalog() -> ModelCatalog:
+    """Process-wide model list, refreshed in the background and kept on disk"""
+    return ModelCatalog(get_api_client(), MODELS_CACHE_PATH)
 
-@st.cache_data(ttl=300)
 def fetch_models():
-    """Lädt verfügbare Models von API"""
-    try:
-        debug_log(f"Fetching models from: {MODELS_ENDPOINT}")
-        response = requests.get(MODELS_ENDPOINT, timeout=10)
-        debug_log(f"Response status: {response.status_code}")
-        
-        if response.ok:
-            data = response.json()
-            models = [m for m in data.get('models', []) if m.get('valid', False)]
-            debug_log(f"Found {len(models)} valid models")
-            return models
-        else:
-            debug_log(f"API Error: {response.status_code}")
-            return []
-    except Exception as e:
-        debug_log(f"Exception: {str(e)}")
-        st.error(f"⚠️ Fehler beim Laden der Models: {e}")
-        return []
-
-def parse_statements(text: str) -> list:
-    """Parse statements from text"""
-    if '|' in text:
-        statements = [s.strip() for s in text.split('|') if s.strip()]
-    else:
-        statements = [s.strip() for s in text.split('\n') if s.strip()]
-    return statements
+    """Verfügbare Models, ohne auf die API zu warten"""
+    return get_model_catalog().get()
 
-def call_api(statements: list, model_id: int) -> dict:
-    """Call DESINFO API"""
-    text_param = "|".join(statements)
-    params = {"modelID": model_id, "text": text_param}
-    
-    try:
-        response = requests.get(ANALYZE_ENDPOINT, params=params, timeout=300)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Add punkte field if not present
-        for item in data:
-            if 'punkte' not in item:
-                item['punkte'] = CATEGORY_POINTS.get(item['kategorie'], 0)
-        
-        return {"success": True, "data": data}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache shared by all sessions"""
+    return ResultCache(RESULT_CACHE_PATH)
 
-def calculate_summary(analysis_data: list) -> dict:
-    """Calculate summary statistics"""
-    category_counts = Counter(item['kategorie'] for item in analysis_data)
-    total_points = sum(CATEGORY_POINTS.get(item['kategorie'], 0) for item in analysis_data)
-    total_statements = len(analysis_data)
-    desinfo_score = total_points / total_statements if total_statements > 0 else 0
-    
-    grade = 'E'
-    grade_label = ''
-    grade_description = ''
-    
-    for g, (min_score, max_score, label, desc) in SCORE_GRADES.items():
-        if min_score <= desinfo_score <= max_score:
-            grade = g
-            grade_label = label
-            grade_description = desc
-            break
-    
-    return {
-        'total_statements': total_statements,
-        'category_counts': dict(category_counts),
-        'total_points': total_points,
-        'desinfo_score': round(desinfo_score, 1),
-        'grade': grade,
-        'grade_label': grade_label,
-        'grade_description': grade_description
-    }
+@st.cache_resource
+def get_report_cache() -> ReportCache:
+    """Process-wide report cache shared by all sessions; its worker processes are forked right away"""
+    report_cache = ReportCache(spill_dir=REPORT_CACHE_DIR, processes=REPORT_PROCESSES)
+    report_cache.start_workers()
+    return report_cache
 
-def get_category_color(category: str) -> tuple:
-    """Get hex and reportlab color for category"""
-    color_map = {
-        'FALSCH': ('#dc3545', colors.HexColor('#dc3545')),
-        'DELEGITIMIERUNG': ('#fd7e14', colors.HexColor('#fd7e14')),
-        'VERZERRUNG': ('#ffc107', colors.HexColor('#ffc107')),
-        'FRAME': ('#28a745', colors.HexColor('#28a745')),
-        'WAHR': ('#007bff', colors.HexColor('#007bff'))
-    }
-    return color_map.get(category, ('#6c757d', colors.grey))
-
-def generate_pdf_report(analysis_data: list, summary: dict, model_info: dict = None) -> BytesIO:
-    """Generate PDF report - NO LOGO"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        topMargin=2*cm,
-        bottomMargin=2*cm,
-        leftMargin=2.5*cm,
-        rightMargin=2.5*cm
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue; continues jobs left unfinished by a previous process"""
+    return JobQueue(JobStore(JOB_STORE_PATH), get_api_client(), get_result_cache())
+
+@st.cache_resource
+def get_history_store() -> HistoryStore:
+    """Process-wide history of saved analyses"""
+    return HistoryStore(HISTORY_PATH)
+
+# ============================================
+# RENDER HELPERS
+# ============================================
+
+def render_metrics_panel():
+    """Backend limit, p50/p95 per instrumented stage, counters and the raw dumps"""
+    snapshot = METRICS.snapshot()
+    gauges = snapshot['gauges']
+    if 'limiter_limit' in gauges:
+        st.caption(f"Backend-Limit: {gauges['limiter_limit']} parallel · {gauges['limiter_inflight']} laufend · "
+                   f"{gauges['limiter_queue_depth']} wartend")
+    if not snapshot['stages'] and not snapshot['counters']:
+        st.caption("Noch keine Messwerte.")
+        return
+    if snapshot['stages']:
+        st.dataframe(
+            [
+                {
+                    'Stufe': stage,
+                    'n': values['count'],
+                    'p50 ms': round(values['p50'] * 1000, 2),
+                    'p95 ms': round(values['p95'] * 1000, 2)
+                }
+                for stage, values in snapshot['stages'].items()
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+    st.caption(" · ".join(f"{name}: {value}" for name, value in snapshot['counters'].items()))
+    st.download_button("Metriken (JSON)", METRICS.to_json(), file_name="desinfo_metrics.json", mime="application/json")
+    if METRICS_PORT:
+        st.caption(f"Prometheus: http://127.0.0.1:{METRICS_PORT}/metrics")
+
+def render_score_box(summary: dict) -> str:
+    """HTML for the DESINFO score box"""
+    return f"""
+    <div class="score-box">
+        <div class="score-value">{summary['desinfo_score']}</div>
+        <div class="score-grade">Grade {summary['grade']}</div>
+        <div class="score-label">{summary['grade_label']}</div>
+    </div>
+    """
+
+def render_metric_card(category: str, count: int, percentage: float) -> str:
+    """HTML for one quantification card"""
+    hex_color = get_category_hex(category)
+    return f"""
+    <div class="metric-card" style="background: {hex_color};">
+        <div class="metric-value">{count}</div>
+        <div class="metric-label">{category}</div>
+        <div class="metric-percent">{percentage:.0f}%</div>
+    </div>
+    """
+
+def render_category_header(category: str, count: int) -> str:
+    """HTML for a category heading with its description"""
+    hex_color = get_category_hex(category)
+    return (
+        f'<div class="category-header" style="border-bottom-color: {hex_color};">{category} ({count} Aussagen)</div>'
+        f'<div class="category-description">{CATEGORY_DESCRIPTIONS[category]}</div>'
     )
-    
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=24,
-        leading=28,
-        textColor=colors.black,
-        spaceAfter=20,
-        alignment=TA_LEFT,
-        fontName='Helvetica-Bold'
+
+def render_statement_card(idx: int, item: StatementResult) -> str:
+    """HTML for one statement card"""
+    category = item.kategorie
+    hex_color = get_category_hex(category)
+    return f"""
+    <div class="statement-card" style="border-left-color: {hex_color};">
+        <div class="statement-title">{idx}. "{item.aussage}"</div>
+        <span class="category-badge badge-{category.lower()}">{category}</span>
+        <span class="category-badge" style="background: #6c757d;">Punkte: {item.punkte}</span>
+        <div class="statement-text" style="margin-top: 1rem;"><strong>Begründung:</strong> {item.begruendung}</div>
+    </div>
+    """
+
+def render_statement_page(items: list, start: int) -> str:
+    """HTML for one page of statement cards, sent as a single delta"""
+    return ''.join(render_statement_card(idx, item) for idx, item in enumerate(items, start + 1))
+
+def change_page(category: str, delta: int):
+    """Pagination button callback"""
+    st.session_state[f'page_{category}'] = st.session_state.get(f'page_{category}', 0) + delta
+
+def reset_pagination():
+    """Jump back to the first page of every category"""
+    for category in CATEGORIES:
+        st.session_state[f'page_{category}'] = 0
+
+def render_paginated_category(category: str, items: list):
+    """Render the visible page of a category with its navigation"""
+    page_size = st.session_state.get('page_size', DEFAULT_PAGE_SIZE)
+    page_count = max(1, -(-len(items) // page_size))
+    page = min(max(st.session_state.get(f'page_{category}', 0), 0), page_count - 1)
+    st.session_state[f'page_{category}'] = page
+    
+    start = page * page_size
+    st.markdown(render_statement_page(items[start:start + page_size], start), unsafe_allow_html=True)
+    
+    if page_count > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            st.button("◀ Zurück", key=f"prev_{category}", disabled=page == 0,
+                      on_click=change_page, args=(category, -1), use_container_width=True)
+        with info_col:
+            st.markdown(
+                f'<div style="text-align: center;">Seite {page + 1} von {page_count} '
+                f'(Aussagen {start + 1}–{min(start + page_size, len(items))} von {len(items)})</div>',
+                unsafe_allow_html=True
+            )
+        with next_col:
+            st.button("Weiter ▶", key=f"next_{category}", disabled=page >= page_count - 1,
+                      on_click=change_page, args=(category, 1), use_container_width=True)
+
+def render_matrix_table(row_labels: list, col_labels: list, cells: list) -> str:
+    """HTML table for the agreement and confusion matrices"""
+    head = ''.join(f'<th>{label}</th>' for label in col_labels)
+    body = ''.join(
+        f'<tr><th>{label}</th>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>'
+        for label, row in zip(row_labels, cells)
     )
-    
-    heading_style = ParagraphStyle(
-        'Heading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        leading=20,
-        textColor=colors.black,
-        spaceAfter=10,
-        spaceBefore=15,
-        fontName='Helvetica-Bold'
+    return f'<table class="compare-table"><tr><th></th>{head}</tr>{body}</table>'
+
+def render_disagreement(idx: int, statement: str, runs: list, categories: list) -> str:
+    """HTML for one statement the models classified differently"""
+    badges = ''.join(
+        f'<span class="category-badge" style="background: {get_category_hex(cat)};">{run.label}: {cat or "–"}</span>'
+        for run, cat in zip(runs, categories)
     )
+    return f"""
+    <div class="statement-card" style="border-left-color: #2c5f7d;">
+        <div class="statement-title">{idx + 1}. "{statement}"</div>
+        <div>{badges}</div>
+    </div>
+    """
+
+def render_comparison(comparison: ModelComparison):
+    """Per-model scores, agreement and confusion matrices, disagreements and report downloads"""
+    st.markdown('<div class="section-title">🔀 Modellvergleich</div>', unsafe_allow_html=True)
+    st.caption(f"Gesamtdauer {comparison.elapsed:.1f} s (parallel, langsamstes Model "
+               f"{max(run.elapsed for run in comparison.runs):.1f} s)")
+    
+    for col, run in zip(st.columns(len(comparison.runs)), comparison.runs):
+        with col:
+            if run.ok:
+                st.metric(run.label, run.summary['desinfo_score'],
+                          f"Grade {run.summary['grade']}: {run.summary['grade_label']}", delta_color="off")
+                st.caption(f"{run.elapsed:.1f} s")
+            else:
+                st.error(f"{run.label}: {run.error}")
+    
+    runs = comparison.ok_runs
+    if len(runs) > 1:
+        labels = [run.label for run in runs]
+        st.markdown("**Übereinstimmung** (Anteil gleicher Kategorien)")
+        cells = [[f"{value:.0%}" for value in row] for row in comparison.agreement_matrix()]
+        st.markdown(render_matrix_table(labels, labels, cells), unsafe_allow_html=True)
+        
+        run_options = {run.label: run for run in runs}
+        col_a, col_b = st.columns(2)
+        with col_a:
+            label_a = st.selectbox("Konfusionsmatrix: Zeilen", options=labels, index=0, key="confusion_a")
+        with col_b:
+            label_b = st.selectbox("Spalten", options=labels, index=1, key="confusion_b")
+        run_a, run_b = run_options[label_a], run_options[label_b]
+        counts = comparison.confusion(run_a, run_b)
+        agreement, kappa = comparison.agreement(run_a, run_b)
+        cells = [[counts.get((cat_a, cat_b), 0) for cat_b in CATEGORIES] for cat_a in CATEGORIES]
+        st.markdown(render_matrix_table(CATEGORIES, CATEGORIES, cells), unsafe_allow_html=True)
+        st.caption(f"Übereinstimmung {agreement:.0%}, Cohens Kappa {kappa:.2f}")
+    
+    disagreements = comparison.disagreements()
+    with st.expander(f"⚖️ Abweichende Bewertungen ({len(disagreements)})"):
+        shown = disagreements[:DISAGREEMENT_PREVIEW_ITEMS]
+        html = ''.join(render_disagreement(idx, statement, runs, cats) for idx, statement, cats in shown)
+        st.markdown(html, unsafe_allow_html=True)
+        if len(disagreements) > len(shown):
+            st.caption(f"… und {len(disagreements) - len(shown)} weitere, vollständig im Vergleichsreport")
+    
+    report_cache = get_report_cache()
+    digest = comparison_digest(comparison)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    downloads = [
+        ('pdf', "📄 Vergleich als PDF", "application/pdf"),
+        ('docx', "📝 Vergleich als DOCX", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+    ]
+    for col, (fmt, label, mime) in zip(st.columns(2), downloads):
+        with col:
+            report_bytes = read_report(report_cache.get(f"{digest}.compare.{fmt}"))
+            if report_bytes is None and st.button(label, use_container_width=True, key=f"compare_{fmt}"):
+                with st.spinner("Generiere Vergleichsreport..."):
+                    report_bytes = read_report(report_cache.get_or_render_comparison(fmt, comparison, digest))
+            if report_bytes is not None:
+                st.download_button(
+                    label=f"⬇️ {label.split(' ', 1)[1]} herunterladen",
+                    data=report_bytes,
+                    file_name=f"DesInfo_Vergleich_{timestamp}.{fmt}",
+                    mime=mime,
+                    use_container_width=True,
+                    key=f"compare_download_{fmt}"
+                )
     
-    body_style = ParagraphStyle(
-        'Body',
-        parent=styles['Normal'],
-        fontSize=11,
-        leading=15,
-        alignment=TA_JUSTIFY,
-        fontName='Helvetica'
-    )
+    st.markdown("<br><br>", unsafe_allow_html=True)
+
+def render_history_form(analysis_id: int):
+    """Add or correct speaker, outlet and date of the shown analysis in the history"""
+    store = get_history_store()
+    metadata = store.metadata(analysis_id) if analysis_id is not None else None
+    if metadata is None:
+        return
+    speaker, outlet, day = metadata
+    st.caption("✅ Automatisch im Verlauf gespeichert. Sprecher:in, Medium und Datum lassen sich hier ergänzen.")
+    with st.form(f"history_form_{analysis_id}"):
+        col1, col2, col3 = st.columns(3)
+        speaker = col1.text_input("Sprecher:in", value=speaker)
+        outlet = col2.text_input("Medium", value=outlet)
+        day = col3.date_input("Datum der Aussagen", value=day, format="DD.MM.YYYY")
+        if st.form_submit_button("🗂️ Angaben speichern", use_container_width=True):
+            store.update(analysis_id, speaker, outlet, day)
+            st.caption("✅ Angaben gespeichert")
+
+def render_history():
+    """Aggregated score, grade distribution, category shares and trend of the saved analyses"""
+    store = get_history_store()
+    st.markdown("### 🗂️ Verlauf")
+    first, last = store.date_range()
+    if first is None:
+        st.info("Noch keine Analysen im Verlauf. Jede abgeschlossene Analyse wird hier automatisch gespeichert.")
+        return
+    
+    first, last = date.fromisoformat(first), date.fromisoformat(last)
+    models = store.models()
+    col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 2, 1])
+    with col1:
+        selected_range = st.date_input(
+            "Zeitraum",
+            value=(max(first, last - timedelta(days=HISTORY_DEFAULT_DAYS)), last),
+            format="DD.MM.YYYY",
+            key="history_range"
+        )
+    with col2:
+        speaker = st.selectbox("Sprecher:in", [None] + store.values('speaker'), format_func=lambda v: v or "Alle")
+    with col3:
+        outlet = st.selectbox("Medium", [None] + store.values('outlet'), format_func=lambda v: v or "Alle")
+    with col4:
+        model_id = st.selectbox("Model", [None] + list(models), format_func=lambda v: models[v] if v else "Alle")
+    with col5:
+        period = HISTORY_PERIODS[st.selectbox("Zeitachse", list(HISTORY_PERIODS), index=2)]
+    
+    # Während der Auswahl liefert date_input nur das Startdatum
+    start, end = selected_range if len(selected_range) == 2 else (selected_range[0], selected_range[0])
+    filters = dict(speaker=speaker, outlet=outlet, model_id=model_id)
+    summary = store.summary(start, end, **filters)
+    if not summary['total_statements']:
+        st.info("Keine gespeicherten Analysen im gewählten Zeitraum.")
+        return
+    
+    st.markdown(render_score_box(summary), unsafe_allow_html=True)
+    st.caption(f"{summary['analyses']} Analysen · {summary['total_statements']} Aussagen")
+    
+    st.markdown('<div class="section-title">📊 Kategorien</div>', unsafe_allow_html=True)
+    for col, cat in zip(st.columns(5), CATEGORIES):
+        with col:
+            st.markdown(render_metric_card(cat, summary['category_counts'].get(cat, 0), summary['category_shares'][cat]),
+                        unsafe_allow_html=True)
+    
+    trend = store.trend(start, end, period, **filters)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.markdown('<div class="section-title">📈 DESINFO-Score</div>', unsafe_allow_html=True)
+        st.line_chart(
+            {'Zeitraum': [entry['period'] for entry in trend], 'Score': [entry['desinfo_score'] for entry in trend]},
+            x='Zeitraum', y='Score'
+        )
+    with col2:
+        st.markdown('<div class="section-title">🎓 Grades der Analysen</div>', unsafe_allow_html=True)
+        grades = list(SCORE_GRADES)
+        st.bar_chart(
+            {'Grade': grades, 'Analysen': [summary['grade_counts'].get(grade, 0) for grade in grades]},
+            x='Grade', y='Analysen'
+        )
     
-    italic_style = ParagraphStyle(
-        'Italic',
-        parent=body_style,
-        fontName='Helvetica-Oblique'
+    st.markdown('<div class="section-title">🧮 Kategorien im Zeitverlauf</div>', unsafe_allow_html=True)
+    st.bar_chart(
+        {'Zeitraum': [entry['period'] for entry in trend],
+         **{cat: [entry['category_counts'].get(cat, 0) for entry in trend] for cat in CATEGORIES}},
+        x='Zeitraum', y=CATEGORIES, color=[get_category_hex(cat) for cat in CATEGORIES]
     )
-    
-    # Title
-    elements.append(Paragraph("Vollständige Auswertung", title_style))
-    elements.append(Spacer(1, 0.3*cm))
-    
-    # Line
-    line = Table([['']], colWidths=[16*cm])
-    line.setStyle(TableStyle([('LINEABOVE', (0,0), (-1,0), 1, colors.grey)]))
-    elements.append(line)
-    elements.append(Spacer(1, 0.8*cm))
-    
-    # Summary
-    elements.append(Paragraph("Zusammenfassung", heading_style))
-    total = summary['total_statements']
-    
-    summary_text = f"Die vorliegende Analyse untersucht {total} Aussagen nach ihrer faktischen Richtigkeit und kommunikativen Qualität. Das Ergebnis zeigt eine ausgeprägte Tendenz zu {summary['grade_label']}en Darstellungen."
-    
-    elements.append(Paragraph(summary_text, body_style))
-    elements.append(Spacer(1, 0.8*cm))
-    elements.append(line)
-    elements.append(Spacer(1, 0.8*cm))
-    
-    # Quantification
-    elements.append(Paragraph("Quantifizierung", heading_style))
-    elements.append(Paragraph(f"Anzahl Aussagen gesamt: {total}", body_style))
-    elements.append(Spacer(1, 0.3*cm))
-    
-    counts = summary['category_counts']
-    for cat in ['FALSCH', 'DELEGITIMIERUNG', 'VERZERRUNG', 'FRAME', 'WAHR']:
-        count = counts.get(cat, 0)
-        percentage = (count / total * 100) if total > 0 else 0
-        hex_color, _ = get_category_color(cat)
-        cat_text = f'<font color="{hex_color}">■</font> {cat}: {count} ({percentage:.0f} %)'
-        elements.append(Paragraph(cat_text, body_style))
-    
-    elements.append(Spacer(1, 0.8*cm))
-    elements.append(line)
-    elements.append(Spacer(1, 0.8*cm))
-    
-    # Scoring
-    elements.append(Paragraph("Scoring", heading_style))
-    score_text = f"<b>Desinfo-Score: {summary['desinfo_score']}</b><br/>{summary['grade']}: {summary['grade_label']}<br/><br/>{summary['grade_description']}"
-    elements.append(Paragraph(score_text, body_style))
-    elements.append(Spacer(1, 0.8*cm))
-    elements.append(line)
-    elements.append(Spacer(1, 0.8*cm))
-    
-    # Grade Scale
-    elements.append(Paragraph("Einteilung", heading_style))
-    for grade, (min_s, max_s, label, _) in SCORE_GRADES.items():
-        elements.append(Paragraph(f"{grade}: {min_s} bis {max_s}: {label}", body_style))
-    
-    elements.append(PageBreak())
-    
-    # Detailed Results
-    elements.append(Paragraph("Vollständige Auswertung des Textes", title_style))
-    elements.append(Spacer(1, 0.3*cm))
-    elements.append(line)
-    elements.append(Spacer(1, 0.8*cm))
-    
-    categories_order = ['FALSCH', 'DELEGITIMIERUNG', 'VERZERRUNG', 'FRAME', 'WAHR']
-    
-    for category in categories_order:
-        cat_items = [item for item in analysis_data if item['kategorie'] == category]
-        if not cat_items:
+
+def store_analysis(analysis_data: list, model: dict, history_key: str = None, partial: bool = False):
+    """Store a finished analysis and the model that produced it in the session and the history
+    
+    history_key identifies a source that may be stored again (a reloaded job); it
+    then replaces its earlier history entry, as does the analysis of an edited input.
+    Partial results are only shown, not recorded. Reports are optionally pre-rendered.
+    """
+    st.session_state.analysis_data = analysis_data
+    st.session_state.analysis_model = model
+    st.session_state.analysis_partial = partial
+    if analysis_data and not partial:
+        st.session_state.history_id = get_history_store().record(
+            analysis_data, model, source_key=history_key, replaces=st.session_state.get('replaced_history_id')
+        )
+        st.session_state.replaced_history_id = None
+    else:
+        st.session_state.history_id = None
+    st.session_state.analysis_result = AnalysisResult(analysis_data)
+    st.session_state.summary = calculate_summary(st.session_state.analysis_result)
+    st.session_state.report_digest = report_digest(analysis_data, st.session_state.summary, model)
+    st.session_state.comparison = None
+    reset_pagination()
+    if st.session_state.get('prerender_reports'):
+        get_report_cache().prerender(st.session_state.analysis_result, st.session_state.summary, model)
+
+def keep_partial_results(model: dict):
+    """Cancel button callback: show the results received so far"""
+    partial = [item for item in st.session_state.get('partial_results') or [] if item is not None]
+    if partial:
+        store_analysis(partial, model, partial=True)
+    st.session_state.partial_results = None
+
+class StatementCounter:
+    """Pass-through over a statement stream that counts (and shows) the statements found so far"""
+    
+    def __init__(self, statements, placeholder=None):
+        self.statements = statements
+        self.placeholder = placeholder
+        self.found = len(statements) if isinstance(statements, list) else 0
+        self.finished = isinstance(statements, list)
+    
+    def __iter__(self):
+        if self.finished:
+            yield from self.statements
+            return
+        for statement in self.statements:
+            self.found += 1
+            if self.placeholder is not None and self.found % COUNTER_UPDATE_EVERY == 0:
+                self.placeholder.caption(f"📄 {self.found} Aussagen gefunden, Datei wird gelesen …")
+            yield statement
+        self.finished = True
+        if self.placeholder is not None:
+            self.placeholder.caption(f"📄 {self.found} Aussagen gefunden")
+
+def live_placeholders() -> tuple:
+    """Empty slots for the score box, the category cards and the newest statements per category"""
+    score_placeholder = st.empty()
+    st.markdown('<div class="section-title">📊 Quantifizierung</div>', unsafe_allow_html=True)
+    card_placeholders = [col.empty() for col in st.columns(5)]
+    st.markdown('<div class="section-title">📋 Detaillierte Ergebnisse</div>', unsafe_allow_html=True)
+    category_placeholders = {cat: st.empty() for cat in CATEGORIES}
+    return score_placeholder, card_placeholders, category_placeholders
+
+def running_summary(analysis_data: list) -> RunningSummary:
+    """RunningSummary of the results received so far, for a single render"""
+    tally = RunningSummary(LIVE_PREVIEW_ITEMS)
+    for item in analysis_data:
+        tally.add(item)
+    return tally
+
+def render_live_results(tally: RunningSummary, placeholders: tuple):
+    """Fill the live_placeholders slots from the running counts and newest statements"""
+    score_placeholder, card_placeholders, category_placeholders = placeholders
+    score_placeholder.markdown(render_score_box(tally.summary()), unsafe_allow_html=True)
+    for placeholder, cat in zip(card_placeholders, CATEGORIES):
+        placeholder.markdown(render_metric_card(cat, tally.counts.get(cat, 0), tally.percentage(cat)),
+                             unsafe_allow_html=True)
+    
+    for cat in CATEGORIES:
+        count = tally.counts.get(cat, 0)
+        if not count:
             continue
-        
-        elements.append(Paragraph(f"<b>{category} ({len(cat_items)})</b>", heading_style))
-        elements.append(Paragraph(CATEGORY_DESCRIPTIONS[category], italic_style))
-        elements.append(Spacer(1, 0.5*cm))
-        
-        for idx, item in enumerate(cat_items, 1):
-            hex_color, _ = get_category_color(category)
-            symbol = '✓' if category == 'WAHR' else '■'
-            
-            stmt_text = f'{idx}. <font color="{hex_color}">{symbol}</font> <b>"{item["aussage"]}"</b>'
-            elements.append(Paragraph(stmt_text, body_style))
-            elements.append(Spacer(1, 0.2*cm))
+        newest = tally.newest[cat]
+        first_idx = count - len(newest) + 1
+        html = render_category_header(cat, count)
+        html += ''.join(render_statement_card(i, item) for i, item in enumerate(newest, first_idx))
+        if count > len(newest):
+            html += f'<p><em>… und {count - len(newest)} weitere</em></p>'
+        category_placeholders[cat].markdown(html, unsafe_allow_html=True)
+
+def eta_text(elapsed: float, scored: int, remaining: int) -> str:
+    """Remaining time extrapolated from the statements the backend scored so far (cache hits excluded)"""
+    if not scored or remaining <= 0:
+        return ""
+    return f" · noch ca. {elapsed / scored * remaining:.0f} s"
+
+def run_live_analysis(statements, model: dict, **options) -> dict:
+    """Run iter_analysis and fill score, cards and categories as batches complete"""
+    counter = statements if isinstance(statements, StatementCounter) else StatementCounter(statements)
+    results = []
+    st.session_state.partial_results = results
+    
+    progress = st.progress(0.0, text=f"0 / {counter.found} Aussagen")
+    st.button("⏹️ Abbrechen und Teilergebnis anzeigen", on_click=keep_partial_results, args=(model,))
+    placeholders = live_placeholders()
+    
+    tally = RunningSummary(LIVE_PREVIEW_ITEMS)
+    started = time.time()
+    rendered = 0.0
+    done = 0
+    scored = 0  # ohne Cache-Treffer, Basis für die ETA
+    cache_hits = 0
+    
+    def render():
+        total = counter.found
+        if not counter.finished:
+            status = " gefunden · Datei wird noch gelesen"
+        else:
+            status = eta_text(time.time() - started, scored, total - done)
+        progress.progress(min(done / total, 1.0) if total else 1.0, text=f"{done} / {total} Aussagen{status}")
+        render_live_results(tally, placeholders)
+    
+    try:
+        for updates, from_cache in iter_analysis(counter, model['modelID'], **options):
+            for idx, item in updates:
+                if idx >= len(results):
+                    results.extend([None] * (idx + 1 - len(results)))
+                if results[idx] is None:
+                    tally.add(item)
+                results[idx] = item
+            done += len(updates)
+            if from_cache:
+                cache_hits += len(updates)
+            else:
+                scored += len(updates)
             
-            beg_text = f"– {item['begründung']}"
-            elements.append(Paragraph(beg_text, body_style))
-            elements.append(Spacer(1, 0.5*cm))
-        
-        elements.append(Spacer(1, 0.5*cm))
-    
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
-
-def get_docx_color(category: str) -> tuple:
-    """Get RGB color tuple for DOCX (R, G, B values 0-255)"""
-    color_map = {
-        'FALSCH': (220, 53, 69),        # Red
-        'DELEGITIMIERUNG': (253, 126, 20),  # Orange  
-        'VERZERRUNG': (255, 193, 7),    # Yellow
-        'FRAME': (40, 167, 69),         # Green
-        'WAHR': (0, 123, 255)           # Blue
+            # Mit NDJSON kommt jede Zeile einzeln: höchstens alle LIVE_RENDER_INTERVAL Sekunden neu zeichnen
+            if time.time() - rendered >= LIVE_RENDER_INTERVAL:
+                render()
+                rendered = time.time()
+    except AnalysisError as e:
+        render()
+        st.session_state.partial_results = None
+        return {"success": False, "error": str(e)}
+    
+    render()
+    st.session_state.partial_results = None
+    return {
+        "success": True,
+        "data": [item for item in results if item is not None],
+        "cache_hits": cache_hits,
+        "total": counter.found
     }
-    return color_map.get(category, (108, 117, 125))  # Default grey
 
-def generate_docx_report(analysis_data: list, summary: dict, model_info: dict = None) -> BytesIO:
-    """Generate DOCX report with colors"""
-    doc = Document()
+def run_comparison(statements: list, models: list, **options) -> ModelComparison:
+    """Run compare_models with one progress bar per model"""
+    bars = {model['modelID']: st.progress(0.0, text=f"{model_label(model)}: 0 / {len(statements)}") for model in models}
     
-    doc.add_heading('Vollständige Auswertung', 0)
-    doc.add_heading('Zusammenfassung', 1)
+    def progress(model: dict, done: int, total: int):
+        bars[model['modelID']].progress(done / total if total else 1.0, text=f"{model_label(model)}: {done} / {total}")
     
-    total = summary['total_statements']
-    summary_text = f"Die vorliegende Analyse untersucht {total} Aussagen nach ihrer faktischen Richtigkeit und kommunikativen Qualität."
-    doc.add_paragraph(summary_text)
+    return compare_models(statements, models, progress, **options)
+
+def start_analysis(statements, description: str):
+    """Analyse statements (a list or a lazy stream) with the sidebar settings and show the results"""
+    model = st.session_state.selected_model
+    model_id = model['modelID']
+    model_name = model['modelName']
+    
+    # Nach "Eingabe bearbeiten": unveränderte Aussagen werden aus der vorigen Analyse übernommen,
+    # wenn sie mit demselben Model bewertet wurden
+    previous = st.session_state.get('previous_analysis')
+    known = previous_results(previous[1]) if previous and previous[0] == model_id else None
+    
+    options = dict(
+        transport=st.session_state.transport,
+        batched=st.session_state.batch_mode,
+        cache=get_result_cache() if st.session_state.use_cache else None,
+        client=get_api_client()
+    )
     
-    doc.add_heading('Quantifizierung', 1)
-    doc.add_paragraph(f"Anzahl Aussagen gesamt: {total}")
+    compare_with = st.session_state.get('compare_models', []) if st.session_state.get('compare_mode') else []
+    
+    counter = StatementCounter(statements, st.empty())
+    if st.session_state.background_jobs and not compare_with:
+        try:
+            statements = list(counter)
+        except IngestError as e:
+            st.error(f"❌ Datei konnte nicht gelesen werden: {e}")
+            return
+        job_id = get_job_queue().submit(statements, model_id, st.session_state.transport,
+                                        st.session_state.batch_mode, st.session_state.use_cache, known)
+        st.session_state.job_id = job_id
+        st.experimental_set_query_params(job=job_id)
+        st.rerun()
+    
+    if compare_with:
+        models = [model] + compare_with
+        with st.spinner(f"🔀 Vergleiche {len(models)} Models für {description}..."):
+            try:
+                comparison = run_comparison(list(counter), models, **options)
+            except IngestError as e:
+                st.error(f"❌ Datei konnte nicht gelesen werden: {e}")
+                return
+            primary = comparison.runs[0]
+            if not primary.ok:
+                st.error(f"❌ API Fehler ({primary.label}): {primary.error}")
+                return
+            store_analysis(primary.result.to_list(), model)
+            st.session_state.comparison = comparison
+            st.session_state.last_cache_stats = None
+            st.balloons()
+            st.rerun()
     
-    # Add colored category counts
-    counts = summary['category_counts']
-    for cat in ['FALSCH', 'DELEGITIMIERUNG', 'VERZERRUNG', 'FRAME', 'WAHR']:
-        count = counts.get(cat, 0)
-        percentage = (count / total * 100) if total > 0 else 0
+    with st.spinner(f"🔍 Analysiere {description} mit {model_name}..."):
+        try:
+            if st.session_state.live_view:
+                result = run_live_analysis(counter, model, known=known, **options)
+            else:
+                result = analyze_statements(counter, model_id, known=known, **options)
+        except IngestError as e:
+            st.session_state.partial_results = None
+            st.error(f"❌ Datei konnte nicht gelesen werden: {e}")
+            return
         
-        # Create paragraph with colored bullet
-        p = doc.add_paragraph()
-        
-        # Add colored bullet point
-        bullet_run = p.add_run("■ ")
-        r, g, b = get_docx_color(cat)
-        bullet_run.font.color.rgb = RGBColor(r, g, b)
-        bullet_run.font.size = Pt(12)
-        
-        # Add category text
-        text_run = p.add_run(f"{cat}: {count} ({percentage:.0f} %)")
-        text_run.font.size = Pt(11)
-    
-    doc.add_heading('Scoring', 1)
-    
-    # Score with colored background effect
-    score_p = doc.add_paragraph()
-    score_run = score_p.add_run(f"Desinfo-Score: {summary['desinfo_score']}")
-    score_run.bold = True
-    score_run.font.size = Pt(12)
-    
-    doc.add_paragraph(f"{summary['grade']}: {summary['grade_label']}")
-    doc.add_paragraph(summary['grade_description'])
-    
-    doc.add_heading('Einteilung', 1)
-    for grade, (min_s, max_s, label, _) in SCORE_GRADES.items():
-        doc.add_paragraph(f"{grade}: {min_s} bis {max_s}: {label}")
-    
-    doc.add_page_break()
-    doc.add_heading('Vollständige Auswertung des Textes', 1)
-    
-    categories_order = ['FALSCH', 'DELEGITIMIERUNG', 'VERZERRUNG', 'FRAME', 'WAHR']
-    
-    for category in categories_order:
-        cat_items = [item for item in analysis_data if item['kategorie'] == category]
-        if not cat_items:
-            continue
-        
-        # Add colored category heading
-        heading = doc.add_heading(level=2)
-        heading_run = heading.add_run(f"{category} ({len(cat_items)})")
-        r, g, b = get_docx_color(category)
-        heading_run.font.color.rgb = RGBColor(r, g, b)
-        
-        # Category description
-        desc_p = doc.add_paragraph(CATEGORY_DESCRIPTIONS[category])
-        desc_p.italic = True
-        
-        # Statements with colored symbols
-        for idx, item in enumerate(cat_items, 1):
-            symbol = '✓' if category == 'WAHR' else '■'
-            
-            # Statement paragraph
-            stmt_p = doc.add_paragraph()
-            
-            # Add colored symbol and number
-            symbol_run = stmt_p.add_run(f'{idx}. {symbol} ')
-            symbol_run.bold = True
-            r, g, b = get_docx_color(category)
-            symbol_run.font.color.rgb = RGBColor(r, g, b)
-            
-            # Add statement text
-            stmt_run = stmt_p.add_run(f'"{item["aussage"]}"')
-            stmt_run.bold = True
-            
-            # Add reasoning
-            reason_p = doc.add_paragraph(f"– {item['begründung']}")
-            reason_p.style.font.size = Pt(10)
-    
-    buffer = BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
+        if result['success']:
+            st.session_state.last_cache_stats = (result['cache_hits'], result['total'])
+            store_analysis(result['data'], model)
+            st.balloons()
+            st.rerun()
+        else:
+            st.error(f"❌ API Fehler: {result['error']}")
+
+def reset_analysis(keep_input: bool = False):
+    """Back to the input; with keep_input the text stays and the results are reused for unchanged statements"""
+    if keep_input:
+        # Das Model der Analyse, nicht das inzwischen in der Sidebar gewählte
+        st.session_state.previous_analysis = (st.session_state.analysis_model['modelID'],
+                                              st.session_state.analysis_data)
+        # Die neue Analyse ersetzt den Verlaufseintrag der bearbeiteten (Teilergebnisse haben keinen)
+        st.session_state.replaced_history_id = (st.session_state.get('history_id')
+                                                or st.session_state.get('replaced_history_id'))
+    else:
+        st.session_state.previous_analysis = None
+        st.session_state.replaced_history_id = None
+        st.session_state.input_text = ""
+    st.session_state.analysis_data = None
+    st.session_state.analysis_model = None
+    st.session_state.analysis_result = None
+    st.session_state.summary = None
+    st.session_state.report_digest = None
+    st.session_state.comparison = None
+    clear_job()
+
+def clear_job():
+    """Detach the session (and the URL) from its background job"""
+    st.session_state.job_id = None
+    st.experimental_set_query_params()
+
+def load_job(job: Job, models: list):
+    """Show the results of a job; the URL keeps the job ID, so a reload shows them again"""
+    model = next((m for m in models if m['modelID'] == job.model_id), None)
+    if model:
+        st.session_state.selected_model = model
+    else:
+        # Model nicht mehr in der Liste: nur die ID ist bekannt
+        model = {'modelID': job.model_id, 'modelName': f"Model {job.model_id}", 'provider': "unbekannt"}
+    st.session_state.last_cache_stats = (job.cache_hits, job.total)
+    st.session_state.job_id = None
+    store_analysis(job.data, model, history_key=f"job:{job.job_id}", partial=job.status != JOB_DONE)
+
+def render_job(job: Job, models: list):
+    """Progress of a running job, or the options for a failed or cancelled one"""
+    queue = get_job_queue()
+    if not job.finished:
+        st.markdown("### ⏳ Analyse läuft im Hintergrund")
+        # ETA nur, solange der Job in diesem Prozess läuft (started_at wird nicht gespeichert)
+        status = eta_text(time.time() - job.started_at, job.scored, job.total - job.done) if job.started_at else ""
+        st.progress(job.done / job.total if job.total else 1.0, text=f"{job.done} / {job.total} Aussagen{status}")
+        st.caption("Die Analyse läuft auf dem Server weiter, auch wenn die Seite neu geladen oder geschlossen wird. "
+                   "Über den Link in der Adresszeile ist sie wieder erreichbar.")
+        st.button("⏹️ Abbrechen", on_click=queue.cancel, args=(job.job_id,))
+        partial = job.data
+        if partial and st.session_state.live_view:
+            render_live_results(running_summary(partial), live_placeholders())
+        elif partial:
+            st.markdown(render_score_box(calculate_summary(partial)), unsafe_allow_html=True)
+        return
+    
+    if job.status == JOB_CANCELLED:
+        st.warning(f"⏹️ Analyse abgebrochen nach {job.done} von {job.total} Aussagen.")
+    else:
+        st.error(f"❌ API Fehler nach {job.done} von {job.total} Aussagen: {job.error}")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.button("▶️ Fortsetzen", on_click=queue.restart, args=(job.job_id,), use_container_width=True,
+                  help="Sendet nur die noch fehlenden Aussagen.")
+    with col2:
+        st.button("📊 Teilergebnis anzeigen", on_click=load_job, args=(job, models), use_container_width=True,
+                  disabled=not job.done)
+    with col3:
+        st.button("🗑️ Verwerfen", on_click=clear_job, use_container_width=True)
 
 # ============================================
 # SESSION STATE - Simple initialization
 # ============================================
 if 'analysis_data' not in st.session_state:
     st.session_state.analysis_data = None
+    st.session_state.analysis_model = None
 if 'summary' not in st.session_state:
     st.session_state.summary = None
 if 'input_text' not in st.session_state:
     st.session_state.input_text = ""
+if 'job_id' not in st.session_state:
+    # Nach einem Reload oder Reconnect: Job aus der URL wieder aufnehmen
+    st.session_state.job_id = st.experimental_get_query_params().get('job', [None])[0]
+
+# Report-Worker forken, bevor Metrik-Server, Model-Katalog und Job-Queue eigene Threads starten
+get_report_cache()
+
+if METRICS_PORT:
+    start_metrics_server(METRICS_PORT)
 
 # ============================================
 # LOAD MODELS FIRST
@@ -620,10 +996,8 @@ valid_models = fetch_models()
 if 'selected_model' not in st.session_state:
     if valid_models and len(valid_models) > 0:
         st.session_state.selected_model = valid_models[0]
-        debug_log(f"Initialized with model: {valid_models[0]['modelName']}")
     else:
         st.session_state.selected_model = None
-        debug_log("No models available!")
 
 # ============================================
 # SIDEBAR
@@ -650,9 +1024,6 @@ with st.sidebar:
         else:
             current_index = 0
         
-        debug_log(f"Current index: {current_index}")
-        debug_log(f"Available options: {list(model_options.keys())}")
-        
         # Selectbox
         selected_label = st.selectbox(
             "Wähle ein Model:",
@@ -668,12 +1039,97 @@ with st.sidebar:
             st.write(f"**ID:** {model['modelID']}")
             st.write(f"**Name:** {model['modelName']}")
             st.write(f"**Provider:** {model['provider']}")
+        
+        catalog = get_model_catalog()
+        if catalog.last_error:
+            stand = datetime.fromtimestamp(catalog.fetched_at).strftime('%d.%m.%Y %H:%M')
+            st.caption(f"⚠️ Model-Liste vom {stand}, Aktualisierung fehlgeschlagen: {catalog.last_error}")
+        
+        if len(model_options) > 1:
+            st.toggle(
+                "Modellvergleich",
+                value=False,
+                key="compare_mode",
+                help="Analysiert dieselben Aussagen gleichzeitig mit mehreren Models und vergleicht die Bewertungen."
+            )
+            if st.session_state.compare_mode:
+                compare_labels = st.multiselect(
+                    "Vergleichen mit:",
+                    options=[label for label in model_options if label != selected_label]
+                )
+                st.session_state.compare_models = [model_options[label] for label in compare_labels]
     else:
         st.error("⚠️ Keine Models verfügbar")
         st.info("API-Verbindung prüfen")
     
     st.divider()
     
+    st.subheader("🗂️ Verlauf")
+    st.toggle(
+        "Verlauf anzeigen",
+        value=False,
+        key="show_history",
+        help="Score, Grades und Kategorien der gespeicherten Analysen nach Zeitraum, Sprecher:in, Medium und Model."
+    )
+    
+    st.divider()
+    
+    st.subheader("🚀 Performance")
+    st.toggle(
+        "Batch-Modus",
+        value=True,
+        key="batch_mode",
+        help=f"Teilt lange Texte in Pakete à {BATCH_SIZE} Aussagen und analysiert bis zu {BATCH_MAX_WORKERS} davon parallel."
+    )
+    transport_label = st.selectbox(
+        "Transport",
+        options=list(TRANSPORT_OPTIONS.keys()),
+        help="POST sendet den Text komprimiert im Body und liest die Ergebnisse zeilenweise. Ältere Backends fallen automatisch auf GET zurück."
+    )
+    st.session_state.transport = TRANSPORT_OPTIONS[transport_label]
+    st.toggle(
+        "Live-Ansicht",
+        value=True,
+        key="live_view",
+        help="Zeigt Score, Quantifizierung und Kategorien schon während der Analyse und erlaubt einen vorzeitigen Abbruch "
+             "(ohne Hintergrund-Jobs)."
+    )
+    st.toggle(
+        "Hintergrund-Jobs",
+        value=True,
+        key="background_jobs",
+        help="Analysen laufen als Job auf dem Server weiter, auch bei Reload oder Verbindungsabbruch. "
+             "Fertige Teilpakete werden gespeichert, ein abgebrochener Job setzt dort fort."
+    )
+    st.toggle(
+        "Ergebnis-Cache",
+        value=True,
+        key="use_cache",
+        help="Bereits bewertete Aussagen werden pro Model wiederverwendet und nicht erneut an das Backend geschickt."
+    )
+    st.toggle(
+        "Reports vorab erzeugen",
+        value=False,
+        key="prerender_reports",
+        help="Erzeugt PDF und DOCX direkt nach der Analyse im Hintergrund, damit der Download sofort bereitsteht."
+    )
+    if st.session_state.use_cache:
+        result_cache = get_result_cache()
+        if st.session_state.get('last_cache_stats'):
+            hits, total = st.session_state.last_cache_stats
+            st.metric("Cache-Trefferquote (letzte Analyse)", f"{hits / total:.0%}" if total else "–")
+        st.caption(f"Gesamt: {result_cache.hits} Treffer / {result_cache.misses} Fehlgriffe ({result_cache.hit_ratio:.0%})")
+    st.toggle(
+        "Performance-Panel",
+        value=False,
+        key="show_metrics",
+        help="Zeigt das aktuelle Backend-Limit, p50/p95 der Laufzeiten pro Stufe und die Zähler aller Sessions dieses Prozesses."
+    )
+    if st.session_state.show_metrics:
+        render_metrics_panel()
+    
+    st.divider()
+    
     st.subheader("📚 Kategorien")
     st.markdown("""
     🔴 **FALSCH** (5 Punkte)  
@@ -685,10 +1141,12 @@ with st.sidebar:
     
     if st.session_state.analysis_data is not None:
         st.divider()
+        if st.button("✏️ Eingabe bearbeiten", use_container_width=True,
+                     help="Zurück zum Text; beim erneuten Analysieren werden nur geänderte oder neue Aussagen gesendet."):
+            reset_analysis(keep_input=True)
+            st.rerun()
         if st.button("🔄 Neue Analyse", use_container_width=True):
-            st.session_state.analysis_data = None
-            st.session_state.summary = None
-            st.session_state.input_text = ""
+            reset_analysis()
             st.rerun()
 
 # ============================================
@@ -696,8 +1154,16 @@ with st.sidebar:
 # ============================================
 
 if not valid_models or len(valid_models) == 0:
+    catalog = get_model_catalog()
+    if catalog.loading:
+        # Erster Start ohne gespeicherte Liste: kurz warten und neu abfragen
+        st.info("⏳ Models werden geladen...")
+        time.sleep(0.5)
+        st.rerun()
     st.error("⚠️ Keine Models verfügbar. Bitte API-Verbindung prüfen.")
-    st.info(f"API Endpoint: {MODELS_ENDPOINT}")
+    if catalog.last_error:
+        st.caption(f"Letzter Fehler: {catalog.last_error}")
+    st.info(f"API Endpoint: {get_api_client().models_endpoint}")
     st.stop()
 
 # Logo
@@ -707,73 +1173,115 @@ st.markdown(f'<div class="logo-container"><img src="{LOGO_URL}" alt="Democracy I
 st.markdown('<div class="main-header">🔍 DESINFO</div>', unsafe_allow_html=True)
 st.markdown('<div class="subtitle">Demokratie-Intelligenz für politische Kommunikation</div>', unsafe_allow_html=True)
 
+# Hintergrund-Job der Session
+job = None
+if st.session_state.job_id and st.session_state.analysis_data is None:
+    job = get_job_queue().get(st.session_state.job_id)
+    if job is None:
+        st.warning("⚠️ Der Analyse-Job wurde nicht gefunden (abgelaufen oder gelöscht).")
+        clear_job()
+    elif job.status == JOB_DONE:
+        load_job(job, valid_models)
+        st.rerun()
+
 # Main Content
-if st.session_state.analysis_data is None:
+if st.session_state.get('show_history'):
+    render_history()
+elif job is not None:
+    render_job(job, valid_models)
+elif st.session_state.analysis_data is None:
     # INPUT MODE
     st.markdown("### 📝 Analyse starten")
-    st.info("Geben Sie politische Aussagen ein (eine pro Zeile oder mit | getrennt)")
-    
-    # Use st.text_area directly - let Streamlit theme handle it
-    input_text = st.text_area(
-        "Text zur Analyse:",
-        height=350,
-        value=st.session_state.input_text,
-        placeholder="",
-        help="Geben Sie hier politische Aussagen ein.",
-        key="main_textarea"
+    input_mode = st.radio("Eingabe", ["✍️ Text eingeben", "📄 Datei hochladen"], horizontal=True,
+                          label_visibility="collapsed", key="input_mode")
+    split_label = st.selectbox(
+        "Aufteilung in Aussagen:",
+        options=list(SPLIT_OPTIONS.keys()),
+        help="Fließtext ohne Zeilenumbrüche wird in Sätze geteilt; Abkürzungen, Ordinalzahlen und Zitate bleiben zusammen."
     )
-    
-    st.session_state.input_text = input_text
-    
-    # Button
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        analyze_button = st.button(
-            "🚀 Analyse starten",
-            use_container_width=True,
-            type="primary",
-            disabled=(not input_text or len(input_text.strip()) < 10)
+    split_mode = SPLIT_OPTIONS[split_label]
+    
+    if input_mode == "📄 Datei hochladen":
+        st.info("TXT (eine Aussage pro Zeile), CSV (eine Spalte), DOCX (ein Absatz pro Aussage) oder PDF")
+        uploaded_file = st.file_uploader(
+            "Datei zur Analyse:",
+            type=SUPPORTED_TYPES,
+            help="Die Datei wird beim Analysieren schrittweise gelesen, die Aussagen gehen direkt in die Teilpakete."
         )
-    
-    # Handle analysis
-    if analyze_button:
-        if not input_text or len(input_text.strip()) < 10:
-            st.warning("⚠️ Bitte geben Sie mindestens 10 Zeichen Text ein.")
+        
+        csv_column = None
+        if uploaded_file is not None and file_type(uploaded_file.name) == 'csv':
+            columns = csv_columns(uploaded_file)
+            if columns:
+                csv_column = st.selectbox("Spalte mit den Aussagen:", columns, index=default_csv_column(columns))
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            analyze_button = st.button(
+                "🚀 Analyse starten",
+                use_container_width=True,
+                type="primary",
+                disabled=uploaded_file is None
+            )
+        
+        if analyze_button and uploaded_file is not None:
+            uploaded_file.seek(0)
+            statements = iter_file_statements(uploaded_file, uploaded_file.name, csv_column, split_mode)
+            start_analysis(statements, uploaded_file.name)
+    else:
+        if split_mode == SPLIT_SENTENCES:
+            st.info("Fügen Sie einen Text ein, er wird automatisch in Sätze geteilt")
         else:
-            statements = parse_statements(input_text)
-            model_id = st.session_state.selected_model['modelID']
-            model_name = st.session_state.selected_model['modelName']
-            
-            with st.spinner(f"🔍 Analysiere {len(statements)} Aussagen mit {model_name}..."):
-                result = call_api(statements, model_id)
-                
-                if result['success']:
-                    st.session_state.analysis_data = result['data']
-                    st.session_state.summary = calculate_summary(result['data'])
-                    st.balloons()
-                    st.rerun()
-                else:
-                    st.error(f"❌ API Fehler: {result['error']}")
-    
-    # Preview
-    if input_text:
-        statements = parse_statements(input_text)
-        st.info(f"📊 **{len(statements)} Aussagen** werden analysiert")
+            st.info("Geben Sie politische Aussagen ein (eine pro Zeile oder mit | getrennt)")
+        
+        # Use st.text_area directly - let Streamlit theme handle it
+        input_text = st.text_area(
+            "Text zur Analyse:",
+            height=350,
+            value=st.session_state.input_text,
+            placeholder="",
+            help="Geben Sie hier politische Aussagen ein.",
+            key="main_textarea"
+        )
+        
+        st.session_state.input_text = input_text
+        
+        # Button
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            analyze_button = st.button(
+                "🚀 Analyse starten",
+                use_container_width=True,
+                type="primary",
+                disabled=(not input_text or len(input_text.strip()) < 10)
+            )
+        
+        # Handle analysis
+        if analyze_button:
+            if not input_text or len(input_text.strip()) < 10:
+                st.warning("⚠️ Bitte geben Sie mindestens 10 Zeichen Text ein.")
+            else:
+                statements = parse_statements(input_text, split_mode)
+                start_analysis(statements, f"{len(statements)} Aussagen")
+        
+        # Preview
+        if input_text:
+            statements = parse_statements(input_text, split_mode)
+            st.info(f"📊 **{len(statements)} Aussagen** werden analysiert")
 
 else:
     # RESULTS MODE
     analysis_data = st.session_state.analysis_data
+    analysis_result = st.session_state.get('analysis_result') or AnalysisResult(analysis_data)
     summary = st.session_state.summary
-    model_info = st.session_state.selected_model
+    model_info = st.session_state.analysis_model
     
     # Score Display
-    st.markdown(f"""
-    <div class="score-box">
-        <div class="score-value">{summary['desinfo_score']}</div>
-        <div class="score-grade">Grade {summary['grade']}</div>
-        <div class="score-label">{summary['grade_label']}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(render_score_box(summary), unsafe_allow_html=True)
+    
+    comparison = st.session_state.get('comparison')
+    if comparison is not None:
+        render_comparison(comparison)
     
     # Results in white container
     st.markdown('<div class="results-container">', unsafe_allow_html=True)
@@ -782,76 +1290,87 @@ else:
     st.markdown('<div class="section-title">📊 Quantifizierung</div>', unsafe_allow_html=True)
     
     cols = st.columns(5)
-    categories = ['FALSCH', 'DELEGITIMIERUNG', 'VERZERRUNG', 'FRAME', 'WAHR']
     
-    for idx, cat in enumerate(categories):
-        count = summary['category_counts'].get(cat, 0)
-        percentage = (count / summary['total_statements'] * 100) if summary['total_statements'] > 0 else 0
-        hex_color, _ = get_category_color(cat)
-        
+    for idx, cat in enumerate(CATEGORIES):
         with cols[idx]:
-            st.markdown(f"""
-            <div class="metric-card" style="background: {hex_color};">
-                <div class="metric-value">{count}</div>
-                <div class="metric-label">{cat}</div>
-                <div class="metric-percent">{percentage:.0f}%</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(render_metric_card(cat, analysis_result.counts.get(cat, 0), analysis_result.percentages[cat]),
+                        unsafe_allow_html=True)
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     # Detailed Results
     st.markdown('<div class="section-title">📋 Detaillierte Ergebnisse</div>', unsafe_allow_html=True)
     
-    for category in categories:
-        cat_items = [item for item in analysis_data if item['kategorie'] == category]
+    # Nur die sichtbare Seite jeder Kategorie wird an den Browser geschickt
+    st.selectbox(
+        "Aussagen pro Seite",
+        options=PAGE_SIZE_OPTIONS,
+        index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+        key="page_size",
+        on_change=reset_pagination
+    )
+    
+    for category in CATEGORIES:
+        cat_items = analysis_result.items(category)
         if not cat_items:
             continue
         
-        hex_color, _ = get_category_color(category)
-        st.markdown(f'<div class="category-header" style="border-bottom-color: {hex_color};">{category} ({len(cat_items)} Aussagen)</div>', unsafe_allow_html=True)
-        st.markdown(f'<div class="category-description">{CATEGORY_DESCRIPTIONS[category]}</div>', unsafe_allow_html=True)
-        
-        for idx, item in enumerate(cat_items, 1):
-            st.markdown(f"""
-            <div class="statement-card" style="border-left-color: {hex_color};">
-                <div class="statement-title">{idx}. "{item['aussage']}"</div>
-                <span class="category-badge badge-{category.lower()}">{category}</span>
-                <span class="category-badge" style="background: #6c757d;">Punkte: {item.get('punkte', CATEGORY_POINTS.get(category, 0))}</span>
-                <div class="statement-text" style="margin-top: 1rem;"><strong>Begründung:</strong> {item['begründung']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(render_category_header(category, len(cat_items)), unsafe_allow_html=True)
+        render_paginated_category(category, cat_items)
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
     # Downloads
     st.markdown('<div class="section-title">📥 Report Download</div>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("📄 PDF Report generieren", use_container_width=True):
-            with st.spinner("Generiere PDF..."):
-                pdf_buffer = generate_pdf_report(analysis_data, summary, model_info)
+    report_cache = get_report_cache()
+    digest = st.session_state.get('report_digest') or report_digest(analysis_data, summary, model_info)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    downloads = [
+        ('pdf', "📄 PDF Report generieren", "Generiere PDF...", "⬇️ PDF herunterladen", "application/pdf"),
+        ('docx', "📝 DOCX Report generieren", "Generiere DOCX...", "⬇️ DOCX herunterladen",
+         "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+    ]
+    
+    for col, (fmt, generate_label, spinner_text, download_label, mime) in zip(st.columns(2), downloads):
+        with col:
+            # Bereits gerenderte Reports bleiben über Reruns hinweg direkt herunterladbar
+            report_bytes = read_report(report_cache.get(f"{digest}.{fmt}"))
+            if report_bytes is None and st.button(generate_label, use_container_width=True):
+                with st.spinner(spinner_text):
+                    report_bytes = read_report(report_cache.get_or_render(fmt, analysis_result, summary, model_info,
+                                                                         digest))
+            if report_bytes is not None:
                 st.download_button(
-                    label="⬇️ PDF herunterladen",
-                    data=pdf_buffer,
-                    file_name=f"DesInfo_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                    mime="application/pdf",
+                    label=download_label,
+                    data=report_bytes,
+                    file_name=f"DesInfo_Report_{timestamp}.{fmt}",
+                    mime=mime,
                     use_container_width=True
                 )
     
-    with col2:
-        if st.button("📝 DOCX Report generieren", use_container_width=True):
-            with st.spinner("Generiere DOCX..."):
-                docx_buffer = generate_docx_report(analysis_data, summary, model_info)
-                st.download_button(
-                    label="⬇️ DOCX herunterladen",
-                    data=docx_buffer,
-                    file_name=f"DesInfo_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    use_container_width=True
-                )
+    # Alle Formate (PDF, DOCX, JSON, CSV) auf einmal, parallel gerendert
+    bundle_bytes = read_report(report_cache.get(f"{digest}.zip"))
+    if bundle_bytes is None and st.button("📦 Alles exportieren (PDF, DOCX, JSON, CSV)", use_container_width=True):
+        with st.spinner("Erzeuge Export-Paket..."):
+            bundle_bytes = read_report(report_cache.get_or_render_bundle(analysis_result, summary, model_info, digest))
+    if bundle_bytes is not None:
+        st.download_button(
+            label="⬇️ ZIP herunterladen",
+            data=bundle_bytes,
+            file_name=f"DesInfo_Export_{timestamp}.zip",
+            mime="application/zip",
+            use_container_width=True
+        )
+    
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    
+    # Verlauf
+    st.markdown('<div class="section-title">🗂️ Verlauf</div>', unsafe_allow_html=True)
+    if st.session_state.get('analysis_partial'):
+        st.caption("Teilergebnis: wird nicht im Verlauf gespeichert.")
+    else:
+        render_history_form(st.session_state.get('history_id'))
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -865,3 +1384,8 @@ st.markdown("""
     <p style="font-size: 0.9rem; opacity: 0.8;">DESINFO v3.1 Robust - Theme-Based</p>
 </div>
 """, unsafe_allow_html=True)
+
+# Laufenden Job abfragen: kurzer Schlaf, dann Rerun (Klicks unterbrechen ihn)
+if job is not None and not job.finished:
+    time.sleep(JOB_POLL_INTERVAL)
+    st.rerun()
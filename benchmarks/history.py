@@ -0,0 +1,104 @@
+"""
+Query time of the analysis history with millions of stored statements.
+
+Fills a fresh history database with synthetic analyses spread over two years,
+speakers, outlets and models, then times the queries behind the history view
+(summary and monthly/weekly trend, unfiltered and filtered). Queries read the
+daily aggregates, so their time depends on the number of days and metadata
+combinations, not on the number of statements.
+
+Usage:
+    python benchmarks/history.py [--statements 2000000] [--output benchmarks/history.md]
+"""
+import argparse
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desinfo.history import HistoryStore  # noqa: E402
+from desinfo.scoring import CATEGORIES  # noqa: E402
+
+DAYS = 730
+SPEAKERS = [f"Sprecher:in {i}" for i in range(60)]
+OUTLETS = [f"Medium {i}" for i in range(25)]
+MODELS = [{'modelID': i, 'modelName': f"model-{i}"} for i in range(1, 4)]
+REPEATS = 5
+
+
+def fill(store: HistoryStore, statements: int, per_analysis: int, seed: int = 42):
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=DAYS)
+    reason = "Begründung " * 20
+    for n in range(statements // per_analysis):
+        data = [{'aussage': f"Aussage {n}.{i}", 'kategorie': rng.choice(CATEGORIES), 'begründung': reason}
+                for i in range(per_analysis)]
+        store.record(data, rng.choice(MODELS), rng.choice(SPEAKERS), rng.choice(OUTLETS),
+                     first_day + timedelta(days=rng.randrange(DAYS)))
+
+
+def best_of(func, *args, **kwargs) -> float:
+    """Fastest of REPEATS runs in ms"""
+    times = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        times.append(time.perf_counter() - started)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=2_000_000)
+    parser.add_argument("--per-analysis", type=int, default=50, help="Statements per recorded analysis")
+    parser.add_argument("--output", default=None, help="Write the results as Markdown to this file")
+    args = parser.parse_args()
+
+    end = date.today()
+    start = end - timedelta(days=DAYS)
+    last_quarter = end - timedelta(days=90)
+    queries = [
+        ("Summary, 2 years", lambda s: s.summary(start, end)),
+        ("Summary, 2 years, one speaker", lambda s: s.summary(start, end, speaker=SPEAKERS[0])),
+        ("Summary, last 90 days, one outlet", lambda s: s.summary(last_quarter, end, outlet=OUTLETS[0])),
+        ("Monthly trend, 2 years", lambda s: s.trend(start, end, 'month')),
+        ("Weekly trend, 2 years, one model", lambda s: s.trend(start, end, 'week', model_id=1)),
+        ("Daily trend, 2 years, one speaker", lambda s: s.trend(start, end, 'day', speaker=SPEAKERS[0])),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.sqlite3")
+        store = HistoryStore(path)
+        started = time.perf_counter()
+        fill(store, args.statements, args.per_analysis)
+        fill_time = time.perf_counter() - started
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        results = [(label, best_of(query, store)) for label, query in queries]
+
+    lines = [
+        "# History query time",
+        "",
+        f"{args.statements:,} statements in {args.statements // args.per_analysis:,} analyses over {DAYS} days, "
+        f"{len(SPEAKERS)} speakers, {len(OUTLETS)} outlets, {len(MODELS)} models; "
+        f"database {size_mb:.0f} MB, filled in {fill_time:.0f} s. Python {platform.python_version()}, "
+        f"best of {REPEATS} runs.",
+        "",
+        "| Query | Time [ms] |",
+        "|-------|-----------|",
+        *[f"| {label} | {ms:.1f} |" for label, ms in results],
+        "",
+    ]
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
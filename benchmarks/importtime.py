@@ -0,0 +1,121 @@
+"""
+Import-time measurement for the DESINFO app (python -X importtime).
+
+Measures the cumulative import cost of the modules app.py loads at startup
+(read from its top-level import statements) and of the report stack
+(reportlab, python-docx) that is now only imported when a PDF/DOCX report is
+generated. Fails if the startup imports load the report stack.
+
+Usage:
+    python benchmarks/importtime.py [--runs 5] [--output benchmarks/importtime.md]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+# Top-Level-Pakete des Report-Stacks; dürfen beim Start nicht geladen werden
+REPORT_PACKAGES = ("reportlab", "docx")
+
+# Report-Stack, vor der Umstellung ebenfalls beim Start geladen
+REPORT_IMPORTS = (
+    "import reportlab.lib.pagesizes, reportlab.lib.styles, reportlab.lib.units, "
+    "reportlab.platypus, reportlab.lib.colors, reportlab.lib.enums, "
+    "docx, docx.shared, docx.enum.text"
+)
+
+
+def startup_imports(path: str = APP) -> str:
+    """The modules app.py imports at module level, as one import statement"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name for name in names if name not in modules)
+    return "import " + ", ".join(modules)
+
+
+def check_lazy_reports(statement: str):
+    """Exit with an error if `statement` loads reportlab or python-docx"""
+    code = (f"{statement}\nimport sys\n"
+            f"print(' '.join(name for name in {REPORT_PACKAGES!r} if name in sys.modules))")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    loaded = proc.stdout.split()
+    if loaded:
+        sys.exit(f"app.py lädt beim Start bereits {', '.join(loaded)}")
+
+
+def measure(statement: str, preload: str = "") -> float:
+    """Cumulative import time of `statement` in ms, in a fresh interpreter"""
+    code = f"{preload}\n{statement}" if preload else statement
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, cwd=ROOT
+    )
+    lines = [line for line in proc.stderr.splitlines() if line.startswith("import time:")]
+    # Nur die Top-Level-Imports zählen (keine Einrückung im Paketnamen)
+    skip = set()
+    if preload:
+        skip_proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", preload],
+            capture_output=True, text=True, check=True, cwd=ROOT
+        )
+        skip = {line.split("|")[-1].strip() for line in skip_proc.stderr.splitlines()
+                if line.startswith("import time:")}
+    total_us = 0
+    for line in lines[1:]:
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  ") and name.strip() not in skip:
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write a Markdown table to this file")
+    args = parser.parse_args()
+
+    startup_statement = startup_imports()
+    check_lazy_reports(startup_statement)
+    startup = [measure(startup_statement) for _ in range(args.runs)]
+    report = [measure(REPORT_IMPORTS, preload=startup_statement) for _ in range(args.runs)]
+
+    rows = [
+        ("Startup imports (app.py)", statistics.median(startup)),
+        ("Report stack (reportlab + python-docx)", statistics.median(report)),
+    ]
+    before = rows[0][1] + rows[1][1]
+    after = rows[0][1]
+
+    table = [
+        f"Python {sys.version.split()[0]}, median of {args.runs} runs, `python -X importtime`.",
+        "",
+        "| Imports | Cumulative [ms] |",
+        "|---------|-----------------|",
+        *[f"| {name} | {ms:.1f} |" for name, ms in rows],
+        "",
+        f"Cold start before (eager report imports): {before:.1f} ms",
+        f"Cold start after (lazy report imports): {after:.1f} ms",
+        f"Saved per cold worker: {before - after:.1f} ms ({(before - after) / before:.0%})",
+    ]
+    text = "\n".join(table)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write("# Import time\n\n" + text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+End-to-end load test: N concurrent sessions against one worker process.
+
+Streamlit runs every session's script in its own thread of a single worker
+process and shares cache_resource objects between them. The driver does the
+same: it builds the HTTP client, the report cache and the model list once and
+runs each simulated session in a thread. Every iteration goes through the app's
+flow with fresh statements: parse the input, stream the analysis (batched,
+without the result cache, so every statement reaches the backend), summarise,
+render PDF and DOCX through the report cache and read the downloads.
+
+Without --base-url the stub backend (benchmarks/stub_backend.py) is started in
+a separate process. Options the driver does not know are passed on to it,
+e.g. ``--latency-ms 800 --error-rate 0.02``.
+
+Reported: throughput, latency percentiles per step and for call_api (from
+desinfo.metrics), error/retry counters and the worker's resident memory.
+
+Usage:
+    python benchmarks/loadtest.py [--sessions 8] [--iterations 3] [--statements 200]
+                                  [--think-time 1] [--output loadtest.json] [stub options]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desinfo.analysis import AnalysisError, iter_analysis  # noqa: E402
+from desinfo.api import (  # noqa: E402
+    BATCH_MAX_WORKERS,
+    HTTP_POOL_SIZE,
+    TRANSPORT_GET,
+    TRANSPORT_POST_NDJSON,
+    ApiClient,
+    build_http_session,
+)
+from desinfo.limiter import LIMITER_LATENCY_TARGET, AdaptiveLimiter  # noqa: E402
+from desinfo.metrics import METRICS, Metrics  # noqa: E402
+from desinfo.reports import ReportCache, read_report, report_digest  # noqa: E402
+from desinfo.scoring import AnalysisResult, calculate_summary  # noqa: E402
+from desinfo.text import SPLIT_LINES, parse_statements  # noqa: E402
+from micro import synthetic_statement  # noqa: E402
+
+STUB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_backend.py")
+STEPS = ["analyze", "render_pdf", "render_docx", "download", "iteration"]
+MEMORY_SAMPLE_INTERVAL = 0.1
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (Linux), else the peak from getrusage"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemorySampler(threading.Thread):
+    """Track the peak RSS while the load test runs"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.start_rss = rss_bytes()
+        self.peak_rss = self.start_rss
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(MEMORY_SAMPLE_INTERVAL):
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+
+    def stop(self) -> dict:
+        self.stopped.set()
+        self.join()
+        end_rss = rss_bytes()
+        return {'start_bytes': self.start_rss, 'peak_bytes': max(self.peak_rss, end_rss), 'end_bytes': end_rss}
+
+
+def start_stub(stub_args: list) -> tuple:
+    """(process, base URL) of a stub backend on a free port"""
+    process = subprocess.Popen([sys.executable, STUB_PATH, "--port", "0", *stub_args],
+                               stdout=subprocess.PIPE, text=True)
+    base_url = process.stdout.readline().strip()
+    if not base_url:
+        process.kill()
+        raise SystemExit("Stub backend did not start")
+    return process, base_url
+
+
+def session_input(session: int, iteration: int, statements: int) -> str:
+    """Pasted text with statements unique to this session and iteration"""
+    rng = random.Random(session * 100_003 + iteration)
+    return "\n".join(f"{synthetic_statement(rng)} ({session}.{iteration}.{i})" for i in range(statements))
+
+
+def run_session(session: int, args, client: ApiClient, report_cache: ReportCache, model: dict,
+                steps: Metrics, failures: list):
+    """Analyse, render and download args.iterations times"""
+    for iteration in range(args.iterations):
+        if iteration:
+            time.sleep(args.think_time)
+        started = time.perf_counter()
+        statements = parse_statements(session_input(session, iteration, args.statements), SPLIT_LINES)
+        try:
+            with steps.span("analyze"):
+                results = [None] * len(statements)
+                for updates, _ in iter_analysis(statements, model['modelID'], args.transport,
+                                                batched=True, client=client, max_workers=args.batch_workers):
+                    for idx, item in updates:
+                        results[idx] = item
+                analysis = AnalysisResult(results)
+                summary = calculate_summary(analysis)
+                digest = report_digest(results, summary, model)
+        except AnalysisError as e:
+            steps.inc("failed_iterations")
+            failures.append(f"session {session}, iteration {iteration}: {e}")
+            continue
+
+        downloads = []
+        for fmt in ("pdf", "docx"):
+            with steps.span(f"render_{fmt}"):
+                downloads.append(report_cache.get_or_render(fmt, analysis, summary, model, digest))
+        with steps.span("download"):
+            for report in downloads:
+                steps.inc("download_bytes", len(read_report(report)))
+        steps.observe("iteration", time.perf_counter() - started)
+        steps.inc("iterations")
+        steps.inc("statements", len(statements))
+
+
+def percentiles_ms(stage: dict) -> dict:
+    return {key: round(stage[key] * 1000, 1) for key in ("p50", "p95", "max")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="Analyses per session")
+    parser.add_argument("--statements", type=int, default=200, help="Statements per analysis")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Seconds between iterations of a session")
+    parser.add_argument("--transport", choices=[TRANSPORT_GET, TRANSPORT_POST_NDJSON], default=TRANSPORT_GET)
+    parser.add_argument("--batch-workers", type=int, default=BATCH_MAX_WORKERS)
+    parser.add_argument("--latency-target", type=float, default=LIMITER_LATENCY_TARGET,
+                        help="Latency target of the adaptive limiter in seconds")
+    parser.add_argument("--base-url", default=None, help="Existing backend instead of the stub")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    args, stub_args = parser.parse_known_args()
+
+    stub = None
+    base_url = args.base_url
+    if base_url is None:
+        stub, base_url = start_stub(stub_args)
+    elif stub_args:
+        parser.error(f"unrecognized arguments: {' '.join(stub_args)}")
+
+    steps = Metrics(window=args.sessions * args.iterations)
+    failures = []
+    try:
+        # Wie in der App: ein Client, ein Report-Cache und die Model-Liste für alle Sessions
+        client = ApiClient(base_url, build_http_session(HTTP_POOL_SIZE),
+                           limiter=AdaptiveLimiter(latency_target=args.latency_target), retries=0)
+        model = client.fetch_models()[0]
+        with tempfile.TemporaryDirectory() as spill_dir:
+            report_cache = ReportCache(spill_dir=spill_dir)
+            METRICS.reset()
+            sampler = MemorySampler()
+            sampler.start()
+            started = time.perf_counter()
+            threads = [
+                threading.Thread(target=run_session, args=(session, args, client, report_cache, model, steps, failures))
+                for session in range(args.sessions)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            memory = sampler.stop()
+    finally:
+        if stub:
+            stub.terminate()
+            stub.wait()
+
+    snapshot = steps.snapshot()
+    worker = METRICS.snapshot()
+    counters = snapshot['counters']
+    result = {
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'stub_args': stub_args,
+        'elapsed_s': round(elapsed, 2),
+        'iterations': counters.get('iterations', 0),
+        'failed_iterations': counters.get('failed_iterations', 0),
+        'throughput': {
+            'analyses_per_s': round(counters.get('iterations', 0) / elapsed, 3),
+            'statements_per_s': round(counters.get('statements', 0) / elapsed, 1),
+        },
+        'latency_ms': {step: percentiles_ms(snapshot['stages'][step]) for step in STEPS if step in snapshot['stages']},
+        'call_api_ms': percentiles_ms(worker['stages']['call_api']) if 'call_api' in worker['stages'] else None,
+        'counters': worker['counters'],
+        'gauges': worker['gauges'],
+        'memory': memory,
+        'failures': failures[:20],
+    }
+
+    mb = 1024 * 1024
+    print(f"{args.sessions} sessions x {args.iterations} iterations x {args.statements} statements "
+          f"in {elapsed:.1f} s ({result['failed_iterations']} failed)")
+    print(f"Throughput: {result['throughput']['analyses_per_s']:.2f} analyses/s, "
+          f"{result['throughput']['statements_per_s']:.0f} statements/s")
+    print(f"{'step':12} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    rows = list(result['latency_ms'].items())
+    if result['call_api_ms']:
+        rows.append(("call_api", result['call_api_ms']))
+    for step, values in rows:
+        print(f"{step:12} {values['p50']:10.1f} {values['p95']:10.1f} {values['max']:10.1f}")
+    print("Counters: " + ", ".join(f"{name} {value}" for name, value in result['counters'].items()))
+    print("Gauges: " + ", ".join(f"{name} {value}" for name, value in result['gauges'].items()))
+    print(f"Worker RSS: start {memory['start_bytes'] / mb:.0f} MB, peak {memory['peak_bytes'] / mb:.0f} MB, "
+          f"end {memory['end_bytes'] / mb:.0f} MB")
+    for failure in failures[:5]:
+        print(f"  {failure}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Microbenchmarks for statement parsing, scoring and report rendering.
+
+Synthetic analyses with 10, 100, 1k and 10k statements are built from German
+sentence fragments, with statement and reasoning lengths close to real backend
+output. Each function is timed on its own: the best and the median of several
+runs, repeated until about --min-time seconds have passed. Peak memory is taken
+from one extra run under tracemalloc, so it covers Python allocations only.
+Imports and template caches are warmed up before measuring.
+
+Results are saved as JSON. Pass an earlier result file with --compare to print
+the change per function and size; with --fail-above the script exits with 1
+if any median got slower by more than that factor.
+
+Usage:
+    python benchmarks/micro.py [--sizes 10 100 1000 10000] [--output micro.json]
+                               [--compare baseline.json] [--fail-above 1.2]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desinfo.reports import generate_docx_report, generate_pdf_report  # noqa: E402
+from desinfo.scoring import CATEGORIES, calculate_summary  # noqa: E402
+from desinfo.text import SPLIT_LINES, SPLIT_SENTENCES, parse_statements  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+SUBJECTS = [
+    "Die Bundesregierung", "Die Opposition im Bundestag", "Das Statistische Bundesamt",
+    "Der Gesundheitsminister", "Die Europäische Zentralbank", "Eine Mehrheit der Bürger",
+    "Die Landesregierung in Bayern", "Der Bericht des Rechnungshofs", "Die Energiewende",
+    "Die Zahl der Asylanträge", "Der Mindestlohn", "Die Inflation im vergangenen Jahr",
+]
+PREDICATES = [
+    "hat die Ausgaben für Verteidigung", "verschweigt die tatsächlichen Kosten für",
+    "hat nach eigenen Angaben die Mittel für", "ist verantwortlich für den Rückgang bei",
+    "belegt einen deutlichen Anstieg bei", "hat bewusst falsche Zahlen zu",
+    "kürzte im Haushalt 2023 die Förderung für", "plant eine Reform bei",
+]
+OBJECTS = [
+    "der Rente", "den Energiepreisen", "der Migration", "den Krankenhäusern",
+    "der Bundeswehr", "dem öffentlichen Nahverkehr", "den Schulen", "der Wohnungsnot",
+    "den Steuern für mittlere Einkommen", "dem Klimaschutz",
+]
+DETAILS = [
+    "um 12 Prozent erhöht", "seit 2019 verdoppelt", "nie öffentlich diskutiert",
+    "gegen den Willen der Länder durchgesetzt", "ohne Rücksicht auf die Folgen beschlossen",
+    "laut einer Studie deutlich unterschätzt", "im Vergleich zu Frankreich halbiert",
+]
+REASONS = [
+    "Die offiziellen Haushaltsdaten zeigen für den genannten Zeitraum eine andere Entwicklung.",
+    "Die Aussage verkürzt einen komplexen Sachverhalt auf eine einzelne Ursache.",
+    "Die zitierte Zahl stammt aus einer Quelle, die eine andere Abgrenzung verwendet.",
+    "Der Kern der Aussage ist zutreffend, die Wortwahl legt jedoch eine Absicht nahe, die nicht belegt ist.",
+    "Es gibt keine Hinweise darauf, dass die Entscheidung gegen geltendes Recht verstoßen hat.",
+    "Vergleichbare Angaben finden sich im Bericht des Statistischen Bundesamtes vom März.",
+    "Die Darstellung blendet aus, dass der Anstieg bereits vor der Reform begonnen hatte.",
+    "Die Formulierung stellt staatliche Institutionen pauschal als unglaubwürdig dar.",
+]
+
+
+def synthetic_statement(rng: random.Random) -> str:
+    """One or two sentences, roughly 60 to 250 characters"""
+    sentences = [
+        f"{rng.choice(SUBJECTS)} {rng.choice(PREDICATES)} {rng.choice(OBJECTS)} {rng.choice(DETAILS)}."
+        for _ in range(rng.choice((1, 1, 2)))
+    ]
+    return " ".join(sentences)
+
+
+def synthetic_analysis(n: int, seed: int = 42) -> list:
+    """Backend-shaped results: aussage, kategorie and a begründung of 3 to 6 sentences"""
+    rng = random.Random(seed)
+    return [
+        {
+            'aussage': synthetic_statement(rng),
+            'kategorie': rng.choice(CATEGORIES),
+            'begründung': " ".join(rng.sample(REASONS, rng.randint(3, 6))),
+        }
+        for _ in range(n)
+    ]
+
+
+def benchmarks(analysis_data: list) -> dict:
+    """Name -> zero-argument callable for one fixture size"""
+    statements = [item['aussage'] for item in analysis_data]
+    lines_text = "\n".join(statements)
+    prose_text = " ".join(statements)
+    summary = calculate_summary(analysis_data)
+    return {
+        "parse_statements[lines]": lambda: parse_statements(lines_text, SPLIT_LINES),
+        "parse_statements[sentences]": lambda: parse_statements(prose_text, SPLIT_SENTENCES),
+        "calculate_summary": lambda: calculate_summary(analysis_data),
+        "generate_pdf_report": lambda: generate_pdf_report(analysis_data, summary),
+        "generate_docx_report": lambda: generate_docx_report(analysis_data, summary),
+    }
+
+
+def time_runs(func, min_time: float, max_repeats: int) -> list:
+    """Durations of repeated runs, at least one, until min_time is used up"""
+    durations = []
+    deadline = time.perf_counter() + min_time
+    while len(durations) < max_repeats:
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+        if time.perf_counter() >= deadline:
+            break
+    return durations
+
+
+def peak_memory(func) -> int:
+    """Peak traced bytes of one run"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes: list, min_time: float, max_repeats: int, memory: bool = True) -> list:
+    """One record per function and size"""
+    # Imports, Font-Caches und DOCX-Vorlage laden, bevor gemessen wird
+    for func in benchmarks(synthetic_analysis(10)).values():
+        func()
+
+    records = []
+    for n in sizes:
+        for name, func in benchmarks(synthetic_analysis(n)).items():
+            durations = time_runs(func, min_time, max_repeats)
+            record = {
+                'function': name,
+                'statements': n,
+                'runs': len(durations),
+                'best_s': min(durations),
+                'median_s': statistics.median(durations),
+                'peak_bytes': peak_memory(func) if memory else None,
+            }
+            records.append(record)
+            peak = f"{record['peak_bytes'] / 1024 / 1024:8.1f} MB" if memory else ""
+            print(f"{name:30} {n:>6}  {record['median_s'] * 1000:10.2f} ms  {peak}", file=sys.stderr)
+    return records
+
+
+def compare(records: list, baseline: dict) -> float:
+    """Print median ratios against a baseline result file; returns the largest ratio"""
+    previous = {(r['function'], r['statements']): r for r in baseline['results']}
+    worst = 0.0
+    print(f"\nComparison with {baseline['created']} ({baseline.get('python', '?')})")
+    print(f"{'function':30} {'n':>6}  {'before ms':>10}  {'now ms':>10}  {'ratio':>6}  {'mem ratio':>9}")
+    for record in records:
+        old = previous.get((record['function'], record['statements']))
+        if not old:
+            continue
+        ratio = record['median_s'] / old['median_s'] if old['median_s'] else float('inf')
+        worst = max(worst, ratio)
+        mem = ""
+        if record['peak_bytes'] and old.get('peak_bytes'):
+            mem = f"{record['peak_bytes'] / old['peak_bytes']:9.2f}"
+        print(f"{record['function']:30} {record['statements']:>6}  {old['median_s'] * 1000:10.2f}  "
+              f"{record['median_s'] * 1000:10.2f}  {ratio:6.2f}  {mem}")
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Statements per fixture")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds of repeated runs per measurement")
+    parser.add_argument("--max-repeats", type=int, default=20)
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip the tracemalloc run (it slows reportlab down considerably)")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="Earlier result file to compare against")
+    parser.add_argument("--fail-above", type=float, default=None,
+                        help="Exit with 1 if a median is slower than the baseline by more than this factor")
+    args = parser.parse_args()
+
+    records = run_suite(args.sizes, args.min_time, args.max_repeats, args.memory)
+    result = {
+        'created': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': records,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            worst = compare(records, json.load(f))
+        if args.fail_above and worst > args.fail_above:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
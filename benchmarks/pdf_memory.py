@@ -0,0 +1,105 @@
+"""
+Peak memory of PDF report generation for large analyses.
+
+Compares the eager build (all flowables in a list, output in BytesIO) with the
+large-report mode (flowables generated lazily, output spooled to disk).
+Peak memory is measured with tracemalloc, so it covers Python allocations only.
+Time is measured in a separate run without tracemalloc, which slows reportlab
+down by an order of magnitude.
+
+Usage:
+    python benchmarks/pdf_memory.py [--statements 10000] [--output benchmarks/pdf_memory.md]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desinfo.reports import build_pdf, generate_pdf_report_file, iter_pdf_flowables  # noqa: E402
+from desinfo.scoring import CATEGORIES, AnalysisResult, calculate_summary  # noqa: E402
+
+
+def synthetic_analysis(n: int, seed: int = 42) -> list:
+    """Synthetic API result with realistic statement and reasoning lengths"""
+    rng = random.Random(seed)
+    words = ("Regierung Bundestag Migration Wirtschaft Inflation Klimaschutz Energiepreise "
+             "Opposition Bürger Zahlen Statistik behauptet tatsächlich jedoch Prozent").split()
+    data = []
+    for i in range(n):
+        aussage = ' '.join(rng.choice(words) for _ in range(rng.randint(10, 30)))
+        begruendung = ' '.join(rng.choice(words) for _ in range(rng.randint(30, 80)))
+        data.append({'aussage': f"{i}: {aussage}", 'kategorie': rng.choice(CATEGORIES), 'begründung': begruendung})
+    return data
+
+
+def eager_pdf(analysis_data, summary):
+    """Previous behaviour: the full flowable list and the PDF bytes in RAM"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm,
+                            leftMargin=2.5*cm, rightMargin=2.5*cm)
+    doc.build(list(iter_pdf_flowables(AnalysisResult.of(analysis_data), summary)))
+    return buffer
+
+
+def measure(func, *args) -> tuple:
+    """(seconds, peak traced bytes, result of the traced run)"""
+    started = time.perf_counter()
+    untraced = func(*args)
+    elapsed = time.perf_counter() - started
+    del untraced
+
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=10_000)
+    parser.add_argument("--output", default=None, help="Write a Markdown table to this file")
+    args = parser.parse_args()
+
+    analysis_data = synthetic_analysis(args.statements)
+    result = AnalysisResult(analysis_data)
+    summary = calculate_summary(result)
+    # reportlab-Imports und Font-Caches vorab laden, damit sie nicht mitgemessen werden
+    build_pdf(BytesIO(), analysis_data[:10], calculate_summary(analysis_data[:10]))
+
+    eager_time, eager_peak, buffer = measure(eager_pdf, result, summary)
+    size = len(buffer.getvalue())
+    del buffer
+    spooled_time, spooled_peak, spooled = measure(generate_pdf_report_file, result, summary)
+    spooled.close()
+
+    mb = 1024 * 1024
+    text = "\n".join([
+        f"{args.statements} statements, PDF size {size / mb:.1f} MB, Python {sys.version.split()[0]}.",
+        "",
+        "| Mode | Time [s] | Peak Python memory [MB] |",
+        "|------|----------|-------------------------|",
+        f"| Eager (flowable list + BytesIO) | {eager_time:.1f} | {eager_peak / mb:.1f} |",
+        f"| Large-report mode (lazy flowables + spooled file) | {spooled_time:.1f} | {spooled_peak / mb:.1f} |",
+        "",
+        "The remaining peak in large-report mode is the page content that reportlab's",
+        "canvas keeps until the document is saved. It grows with the number of pages,",
+        "not with the number of Paragraph objects.",
+    ])
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write("# PDF generation memory\n\n" + text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Accuracy and speed of the sentence segmentation mode (desinfo.text).
+
+The reference corpus (benchmarks/data/segmentation_de.txt) holds one gold
+sentence per line and blank lines between paragraphs. It covers
+abbreviations, ordinals, dates, quotations, unbalanced quotation marks and
+questions. The sentences are
+joined into continuous prose, once as single-line paragraphs and once
+hard-wrapped at 72 columns like text pasted from a PDF. The segmenter's
+boundaries are then compared with the gold boundaries. For speed, the prose
+is repeated up to each target size and segmented end to end, once as is and
+once with an unclosed „ at the start, which must not slow the scan down.
+
+Usage:
+    python benchmarks/segmentation.py [--sizes 1 5] [--output benchmarks/segmentation.md]
+"""
+import argparse
+import os
+import statistics
+import sys
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desinfo.text import SPLIT_LINES, parse_statements, segment_sentences  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "segmentation_de.txt")
+REPEATS = 5
+
+
+def load_corpus(path: str = CORPUS_PATH) -> list:
+    """Paragraphs as lists of gold sentences"""
+    with open(path, encoding="utf-8") as f:
+        blocks = f.read().strip().split("\n\n")
+    return [[line.strip() for line in block.splitlines() if line.strip()] for block in blocks]
+
+
+def to_prose(paragraphs: list, wrap: int = None) -> str:
+    """Continuous text: sentences joined by spaces, paragraphs by blank lines"""
+    texts = [" ".join(sentences) for sentences in paragraphs]
+    if wrap:
+        texts = [textwrap.fill(text, wrap, break_on_hyphens=False) for text in texts]
+    return "\n\n".join(texts)
+
+
+def score(gold: list, predicted: list) -> dict:
+    """Boundary precision/recall (as character offsets) and exact sentence matches"""
+    def boundaries(sentences):
+        offsets, offset = set(), 0
+        for sentence in sentences:
+            offset += len("".join(sentence.split()))
+            offsets.add(offset)
+        return offsets
+
+    gold_b, pred_b = boundaries(gold), boundaries(predicted)
+    hits = len(gold_b & pred_b)
+    precision = hits / len(pred_b) if pred_b else 0.0
+    recall = hits / len(gold_b) if gold_b else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    exact = len(set(gold) & set(predicted))
+    return {"precision": precision, "recall": recall, "f1": f1, "exact": exact, "predicted": len(predicted)}
+
+
+def throughput(text: str) -> tuple:
+    """(median seconds, sentences) for segmenting the whole text"""
+    times = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        count = sum(1 for _ in segment_sentences(text))
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5], help="Input sizes in MB")
+    parser.add_argument("--output", default=None, help="Write a Markdown report to this file")
+    args = parser.parse_args()
+
+    paragraphs = load_corpus()
+    gold = [sentence for sentences in paragraphs for sentence in sentences]
+
+    lines = [
+        f"Reference corpus: {len(gold)} sentences in {len(paragraphs)} paragraphs, Python {sys.version.split()[0]}.",
+        "",
+        "| Input | Mode | Statements | Boundary precision | Boundary recall | F1 | Exact sentences |",
+        "|-------|------|------------|--------------------|-----------------|----|-----------------|",
+    ]
+    for label, prose in (("Paragraphs", to_prose(paragraphs)), ("Wrapped at 72 columns", to_prose(paragraphs, 72))):
+        for mode_label, predicted in (
+            ("Lines or pipe", parse_statements(prose, SPLIT_LINES)),
+            ("Sentences", list(segment_sentences(prose))),
+        ):
+            result = score(gold, predicted)
+            lines.append(
+                f"| {label} | {mode_label} | {result['predicted']} | {result['precision']:.3f} | "
+                f"{result['recall']:.3f} | {result['f1']:.3f} | {result['exact']}/{len(gold)} |"
+            )
+
+    lines += [
+        "",
+        f"Speed, median of {REPEATS} runs on the wrapped corpus repeated to size:",
+        "",
+        "| Input | Size [MB] | Sentences | Time [s] | Throughput [MB/s] |",
+        "|-------|-----------|-----------|----------|-------------------|",
+    ]
+    unit = to_prose(paragraphs, 72) + "\n\n"
+    for size in args.sizes:
+        target = int(size * 1024 * 1024)
+        repeated = (unit * (target // len(unit) + 1))[:target]
+        # Ohne Absätze und mit offenem Zitat: der ungünstigste Fall für die Zitaterkennung
+        unclosed = "„" + " ".join(repeated.split())
+        for label, text in (("Wrapped corpus", repeated), ("One paragraph, unclosed „", unclosed)):
+            elapsed, count = throughput(text)
+            mb = len(text.encode("utf-8")) / (1024 * 1024)
+            lines.append(f"| {label} | {mb:.1f} | {count} | {elapsed:.3f} | {mb / elapsed:.1f} |")
+
+    lines += [
+        "",
+        "The corpus is small and was used while writing the abbreviation list, so the",
+        "accuracy figures are in-sample. They guard against regressions; they are not",
+        "an estimate for arbitrary text.",
+    ]
+
+    text = "\n".join(lines)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write("# Sentence segmentation\n\n" + text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Local stand-in for the DESINFO backend, for load tests and offline development.
+
+Implements GET /desInfo/models and /desInfo/generateReport (GET with the
+``text`` parameter, and POST with gzip JSON and an NDJSON response). Response
+latency, error rate and reasoning length are configurable. Categories are
+derived from the statement text, so repeated runs give the same scores.
+
+Usage:
+    python benchmarks/stub_backend.py [--port 8003] [--latency lognormal --latency-ms 300]
+                                      [--per-statement-ms 2] [--error-rate 0.01] [--reason-chars 400]
+
+The first line on stdout is the base URL, so callers may pass --port 0 and read it.
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CATEGORIES = ['FALSCH', 'DELEGITIMIERUNG', 'VERZERRUNG', 'FRAME', 'WAHR']
+LATENCY_MODELS = ['fixed', 'uniform', 'lognormal']
+REASON_TEXT = ("Die Aussage wurde mit den verfügbaren Quellen abgeglichen und im Kontext der "
+               "aktuellen Debatte eingeordnet. ")
+
+MODELS = [
+    {'modelID': 1, 'modelName': 'stub-small', 'provider': 'Stub', 'valid': True},
+    {'modelID': 2, 'modelName': 'stub-large', 'provider': 'Stub', 'valid': True},
+    {'modelID': 3, 'modelName': 'stub-disabled', 'provider': 'Stub', 'valid': False},
+]
+
+
+class StubConfig:
+    """Latency, error and payload settings of the stub"""
+
+    def __init__(self, latency: str = 'lognormal', latency_ms: float = 300.0, sigma: float = 0.5,
+                 per_statement_ms: float = 2.0, error_rate: float = 0.0, error_status: int = 503,
+                 reason_chars: int = 400, seed: int = None):
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.per_statement_ms = per_statement_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.reason = (REASON_TEXT * (reason_chars // len(REASON_TEXT) + 1))[:reason_chars]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def delay(self, statements: int) -> float:
+        """Seconds to wait before answering a request with this many statements"""
+        with self.lock:
+            if self.latency == 'fixed':
+                base = self.latency_ms
+            elif self.latency == 'uniform':
+                base = self.rng.uniform(0, 2 * self.latency_ms)
+            else:
+                # latency_ms ist der Median der Log-Normalverteilung
+                base = self.rng.lognormvariate(math.log(max(self.latency_ms, 0.001)), self.sigma)
+        return (base + statements * self.per_statement_ms) / 1000
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            failed = self.rng.random() < self.error_rate
+            self.errors += failed
+        return failed
+
+    def score(self, statement: str, model_id) -> dict:
+        category = CATEGORIES[(zlib.crc32(statement.encode('utf-8')) + int(model_id)) % len(CATEGORIES)]
+        return {'aussage': statement, 'kategorie': category, 'begründung': self.reason}
+
+
+def make_handler(config: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, body: bytes, content_type: str, status: int = 200):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def answer(self, statements: list, model_id, ndjson: bool):
+            time.sleep(config.delay(len(statements)))
+            if config.should_fail():
+                self.send_body(b'{"error": "stub failure"}', "application/json", config.error_status)
+                return
+            results = [config.score(statement, model_id) for statement in statements]
+            if ndjson:
+                body = b"".join(json.dumps(item, ensure_ascii=False).encode('utf-8') + b"\n" for item in results)
+                self.send_body(body, "application/x-ndjson")
+            else:
+                self.send_body(json.dumps(results, ensure_ascii=False).encode('utf-8'), "application/json")
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path == "/desInfo/models":
+                self.send_body(json.dumps({'models': MODELS}).encode('utf-8'), "application/json")
+            elif url.path == "/desInfo/generateReport":
+                text = query.get('text', [''])[0]
+                self.answer(text.split('|') if text else [], query.get('modelID', ['1'])[0], ndjson=False)
+            elif url.path == "/stats":
+                with config.lock:
+                    stats = {'requests': config.requests, 'errors': config.errors}
+                self.send_body(json.dumps(stats).encode('utf-8'), "application/json")
+            else:
+                self.send_body(b"", "text/plain", 404)
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/desInfo/generateReport":
+                self.send_body(b"", "text/plain", 404)
+                return
+            raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            payload = json.loads(raw)
+            self.answer(payload.get('statements', []), payload.get('modelID', 1), ndjson=True)
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients, die vor der Antwort aufgeben (Timeout, Abbruch), sind im Lasttest normal
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def make_server(config: StubConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    return StubServer((host, port), make_handler(config))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8003, help="0 picks a free port")
+    parser.add_argument("--latency", choices=LATENCY_MODELS, default="lognormal",
+                        help="Latency distribution per request (default: lognormal)")
+    parser.add_argument("--latency-ms", type=float, default=300.0,
+                        help="Fixed value, uniform mean or lognormal median in ms (default: 300)")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Shape of the lognormal distribution")
+    parser.add_argument("--per-statement-ms", type=float, default=2.0,
+                        help="Additional latency per statement in the request (default: 2)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of failing requests (0..1)")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of failing requests")
+    parser.add_argument("--reason-chars", type=int, default=400, help="Length of each begründung")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency, args.latency_ms, args.sigma, args.per_statement_ms,
+                        args.error_rate, args.error_status, args.reason_chars, args.seed)
+    server = make_server(config, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
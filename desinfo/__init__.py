@@ -0,0 +1,3 @@
+"""
+Core of the DESINFO analyzer, importable without Streamlit.
+"""
@@ -0,0 +1,205 @@
+"""
+Analysis pipeline: cache lookup, batched API calls and result assembly.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import BATCH_MAX_WORKERS, BATCH_SIZE, TRANSPORT_GET, ApiClient, make_batches
+from .cache import ResultCache
+from .metrics import METRICS
+from .text import normalize_statement
+
+class AnalysisError(Exception):
+    """A batch failed permanently (after retries)"""
+
+def iter_analysis(statements, model_id: int, transport: str = TRANSPORT_GET,
+                  batched: bool = True, cache: ResultCache = None, client: ApiClient = None,
+                  max_workers: int = BATCH_MAX_WORKERS, known: dict = None):
+    """Yield ([(input_index, result), ...], from_cache) for cache hits and each completed batch
+    
+    `statements` may be any iterable. It is consumed incrementally: cache hits are
+    looked up per window and full batches are sent while the input is still being
+    read, with at most two batches per worker in flight. With the NDJSON transport
+    results are yielded line by line while their batch is still streaming. `known`
+    maps normalized statements to earlier results of the same model (see
+    previous_results); they are reused like cache hits.
+    """
+    client = client or ApiClient()
+    window_size = BATCH_SIZE * max(1, max_workers)
+    positions = {}   # normalisierte Aussage -> Eingabe-Indizes
+    resolved = {}    # normalisierte Aussage -> (Ergebnis, aus dem Cache)
+    window = []      # neue Aussagen, noch nicht im Cache nachgeschlagen
+    misses = []      # Cache-Fehlgriffe, noch keinem Teilpaket zugeordnet
+    inflight = {}    # Teilpaket-Nr. -> (Future, Schlüssel, schon gestreamte Schlüssel)
+    events = queue.SimpleQueue()  # (Teilpaket-Nr., Position, Ergebnis); Position None = Teilpaket fertig
+    batch_count = 0
+    failure = None   # erster Fehler; die übrigen laufenden Teilpakete werden noch abgewartet
+    
+    def resolve(fresh: dict, from_cache: bool) -> list:
+        resolved.update((key, (item, from_cache)) for key, item in fresh.items())
+        return [(idx, {**item, 'aussage': originals[idx]}) for key, item in fresh.items() for idx in positions.get(key, [])]
+    
+    def look_up():
+        # Unveränderte Aussagen einer früheren Analyse zuerst, dann der Cache
+        found = {key: known[key] for key in window if key in known} if known else {}
+        if found:
+            METRICS.inc("reused_results", len(found))
+        unknown = [key for key in window if key not in found]
+        hits = cache.get_many(model_id, [originals[positions[key][0]] for key in unknown]) if cache and unknown else {}
+        if hits:
+            METRICS.inc("cache_hits", len(hits))
+            found.update(hits)
+        misses.extend(key for key in unknown if key not in hits)
+        window.clear()
+        return resolve(found, True) if found else []
+    
+    def submit(final: bool):
+        nonlocal batch_count
+        if not misses:
+            return
+        if not batched:
+            if not final:
+                return
+            batches = [list(misses)]
+        else:
+            batches = make_batches(misses)
+            # Das letzte, evtl. unvollständige Paket wartet auf weitere Aussagen
+            if not final and len(batches[-1]) < BATCH_SIZE:
+                batches.pop()
+        sent = sum(len(batch) for batch in batches)
+        for batch in batches:
+            batch_count += 1
+            on_item = lambda position, item, batch_no=batch_count: events.put((batch_no, position, item))
+            future = pool.submit(client.call_with_retry, [originals[positions[key][0]] for key in batch], model_id,
+                                 transport, on_item=on_item)
+            inflight[batch_count] = (future, batch, set())
+            future.add_done_callback(lambda _, batch_no=batch_count: events.put((batch_no, None, None)))
+        del misses[:sent]
+    
+    def collect(block: bool):
+        """Yield streamed lines and finished batches; with block, until at least one batch has finished
+        
+        After a failed batch the other batches in flight are still awaited, so
+        their (paid) results are yielded and cached before AnalysisError is raised.
+        """
+        nonlocal failure
+        while inflight:
+            try:
+                batch_no, position, item = events.get(block=block or failure is not None)
+            except queue.Empty:
+                return
+            if batch_no not in inflight:
+                continue
+            future, batch_keys, streamed = inflight[batch_no]
+            
+            if position is not None:
+                # Gestreamte Zeile über den zurückgegebenen Text zuordnen, sonst über die Position
+                key = normalize_statement(item.get('aussage', ''))
+                if key not in batch_keys:
+                    key = batch_keys[position] if position < len(batch_keys) else None
+                if key is not None and key not in streamed:
+                    streamed.add(key)
+                    yield resolve({key: item}, False), False
+                continue
+            
+            del inflight[batch_no]
+            block = False
+            result = future.result()
+            if not result['success']:
+                failure = failure or f"Teilpaket {batch_no}: {result['error']}"
+                # Bereits gestreamte Zeilen des Teilpakets sind gültig
+                if cache and streamed:
+                    cache.put_many(model_id, {key: resolved[key][0] for key in streamed})
+                continue
+            
+            # Ergebnisse über die Position zuordnen, sonst über den zurückgegebenen Text
+            if len(result['data']) == len(batch_keys):
+                fresh = dict(zip(batch_keys, result['data']))
+            else:
+                keys = set(batch_keys)
+                fresh = {key: item for key, item in
+                         ((normalize_statement(item.get('aussage', '')), item) for item in result['data'])
+                         if key in keys}
+                # Nicht zuzuordnende Aussagen (z.B. vom Backend an | geteilt) machen das Teilpaket ungültig;
+                # die zugeordneten Ergebnisse werden trotzdem gespeichert
+                missing = [key for key in batch_keys if key not in fresh and key not in streamed]
+                if missing:
+                    METRICS.inc("unmatched_statements", len(missing))
+                    failure = failure or (f"Teilpaket {batch_no}: {len(missing)} von {len(batch_keys)} Aussagen "
+                                          f"ohne zuordenbares Ergebnis (erste: {originals[positions[missing[0]][0]]!r})")
+            
+            if cache and fresh:
+                cache.put_many(model_id, fresh)
+            fresh = {key: item for key, item in fresh.items() if key not in streamed}
+            if fresh:
+                yield resolve(fresh, False), False
+        if failure:
+            raise AnalysisError(failure)
+    
+    originals = []
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        for idx, statement in enumerate(statements):
+            originals.append(statement)
+            key = normalize_statement(statement)
+            if key in positions:
+                positions[key].append(idx)
+                # Jede Aussage nur einmal senden; bekannte Duplikate sofort liefern
+                if key in resolved:
+                    item, from_cache = resolved[key]
+                    yield [(idx, {**item, 'aussage': statement})], from_cache
+                continue
+            positions[key] = [idx]
+            window.append(key)
+            
+            if len(window) >= window_size:
+                hits = look_up()
+                if hits:
+                    yield hits, True
+                submit(final=False)
+                yield from collect(block=len(inflight) > 2 * max_workers)
+        
+        hits = look_up()
+        if hits:
+            yield hits, True
+        submit(final=True)
+        while inflight:
+            yield from collect(block=True)
+    finally:
+        METRICS.inc("statements", len(originals))
+        # Bei Abbruch (z.B. Streamlit-Rerun) nicht auf offene Teilpakete warten
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def previous_results(analysis_data) -> dict:
+    """{normalized statement: result} of an earlier analysis, for re-analysing edited input"""
+    return {normalize_statement(item['aussage']): item for item in analysis_data or []}
+
+def analyze_statements(statements, model_id: int, transport: str = TRANSPORT_GET,
+                       batched: bool = True, cache: ResultCache = None, client: ApiClient = None,
+                       max_workers: int = BATCH_MAX_WORKERS, known: dict = None) -> dict:
+    """Analyse statements, serving cached results and sending only cache misses to the API"""
+    results = {}
+    cache_hits = 0
+    total = 0
+    
+    def count(statements):
+        nonlocal total
+        for statement in statements:
+            total += 1
+            yield statement
+    
+    try:
+        for updates, from_cache in iter_analysis(count(statements), model_id, transport, batched, cache, client, max_workers, known):
+            for idx, item in updates:
+                results[idx] = item
+            if from_cache:
+                cache_hits += len(updates)
+    except AnalysisError as e:
+        return {"success": False, "error": str(e)}
+    
+    return {
+        "success": True,
+        "data": [results[idx] for idx in sorted(results)],
+        "cache_hits": cache_hits,
+        "total": total
+    }
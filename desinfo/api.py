@@ -0,0 +1,242 @@
+"""
+HTTP client for the DESINFO backend: transports, batching, retries and coalescing.
+"""
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+from .limiter import AdaptiveLimiter, is_overload
+from .metrics import METRICS
+from .scoring import CATEGORY_POINTS
+
+DEFAULT_API_BASE_URL = "http://217.154.156.197:8003"
+
+# HTTP-Defaults in Sekunden; die App überschreibt sie über st.secrets, die CLI über Optionen
+CONNECT_TIMEOUT = 5.0
+MODELS_READ_TIMEOUT = 10.0
+ANALYZE_READ_TIMEOUT = 300.0
+HTTP_POOL_SIZE = 32      # Keep-Alive-Verbindungen pro Host
+HTTP_RETRIES = 3         # bei 502/503/504 und Verbindungsaufbau-Fehlern, nie nach Read-Timeouts
+HTTP_RETRY_BACKOFF = 0.5
+
+# Transport: GET mit Query-Parameter (kompatibel) oder POST mit gzip-JSON und NDJSON-Antwort
+TRANSPORT_GET = "get"
+TRANSPORT_POST_NDJSON = "post-ndjson"
+
+# Batch-Modus: Aussagen werden in Teilpakete aufgeteilt und parallel analysiert
+BATCH_SIZE = 25          # Max. Aussagen pro Request
+BATCH_MAX_CHARS = 6000   # Max. Zeichen pro Request (hält die URL klein)
+BATCH_MAX_WORKERS = 4    # Max. parallele Requests
+BATCH_RETRIES = 2        # Wiederholungen pro Teilpaket, nur ohne Retries in der HTTP-Session
+BATCH_RETRY_BACKOFF = 2  # Sekunden, verdoppelt sich pro Versuch
+
+def build_http_session(pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES,
+                       backoff: float = HTTP_RETRY_BACKOFF) -> requests.Session:
+    """Create a keep-alive session with a sized connection pool and retry-with-backoff
+    
+    Only failed connection attempts and 502/503/504 responses are retried. A read
+    timeout or a connection dropped mid-request is not: the analysis is a paid,
+    non-idempotent LLM call that may still be running on the backend.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        other=0,
+        backoff_factor=backoff,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class StreamingNotSupported(Exception):
+    """Backend does not accept the POST/NDJSON transport"""
+
+def is_retry_safe(error: Exception) -> bool:
+    """The backend did not process the request: no connection or 502/503/504 from a gateway"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in (502, 503, 504)
+    return False
+
+def add_default_points(item: dict) -> dict:
+    """Add punkte field if not present"""
+    if 'punkte' not in item:
+        item['punkte'] = CATEGORY_POINTS.get(item['kategorie'], 0)
+    return item
+
+def make_batches(statements: list, max_items: int = BATCH_SIZE, max_chars: int = BATCH_MAX_CHARS) -> list:
+    """Split statements into consecutive chunks bounded by count and characters"""
+    batches = []
+    current = []
+    current_chars = 0
+    for statement in statements:
+        if current and (len(current) >= max_items or current_chars + len(statement) > max_chars):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(statement)
+        current_chars += len(statement) + 1  # +1 für das Trennzeichen
+    if current:
+        batches.append(current)
+    return batches
+
+class SingleFlight:
+    """Run a call once per key at a time; concurrent callers with the same key share its outcome"""
+    
+    def __init__(self):
+        self._calls = {}   # Schlüssel -> Future des laufenden Aufrufs
+        self._lock = threading.Lock()
+    
+    def do(self, key, func, *args):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        
+        if not leader:
+            METRICS.inc("coalesced_calls")
+            return future.result()
+        
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+class ApiClient:
+    """DESINFO backend endpoints, timeouts and the shared HTTP session"""
+    
+    def __init__(self, base_url: str = DEFAULT_API_BASE_URL, session: requests.Session = None,
+                 connect_timeout: float = CONNECT_TIMEOUT, models_read_timeout: float = MODELS_READ_TIMEOUT,
+                 analyze_read_timeout: float = ANALYZE_READ_TIMEOUT, coalesce: bool = True,
+                 limiter: AdaptiveLimiter = None, retries: int = BATCH_RETRIES):
+        self.base_url = base_url.rstrip('/')
+        self.models_endpoint = f"{self.base_url}/desInfo/models"
+        self.analyze_endpoint = f"{self.base_url}/desInfo/generateReport"
+        # Ohne Session: ein Request pro Verbindung, wie requests.get
+        self.http = session or requests
+        self.connect_timeout = connect_timeout
+        self.models_read_timeout = models_read_timeout
+        self.analyze_read_timeout = analyze_read_timeout
+        # Gleiche Teilpakete an dasselbe Model, die gleichzeitig laufen, gehen nur einmal ans Backend
+        self.single_flight = SingleFlight() if coalesce else None
+        # Gemeinsames Limit für parallele Analyse-Requests (None = unbegrenzt)
+        self.limiter = limiter
+        # Wiederholungen pro Teilpaket; 0 mit einer Session aus build_http_session, die selbst wiederholt
+        self.retries = retries
+        # Nach dem ersten 404/405/415/501 auf POST nur noch GET senden
+        self.streaming_supported = True
+    
+    def fetch_models(self) -> list:
+        """Return the valid models; raises requests.RequestException on HTTP errors"""
+        with METRICS.span("fetch_models"):
+            response = self.http.get(self.models_endpoint, timeout=(self.connect_timeout, self.models_read_timeout))
+            response.raise_for_status()
+            return [m for m in response.json().get('models', []) if m.get('valid', False)]
+    
+    def stream(self, statements: list, model_id: int):
+        """POST statements as gzip-compressed JSON, yield results line by line from the NDJSON response"""
+        payload = json.dumps({"modelID": model_id, "statements": statements}, ensure_ascii=False)
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Encoding": "gzip",
+            "Accept": "application/x-ndjson"
+        }
+        
+        with self.http.post(self.analyze_endpoint, data=gzip.compress(payload.encode('utf-8')), headers=headers,
+                            stream=True, timeout=(self.connect_timeout, self.analyze_read_timeout)) as response:
+            # Ältere Backends kennen nur GET
+            if response.status_code in (404, 405, 415, 501):
+                raise StreamingNotSupported(f"HTTP {response.status_code}")
+            response.raise_for_status()
+            
+            for line in response.iter_lines():
+                if line:
+                    yield add_default_points(json.loads(line))
+    
+    def call(self, statements: list, model_id: int, transport: str = TRANSPORT_GET, on_item=None) -> dict:
+        """Call DESINFO API; with the NDJSON transport, on_item(position, result) receives each line as it arrives"""
+        METRICS.inc("statements_sent", len(statements))
+        with self.limiter.slot() if self.limiter else nullcontext() as permit:
+            try:
+                with METRICS.span("call_api"):
+                    data = self._request(statements, model_id, transport, on_item)
+            except Exception as e:
+                if permit:
+                    permit.overloaded = is_overload(e)
+                METRICS.inc("api_errors")
+                return {"success": False, "error": str(e), "retryable": is_retry_safe(e)}
+        return {"success": True, "data": data}
+    
+    def _request(self, statements: list, model_id: int, transport: str, on_item=None) -> list:
+        if transport == TRANSPORT_POST_NDJSON and self.streaming_supported:
+            try:
+                data = []
+                for item in self.stream(statements, model_id):
+                    if on_item:
+                        on_item(len(data), item)
+                    data.append(item)
+                return data
+            except StreamingNotSupported:
+                self.streaming_supported = False  # Fallback auf GET, auch für alle weiteren Teilpakete
+        
+        text_param = "|".join(statements)
+        params = {"modelID": model_id, "text": text_param}
+        
+        response = self.http.get(self.analyze_endpoint, params=params,
+                                 timeout=(self.connect_timeout, self.analyze_read_timeout))
+        response.raise_for_status()
+        return [add_default_points(item) for item in response.json()]
+    
+    def call_with_retry(self, statements: list, model_id: int, transport: str = TRANSPORT_GET,
+                        retries: int = None, on_item=None) -> dict:
+        """Call DESINFO API, retrying a batch the backend did not process with exponential backoff
+        
+        `retries` defaults to the client's setting. Read timeouts and other errors
+        after the request reached the backend are not retried (see is_retry_safe).
+        
+        Callers that send the same statements to the same model while a call is
+        in flight wait for that call; they share the returned dict, which must
+        not be modified. Only the first caller's on_item sees the streamed lines,
+        and a retried batch may report a position again.
+        """
+        retries = self.retries if retries is None else retries
+        if self.single_flight is None:
+            return self._call_with_retry(statements, model_id, transport, retries, on_item)
+        key = (model_id, tuple(statements))
+        return self.single_flight.do(key, self._call_with_retry, statements, model_id, transport, retries, on_item)
+    
+    def _call_with_retry(self, statements: list, model_id: int, transport: str, retries: int, on_item=None) -> dict:
+        result = self.call(statements, model_id, transport, on_item)
+        for attempt in range(retries):
+            if result['success'] or not result['retryable']:
+                break
+            time.sleep(BATCH_RETRY_BACKOFF * 2 ** attempt)
+            METRICS.inc("api_retries")
+            result = self.call(statements, model_id, transport, on_item)
+        return result
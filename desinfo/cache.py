@@ -0,0 +1,98 @@
+"""
+Persistent per-statement result cache, shared by the app and the CLI.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from .scoring import CATEGORY_POINTS
+from .text import normalize_statement
+
+RESULT_CACHE_TTL = 7 * 24 * 3600       # Sekunden
+RESULT_CACHE_MAX_ENTRIES = 50_000      # Älteste (zuletzt benutzte) Einträge werden verdrängt
+
+class ResultCache:
+    """Persistent per-statement result cache (SQLite) with TTL and LRU eviction"""
+    
+    # SQLite erlaubt standardmäßig max. 999 Parameter pro Statement
+    _CHUNK = 500
+    
+    def __init__(self, path: str, ttl: float = RESULT_CACHE_TTL, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                model_id TEXT NOT NULL,
+                aussage TEXT NOT NULL,
+                kategorie TEXT NOT NULL,
+                begruendung TEXT NOT NULL,
+                punkte INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model_id, aussage)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access)")
+    
+    def get_many(self, model_id, statements: list) -> dict:
+        """Return {normalized statement: result} for all fresh cache hits"""
+        keys = list(dict.fromkeys(normalize_statement(s) for s in statements))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self._CHUNK):
+                chunk = keys[i:i + self._CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT aussage, kategorie, begruendung, punkte FROM results "
+                    f"WHERE model_id = ? AND created_at >= ? AND aussage IN ({placeholders})",
+                    [str(model_id), now - self.ttl, *chunk]
+                ).fetchall()
+                for aussage, kategorie, begruendung, punkte in rows:
+                    found[aussage] = {'kategorie': kategorie, 'begründung': begruendung, 'punkte': punkte}
+            
+            if found:
+                hit_keys = list(found)
+                for i in range(0, len(hit_keys), self._CHUNK):
+                    chunk = hit_keys[i:i + self._CHUNK]
+                    placeholders = ','.join('?' * len(chunk))
+                    self._conn.execute(
+                        f"UPDATE results SET last_access = ? WHERE model_id = ? AND aussage IN ({placeholders})",
+                        [now, str(model_id), *chunk]
+                    )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+    
+    def put_many(self, model_id, items: dict):
+        """Store {normalized statement: result} and evict the least recently used overflow"""
+        now = time.time()
+        rows = [
+            (str(model_id), key, item['kategorie'], item.get('begründung', ''),
+             item.get('punkte', CATEGORY_POINTS.get(item['kategorie'], 0)), now, now)
+            for key, item in items.items()
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl,))
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM results WHERE rowid IN "
+                    "(SELECT rowid FROM results ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.execute("COMMIT")
+    
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
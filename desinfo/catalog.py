@@ -0,0 +1,93 @@
+"""
+Stale-while-revalidate model catalogue with a last-known-good copy on disk.
+
+Readers always get the list that is already known; a stale list triggers one
+refresh in a background thread. Successful refreshes are written to disk, so a
+cold process starts with the previous list instead of waiting for the backend.
+"""
+import json
+import os
+import threading
+import time
+
+from .api import ApiClient
+from .metrics import METRICS
+
+MODELS_MAX_AGE = 300       # Sekunden, danach wird im Hintergrund aktualisiert
+MODELS_RETRY_AFTER = 30    # Sekunden Pause nach einem fehlgeschlagenen Abruf
+
+class ModelCatalog:
+    """Model list of the backend that never blocks its readers"""
+
+    def __init__(self, client: ApiClient, path: str = None, max_age: float = MODELS_MAX_AGE,
+                 retry_after: float = MODELS_RETRY_AFTER):
+        self.client = client
+        self.path = path
+        self.max_age = max_age
+        self.retry_after = retry_after
+        self.models = []
+        self.fetched_at = 0.0
+        self.last_error = None
+        self._next_attempt = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Last-known-good list from disk, if any"""
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+            self.models = stored['models']
+            self.fetched_at = stored['fetched_at']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': self.fetched_at, 'models': self.models}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def loading(self) -> bool:
+        """A refresh is running and no list is known yet"""
+        return self._refreshing and not self.models
+
+    def get(self) -> list:
+        """The known models (possibly stale or empty); starts a background refresh when due"""
+        now = time.time()
+        with self._lock:
+            due = now - self.fetched_at > self.max_age and now >= self._next_attempt
+            if due and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self.refresh, daemon=True, name="model-catalog").start()
+            return self.models
+
+    def refresh(self):
+        """Fetch the list; on failure or an empty list the previous one stays in place"""
+        try:
+            models = self.client.fetch_models()
+            if not models:
+                raise ValueError("Backend meldet keine gültigen Models")
+        except Exception as e:
+            METRICS.inc("fetch_models_errors")
+            with self._lock:
+                self.last_error = str(e)
+                self._next_attempt = time.time() + self.retry_after
+                self._refreshing = False
+            return
+
+        with self._lock:
+            self.models = models
+            self.fetched_at = time.time()
+            self.last_error = None
+            self._refreshing = False
+            if self.path:
+                try:
+                    self._save()
+                except OSError as e:
+                    self.last_error = f"Model-Liste nicht gespeichert: {e}"
@@ -0,0 +1,288 @@
+"""
+Headless batch analysis of document corpora: ``python -m desinfo``.
+
+Reads a directory of .txt files or a JSONL file ({"id": ..., "text": ...} per
+line), analyses the documents concurrently and writes one JSON result per
+document, optionally with PDF/DOCX reports. Documents whose result already
+exists for the same text and model are skipped, so an interrupted run can
+simply be restarted.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .analysis import analyze_statements
+from .api import (
+    ANALYZE_READ_TIMEOUT,
+    BATCH_MAX_WORKERS,
+    CONNECT_TIMEOUT,
+    DEFAULT_API_BASE_URL,
+    HTTP_POOL_SIZE,
+    TRANSPORT_GET,
+    TRANSPORT_POST_NDJSON,
+    ApiClient,
+    build_http_session,
+)
+from .cache import ResultCache
+from .limiter import LIMITER_INITIAL, LIMITER_LATENCY_TARGET, AdaptiveLimiter
+from .metrics import METRICS
+from .scoring import calculate_summary
+from .text import SPLIT_LINES, SPLIT_SENTENCES, parse_statements
+
+DEFAULT_WORKERS = 4                                      # Dokumente gleichzeitig
+DEFAULT_CACHE_PATH = os.path.join(".cache", "results.sqlite3")
+
+class Document:
+    """One input text with a stable ID and its output location"""
+    
+    __slots__ = ('doc_id', 'text', 'output_name')
+    
+    def __init__(self, doc_id: str, text: str, output_name: str):
+        self.doc_id = doc_id
+        self.text = text
+        self.output_name = output_name
+    
+    def fingerprint(self, model_id, split_mode: str) -> str:
+        """Identify text, model and split mode, a stored result is only reused if this matches"""
+        return hashlib.sha256(f"{model_id}\n{split_mode}\n{self.text}".encode('utf-8')).hexdigest()
+
+def safe_name(doc_id: str) -> str:
+    """File name for a free-form document ID; changed IDs get a short hash, so "x/1" and "x_1" stay apart"""
+    name = re.sub(r'[^\w.-]', '_', doc_id).strip('.') or '_'
+    if name != doc_id:
+        name = f"{name}-{hashlib.sha256(doc_id.encode('utf-8')).hexdigest()[:8]}"
+    return name
+
+def read_documents(path: str) -> list:
+    """Documents from a directory (*.txt, recursively) or a JSONL file"""
+    if os.path.isdir(path):
+        documents = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith('.txt'):
+                    continue
+                file_path = os.path.join(root, name)
+                rel = os.path.relpath(file_path, path)[:-len('.txt')]
+                with open(file_path, encoding='utf-8') as f:
+                    documents.append(Document(rel.replace(os.sep, '/'), f.read(), rel))
+        return documents
+    
+    documents = []
+    seen = set()
+    output_names = {}  # Dateiname (klein geschrieben, wegen case-insensitiver Dateisysteme) -> ID
+    with open(path, encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {'text': record}
+            doc_id = str(record.get('id', lineno))
+            if doc_id in seen:
+                raise ValueError(f"{path}:{lineno}: doppelte ID {doc_id!r}")
+            seen.add(doc_id)
+            output_name = safe_name(doc_id)
+            other = output_names.setdefault(output_name.lower(), doc_id)
+            if other != doc_id:
+                raise ValueError(f"{path}:{lineno}: ID {doc_id!r} ergibt denselben Dateinamen wie {other!r}")
+            documents.append(Document(doc_id, record['text'], output_name))
+    return documents
+
+def write_atomic(path: str, data: bytes):
+    """Write via a temporary file, so an interrupted run never leaves a partial file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def is_done(result_path: str, fingerprint: str) -> bool:
+    """A result exists for the same text and model"""
+    try:
+        with open(result_path, encoding='utf-8') as f:
+            return json.load(f).get('fingerprint') == fingerprint
+    except (OSError, ValueError):
+        return False
+
+def process_document(document: Document, args, client: ApiClient, cache: ResultCache) -> dict:
+    """Analyse one document and write its reports and result; returns counters for the summary"""
+    base_path = os.path.join(args.output, document.output_name)
+    result_path = f"{base_path}.json"
+    fingerprint = document.fingerprint(args.model, args.split)
+    if args.resume and is_done(result_path, fingerprint):
+        return {'status': 'skipped', 'statements': 0}
+    
+    started = time.perf_counter()
+    statements = parse_statements(document.text, args.split)
+    result = analyze_statements(
+        statements, args.model,
+        transport=args.transport,
+        batched=args.batched,
+        cache=cache,
+        client=client,
+        max_workers=args.batch_workers
+    )
+    if not result['success']:
+        return {'status': 'failed', 'statements': 0, 'error': result['error']}
+    
+    data = result['data']
+    summary = calculate_summary(data)
+    
+    # Reports zuerst: das JSON markiert das Dokument für --resume als fertig
+    if args.pdf:
+        from .reports import build_pdf
+        tmp_path = f"{base_path}.pdf.tmp"
+        os.makedirs(os.path.dirname(tmp_path) or '.', exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            build_pdf(f, data, summary)
+        os.replace(tmp_path, f"{base_path}.pdf")
+    if args.docx:
+        from .reports import generate_docx_report
+        write_atomic(f"{base_path}.docx", generate_docx_report(data, summary).getvalue())
+    
+    elapsed = time.perf_counter() - started
+    record = {
+        'id': document.doc_id,
+        'model_id': args.model,
+        'split': args.split,
+        'fingerprint': fingerprint,
+        'statements': len(statements),
+        'cache_hits': result['cache_hits'],
+        'elapsed_s': round(elapsed, 3),
+        'summary': summary,
+        'results': data
+    }
+    write_atomic(result_path, json.dumps(record, ensure_ascii=False, indent=2).encode('utf-8'))
+    return {'status': 'done', 'statements': len(statements), 'summary': summary, 'elapsed': elapsed}
+
+def run(args) -> int:
+    """Process all documents and print the throughput summary; returns the exit code"""
+    try:
+        documents = read_documents(args.input)
+    except ValueError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+    session = build_http_session(pool_size=max(HTTP_POOL_SIZE, args.workers * args.batch_workers))
+    # Höchstens so viele Requests wie bisher, das Limit passt sich der Backend-Last an
+    max_concurrency = max(1, args.workers * args.batch_workers)
+    limiter = AdaptiveLimiter(min(LIMITER_INITIAL, max_concurrency), max_limit=max_concurrency,
+                              latency_target=args.latency_target)
+    # Die Session wiederholt bereits; keine zweite Retry-Ebene pro Teilpaket
+    client = ApiClient(args.base_url, session, args.connect_timeout, analyze_read_timeout=args.read_timeout,
+                       limiter=limiter, retries=0)
+    cache = ResultCache(args.cache) if args.cache else None
+    if args.metrics_port:
+        METRICS.serve(args.metrics_port)
+    
+    counts = {'done': 0, 'skipped': 0, 'failed': 0}
+    statements_done = 0
+    started = time.perf_counter()
+    
+    pool = ThreadPoolExecutor(max_workers=max(1, args.workers))
+    interrupted = False
+    try:
+        futures = {pool.submit(process_document, doc, args, client, cache): doc for doc in documents}
+        for position, future in enumerate(as_completed(futures), 1):
+            document = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                outcome = {'status': 'failed', 'statements': 0, 'error': str(e)}
+            
+            counts[outcome['status']] += 1
+            statements_done += outcome['statements']
+            
+            prefix = f"[{position}/{len(documents)}] {document.doc_id}"
+            if outcome['status'] == 'done':
+                summary = outcome['summary']
+                print(f"{prefix}: {outcome['statements']} Aussagen, Score {summary['desinfo_score']} "
+                      f"({summary['grade']}), {outcome['elapsed']:.1f} s", file=sys.stderr)
+            elif outcome['status'] == 'failed':
+                print(f"{prefix}: FEHLER {outcome['error']}", file=sys.stderr)
+            elif args.verbose:
+                print(f"{prefix}: übersprungen (Ergebnis vorhanden)", file=sys.stderr)
+    except KeyboardInterrupt:
+        interrupted = True
+        print("Abgebrochen, fertige Dokumente bleiben erhalten (Neustart setzt fort).", file=sys.stderr)
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+    
+    elapsed = time.perf_counter() - started
+    print(f"Dokumente: {counts['done']} analysiert, {counts['skipped']} übersprungen, {counts['failed']} fehlgeschlagen")
+    print(f"Aussagen: {statements_done}")
+    print(f"Dauer: {elapsed:.1f} s")
+    print(f"Durchsatz: {counts['done'] / elapsed if elapsed else 0:.2f} Dokumente/s, "
+          f"{statements_done / elapsed if elapsed else 0:.1f} Aussagen/s")
+    if cache:
+        print(f"Cache-Trefferquote: {cache.hit_ratio:.0%}")
+    if args.verbose:
+        for stage, values in METRICS.snapshot()['stages'].items():
+            print(f"{stage}: n={values['count']}, p50 {values['p50'] * 1000:.2f} ms, p95 {values['p95'] * 1000:.2f} ms")
+    if args.metrics_json:
+        write_atomic(args.metrics_json, METRICS.to_json().encode('utf-8'))
+    
+    if interrupted:
+        return 130
+    return 1 if counts['failed'] else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line options"""
+    parser = argparse.ArgumentParser(
+        prog="python -m desinfo",
+        description="DESINFO-Analyse ganzer Textsammlungen ohne Streamlit."
+    )
+    parser.add_argument("input", nargs='?', help="Verzeichnis mit .txt-Dateien oder JSONL-Datei ({\"id\", \"text\"} pro Zeile)")
+    parser.add_argument("-m", "--model", type=int, help="Model-ID (siehe --list-models)")
+    parser.add_argument("-o", "--output", default="results", help="Ausgabeverzeichnis (Standard: results)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Dokumente gleichzeitig (Standard: {DEFAULT_WORKERS})")
+    parser.add_argument("--batch-workers", type=int, default=BATCH_MAX_WORKERS,
+                        help=f"parallele Requests pro Dokument (Standard: {BATCH_MAX_WORKERS})")
+    parser.add_argument("--no-batch", dest="batched", action="store_false",
+                        help="jedes Dokument in einem einzigen Request senden")
+    parser.add_argument("--split", choices=[SPLIT_LINES, SPLIT_SENTENCES], default=SPLIT_LINES,
+                        help="Aussagen pro Zeile bzw. an | (lines) oder Fließtext in Sätze teilen (sentences)")
+    parser.add_argument("--transport", choices=[TRANSPORT_GET, TRANSPORT_POST_NDJSON], default=TRANSPORT_GET)
+    parser.add_argument("--pdf", action="store_true", help="PDF-Report pro Dokument schreiben")
+    parser.add_argument("--docx", action="store_true", help="DOCX-Report pro Dokument schreiben")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                        help=f"Ergebnis-Cache (SQLite, Standard: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", dest="cache", action="store_const", const=None, help="ohne Ergebnis-Cache")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="vorhandene Ergebnisse neu berechnen")
+    parser.add_argument("--base-url", default=os.environ.get("DESINFO_API_BASE_URL", DEFAULT_API_BASE_URL),
+                        help="Backend-URL (Standard: $DESINFO_API_BASE_URL oder %(default)s)")
+    parser.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT)
+    parser.add_argument("--read-timeout", type=float, default=ANALYZE_READ_TIMEOUT)
+    parser.add_argument("--latency-target", type=float, default=LIMITER_LATENCY_TARGET,
+                        help="Sekunden pro Request, ab denen die Parallelität halbiert wird (Standard: %(default)s)")
+    parser.add_argument("--metrics-json", metavar="PATH", help="Laufzeiten und Zähler am Ende als JSON schreiben")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="Metriken während des Laufs auf localhost:PORT/metrics (Prometheus) anbieten")
+    parser.add_argument("--list-models", action="store_true", help="verfügbare Models anzeigen und beenden")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="auch übersprungene Dokumente und Laufzeiten pro Stufe melden")
+    return parser
+
+def main(argv: list = None) -> int:
+    """Entry point of python -m desinfo"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if args.list_models:
+        client = ApiClient(args.base_url, connect_timeout=args.connect_timeout)
+        for m in client.fetch_models():
+            print(f"{m['modelID']}\t{m['provider']}\t{m['modelName']}")
+        return 0
+    
+    if args.input is None or args.model is None:
+        parser.error("INPUT und --model sind erforderlich")
+    if not os.path.exists(args.input):
+        parser.error(f"{args.input} existiert nicht")
+    return run(args)
@@ -0,0 +1,159 @@
+"""
+Multi-model comparison: the same statements analysed by several models at once.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .analysis import AnalysisError, iter_analysis
+from .scoring import CATEGORIES, CATEGORY_POINTS, AnalysisResult, calculate_summary
+
+def model_label(model: dict) -> str:
+    """Display name of a model from the models endpoint"""
+    return f"{model['modelName']} ({model['provider']})"
+
+class ModelRun:
+    """Outcome of one model in a comparison"""
+    
+    __slots__ = ('model', 'categories', 'result', 'summary', 'elapsed', 'error')
+    
+    def __init__(self, model: dict, categories: list, result: AnalysisResult = None, summary: dict = None,
+                 elapsed: float = 0.0, error: str = None):
+        self.model = model
+        self.categories = categories  # Kategorie pro Eingabe-Index, None wenn nicht bewertet
+        self.result = result
+        self.summary = summary
+        self.elapsed = elapsed
+        self.error = error
+    
+    @property
+    def label(self) -> str:
+        return model_label(self.model)
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class ModelComparison:
+    """Per-model results aligned by statement, with agreement and disagreement views"""
+    
+    __slots__ = ('statements', 'runs', 'elapsed')
+    
+    def __init__(self, statements: list, runs: list, elapsed: float):
+        self.statements = statements
+        self.runs = runs
+        self.elapsed = elapsed
+    
+    @property
+    def ok_runs(self) -> list:
+        return [run for run in self.runs if run.ok]
+    
+    def agreement(self, a: ModelRun, b: ModelRun) -> tuple:
+        """(share of identical categories, Cohen's kappa) over statements both models scored"""
+        pairs = [(x, y) for x, y in zip(a.categories, b.categories) if x is not None and y is not None]
+        if not pairs:
+            return 0.0, 0.0
+        observed = sum(x == y for x, y in pairs) / len(pairs)
+        expected = sum(
+            (sum(x == cat for x, _ in pairs) / len(pairs)) * (sum(y == cat for _, y in pairs) / len(pairs))
+            for cat in CATEGORIES
+        )
+        kappa = (observed - expected) / (1 - expected) if expected < 1 else 1.0
+        return observed, kappa
+    
+    def agreement_matrix(self) -> list:
+        """Rows of agreement shares between all successful models"""
+        runs = self.ok_runs
+        return [[self.agreement(a, b)[0] for b in runs] for a in runs]
+    
+    def confusion(self, a: ModelRun, b: ModelRun) -> dict:
+        """{(category of a, category of b): count}"""
+        counts = {}
+        for x, y in zip(a.categories, b.categories):
+            if x is not None and y is not None:
+                counts[(x, y)] = counts.get((x, y), 0) + 1
+        return counts
+    
+    def disagreements(self) -> list:
+        """[(index, statement, [category per successful model])], largest point spread first"""
+        runs = self.ok_runs
+        rows = []
+        for idx, statement in enumerate(self.statements):
+            cats = [run.categories[idx] for run in runs]
+            scored = [cat for cat in cats if cat is not None]
+            if len(set(scored)) > 1:
+                points = [CATEGORY_POINTS.get(cat, 0) for cat in scored]
+                rows.append((max(points) - min(points), idx, statement, cats))
+        rows.sort(key=lambda row: (-row[0], row[1]))
+        return [(idx, statement, cats) for _, idx, statement, cats in rows]
+    
+    def to_dict(self) -> dict:
+        """Plain data for hashing and export"""
+        return {
+            'statements': self.statements,
+            'runs': [
+                {
+                    'model': run.model,
+                    'categories': run.categories,
+                    'summary': run.summary,
+                    'error': run.error
+                }
+                for run in self.runs
+            ]
+        }
+
+def compare_models(statements: list, models: list, progress=None, **options) -> ModelComparison:
+    """Analyse the statements with all models concurrently, one thread per model
+    
+    `progress(model, done, total)` is called in the calling thread (Streamlit
+    elements may be updated from it); `options` are passed to iter_analysis.
+    """
+    events = queue.Queue()
+    total = len(statements)
+    
+    def run_model(model: dict):
+        started = time.perf_counter()
+        results = [None] * total
+        try:
+            done = 0
+            for updates, _ in iter_analysis(statements, model['modelID'], **options):
+                for idx, item in updates:
+                    results[idx] = item
+                done += len(updates)
+                events.put(('progress', model, done))
+            error = None
+        except AnalysisError as e:
+            error = str(e)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        events.put(('done', model, (results, time.perf_counter() - started, error)))
+    
+    started = time.perf_counter()
+    # Ein Thread pro Model; jedes Model nutzt zusätzlich seinen eigenen Batch-Pool
+    pool = ThreadPoolExecutor(max_workers=max(1, len(models)), thread_name_prefix="compare")
+    try:
+        for model in models:
+            pool.submit(run_model, model)
+        
+        finished = {}
+        while len(finished) < len(models):
+            kind, model, payload = events.get()
+            if kind == 'progress':
+                if progress:
+                    progress(model, payload, total)
+            else:
+                finished[model['modelID']] = payload
+    finally:
+        # Bei Abbruch (z.B. Streamlit-Rerun) nicht auf offene Models warten
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    runs = []
+    for model in models:
+        results, elapsed, error = finished[model['modelID']]
+        categories = [item['kategorie'] if item else None for item in results]
+        if error:
+            runs.append(ModelRun(model, categories, elapsed=elapsed, error=error))
+            continue
+        result = AnalysisResult([item for item in results if item is not None])
+        runs.append(ModelRun(model, categories, result, calculate_summary(result), elapsed))
+    return ModelComparison(statements, runs, time.perf_counter() - started)
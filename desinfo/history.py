@@ -0,0 +1,311 @@
+"""
+Persistent history of finished analyses for score trends over time.
+
+Every statement result is stored with the metadata of its analysis (date,
+speaker, outlet, model). The app records each analysis when it finishes; speaker,
+outlet and date can be added or corrected afterwards with update(). Queries never scan the statements: recording an
+analysis also adds its counts to tables pre-aggregated per day, model and
+category, with and without speaker and outlet. Trends over millions of
+statements therefore read a few thousand rows unless they filter by speaker or
+outlet, and then only the rows of that speaker or outlet.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from .metrics import METRICS
+from .scoring import CATEGORIES, CATEGORY_POINTS, score_grade
+
+# ISO-Woche: Jahr und Woche des Donnerstags derselben Woche (SQLite vor 3.46 kennt kein %G/%V)
+_ISO_THURSDAY = "date(day, '-3 days', 'weekday 4')"
+
+HISTORY_PERIODS = {
+    'day': "day",
+    'week': f"strftime('%Y', {_ISO_THURSDAY}) || '-W' || printf('%02d', (strftime('%j', {_ISO_THURSDAY}) - 1) / 7 + 1)",
+    'month': "substr(day, 1, 7)",
+    'year': "substr(day, 1, 4)",
+}
+
+def _aggregate_table(speaker: str = None, outlet: str = None) -> str:
+    """Smallest pre-aggregated table that can answer a query with these filters"""
+    return "daily_models" if speaker is None and outlet is None else "daily"
+
+def _filters(start, end, speaker: str = None, outlet: str = None, model_id=None) -> tuple:
+    """WHERE clause and parameters shared by the aggregate tables and the analyses table"""
+    clauses = ["day BETWEEN ? AND ?"]
+    params = [str(start), str(end)]
+    for column, value in (('speaker', speaker), ('outlet', outlet), ('model_id', model_id)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(str(value))
+    return " AND ".join(clauses), params
+
+def _score(statements: int, points: int) -> dict:
+    desinfo_score = points / statements if statements > 0 else 0
+    grade, grade_label, grade_description = score_grade(desinfo_score)
+    return {
+        'desinfo_score': round(desinfo_score, 1),
+        'grade': grade,
+        'grade_label': grade_label,
+        'grade_description': grade_description
+    }
+
+class HistoryStore:
+    """Statement results with metadata and daily aggregates in SQLite"""
+    
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                analysis_id INTEGER PRIMARY KEY,
+                day TEXT NOT NULL,
+                speaker TEXT NOT NULL,
+                outlet TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                model_name TEXT NOT NULL,
+                statements INTEGER NOT NULL,
+                points INTEGER NOT NULL,
+                grade TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                source_key TEXT
+            )
+        """)
+        # Verläufe aus der Zeit vor source_key
+        if "source_key" not in [row[1] for row in self._conn.execute("PRAGMA table_info(analyses)")]:
+            self._conn.execute("ALTER TABLE analyses ADD COLUMN source_key TEXT")
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_analyses_source_key ON analyses (source_key)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS statement_results (
+                analysis_id INTEGER NOT NULL,
+                idx INTEGER NOT NULL,
+                aussage TEXT NOT NULL,
+                kategorie TEXT NOT NULL,
+                begruendung TEXT NOT NULL,
+                punkte INTEGER NOT NULL,
+                PRIMARY KEY (analysis_id, idx)
+            ) WITHOUT ROWID
+        """)
+        # Voraggregiert: eine Zeile pro Tag, Sprecher:in, Medium, Model und Kategorie
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily (
+                day TEXT NOT NULL,
+                speaker TEXT NOT NULL,
+                outlet TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                kategorie TEXT NOT NULL,
+                statements INTEGER NOT NULL,
+                points INTEGER NOT NULL,
+                PRIMARY KEY (day, speaker, outlet, model_id, kategorie)
+            ) WITHOUT ROWID
+        """)
+        # Dasselbe ohne Sprecher:in und Medium, für ungefilterte und Model-Abfragen
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_models (
+                day TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                kategorie TEXT NOT NULL,
+                statements INTEGER NOT NULL,
+                points INTEGER NOT NULL,
+                PRIMARY KEY (day, model_id, kategorie)
+            ) WITHOUT ROWID
+        """)
+        # Die Grade-Verteilung liest nur die Indizes der Analysen-Tabelle
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_day ON analyses (day, grade)")
+        for column in ("speaker", "outlet", "model_id"):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_analyses_{column} ON analyses ({column}, day, grade)")
+        for column in ("speaker", "outlet"):
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_daily_{column} ON daily ({column}, day)")
+    
+    def _add_aggregates(self, day: str, speaker: str, outlet: str, model_id: str, per_category: dict,
+                        sign: int = 1):
+        """Add (or with sign=-1 remove) {category: [statements, points]} of one analysis to the daily tables"""
+        self._conn.executemany(
+            "INSERT INTO daily VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (day, speaker, outlet, model_id, kategorie) DO UPDATE SET "
+            "statements = statements + excluded.statements, points = points + excluded.points",
+            [(day, speaker, outlet, model_id, category, sign * count, sign * points)
+             for category, (count, points) in per_category.items()]
+        )
+        self._conn.executemany(
+            "INSERT INTO daily_models VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (day, model_id, kategorie) DO UPDATE SET "
+            "statements = statements + excluded.statements, points = points + excluded.points",
+            [(day, model_id, category, sign * count, sign * points) for category, (count, points) in per_category.items()]
+        )
+        if sign < 0:
+            self._conn.execute("DELETE FROM daily WHERE statements = 0")
+            self._conn.execute("DELETE FROM daily_models WHERE statements = 0")
+    
+    def _stored_aggregates(self, analysis_id: int):
+        """(day, speaker, outlet, model_id, {category: [statements, points]}) of a stored analysis, or None"""
+        row = self._conn.execute(
+            "SELECT day, speaker, outlet, model_id FROM analyses WHERE analysis_id = ?", (analysis_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        counts = self._conn.execute(
+            "SELECT kategorie, COUNT(*) FROM statement_results WHERE analysis_id = ? GROUP BY kategorie", (analysis_id,)
+        ).fetchall()
+        return (*row, {category: [count, count * CATEGORY_POINTS.get(category, 0)] for category, count in counts})
+    
+    def record(self, analysis_data: list, model: dict, speaker: str = "", outlet: str = "",
+               day: date = None, source_key: str = None, replaces: int = None) -> int:
+        """Store a finished analysis and return its ID
+        
+        An analysis recorded again under the same source_key (e.g. a reloaded
+        job), or a new analysis of an edited input passing the earlier ID as
+        replaces, replaces the earlier one and keeps its speaker, outlet and day.
+        """
+        speaker, outlet = speaker.strip(), outlet.strip()
+        model_id = str(model['modelID'])
+        
+        rows = []
+        per_category = {}
+        for idx, item in enumerate(analysis_data):
+            category = item['kategorie']
+            points = CATEGORY_POINTS.get(category, 0)
+            rows.append((idx, item.get('aussage', ''), category, item.get('begründung', ''),
+                         item.get('punkte', points)))
+            counts = per_category.setdefault(category, [0, 0])
+            counts[0] += 1
+            counts[1] += points
+        total_points = sum(points for _, points in per_category.values())
+        grade = _score(len(rows), total_points)['grade']
+        
+        with self._lock:
+            self._conn.execute("BEGIN")
+            existing = None
+            if source_key is not None:
+                existing = self._conn.execute(
+                    "SELECT analysis_id, day, speaker, outlet FROM analyses WHERE source_key = ?", (source_key,)
+                ).fetchone()
+            if existing is None and replaces is not None:
+                existing = self._conn.execute(
+                    "SELECT analysis_id, day, speaker, outlet FROM analyses WHERE analysis_id = ?", (replaces,)
+                ).fetchone()
+            if existing:
+                old_id, old_day, old_speaker, old_outlet = existing
+                day, speaker, outlet = day or old_day, speaker or old_speaker, outlet or old_outlet
+                self._add_aggregates(*self._stored_aggregates(old_id), sign=-1)
+                self._conn.execute("DELETE FROM statement_results WHERE analysis_id = ?", (old_id,))
+                self._conn.execute("DELETE FROM analyses WHERE analysis_id = ?", (old_id,))
+            day = str(day or date.today())
+            cursor = self._conn.execute(
+                "INSERT INTO analyses (day, speaker, outlet, model_id, model_name, statements, points, grade, "
+                "created_at, source_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (day, speaker, outlet, model_id, model.get('modelName', ''), len(rows), total_points, grade, time.time(),
+                 source_key)
+            )
+            analysis_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO statement_results VALUES (?, ?, ?, ?, ?, ?)",
+                [(analysis_id, *row) for row in rows]
+            )
+            self._add_aggregates(day, speaker, outlet, model_id, per_category)
+            self._conn.execute("COMMIT")
+        METRICS.inc("history_statements", len(rows))
+        return analysis_id
+    
+    def update(self, analysis_id: int, speaker: str, outlet: str, day: date) -> bool:
+        """Change speaker, outlet and day of a stored analysis; False if it does not exist"""
+        speaker, outlet, day = speaker.strip(), outlet.strip(), str(day)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            stored = self._stored_aggregates(analysis_id)
+            if stored is None:
+                self._conn.execute("ROLLBACK")
+                return False
+            old_day, old_speaker, old_outlet, model_id, per_category = stored
+            self._add_aggregates(old_day, old_speaker, old_outlet, model_id, per_category, sign=-1)
+            self._conn.execute(
+                "UPDATE analyses SET day = ?, speaker = ?, outlet = ? WHERE analysis_id = ?",
+                (day, speaker, outlet, analysis_id)
+            )
+            self._add_aggregates(day, speaker, outlet, model_id, per_category)
+            self._conn.execute("COMMIT")
+        return True
+    
+    def metadata(self, analysis_id: int):
+        """(speaker, outlet, day) of a stored analysis, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT speaker, outlet, day FROM analyses WHERE analysis_id = ?", (analysis_id,)
+            ).fetchone()
+        return (row[0], row[1], date.fromisoformat(row[2])) if row else None
+    
+    @METRICS.timed("history_summary")
+    def summary(self, start, end, speaker: str = None, outlet: str = None, model_id=None) -> dict:
+        """calculate_summary-style totals plus category shares and the grade distribution of the analyses"""
+        where, params = _filters(start, end, speaker, outlet, model_id)
+        table = _aggregate_table(speaker, outlet)
+        with self._lock:
+            category_rows = self._conn.execute(
+                f"SELECT kategorie, SUM(statements), SUM(points) FROM {table} WHERE {where} GROUP BY kategorie", params
+            ).fetchall()
+            grade_rows = self._conn.execute(
+                f"SELECT grade, COUNT(*) FROM analyses WHERE {where} GROUP BY grade", params
+            ).fetchall()
+        
+        category_counts = {category: count for category, count, _ in category_rows}
+        total_statements = sum(category_counts.values())
+        total_points = sum(points for _, _, points in category_rows)
+        grade_counts = dict(grade_rows)
+        return {
+            'total_statements': total_statements,
+            'category_counts': category_counts,
+            'category_shares': {cat: (category_counts.get(cat, 0) / total_statements * 100) if total_statements else 0
+                                for cat in CATEGORIES},
+            'total_points': total_points,
+            **_score(total_statements, total_points),
+            'analyses': sum(grade_counts.values()),
+            'grade_counts': grade_counts
+        }
+    
+    @METRICS.timed("history_trend")
+    def trend(self, start, end, period: str = 'month', speaker: str = None, outlet: str = None,
+              model_id=None) -> list:
+        """[{'period', 'total_statements', 'total_points', 'desinfo_score', 'grade', 'category_counts'}] in date order"""
+        bucket = HISTORY_PERIODS[period]
+        where, params = _filters(start, end, speaker, outlet, model_id)
+        table = _aggregate_table(speaker, outlet)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {bucket} AS period, kategorie, SUM(statements), SUM(points) FROM {table} WHERE {where} "
+                f"GROUP BY period, kategorie ORDER BY period",
+                params
+            ).fetchall()
+        
+        periods = {}
+        for period_key, category, count, points in rows:
+            entry = periods.setdefault(period_key, {'period': period_key, 'total_statements': 0, 'total_points': 0,
+                                                    'category_counts': {}})
+            entry['total_statements'] += count
+            entry['total_points'] += points
+            entry['category_counts'][category] = count
+        return [{**entry, **_score(entry['total_statements'], entry['total_points'])} for entry in periods.values()]
+    
+    def values(self, column: str) -> list:
+        """Known speakers or outlets, sorted"""
+        if column not in ('speaker', 'outlet'):
+            raise ValueError(f"Unbekannte Spalte: {column}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT {column} FROM analyses WHERE {column} != '' ORDER BY {column}"
+            ).fetchall()
+        return [value for (value,) in rows]
+    
+    def models(self) -> dict:
+        """{model_id: model name} of all recorded analyses"""
+        with self._lock:
+            rows = self._conn.execute("SELECT model_id, MAX(model_name) FROM analyses GROUP BY model_id").fetchall()
+        return dict(rows)
+    
+    def date_range(self) -> tuple:
+        """(first day, last day) as ISO strings, or (None, None) if empty"""
+        with self._lock:
+            return self._conn.execute("SELECT MIN(day), MAX(day) FROM analyses").fetchone()
@@ -0,0 +1,189 @@
+"""
+Incremental statement extraction from uploaded TXT, CSV, DOCX and PDF files.
+
+Every reader is a generator over text units (lines, CSV cells, paragraphs,
+reflowed PDF lines), so a file is never turned into one big string. Units that
+contain ``|`` are split further, like pasted text; in sentence mode they are
+segmented into sentences instead. pypdf is imported only when a PDF is read.
+"""
+import csv
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from .text import SPLIT_LINES, SPLIT_SENTENCES, segment_sentences, segment_stream
+
+SUPPORTED_TYPES = ['txt', 'csv', 'docx', 'pdf']
+
+# CSV-Spalten, die ohne Auswahl als Aussage-Spalte erkannt werden
+CSV_TEXT_COLUMNS = ('aussage', 'aussagen', 'text', 'statement', 'statements')
+CSV_SNIFF_BYTES = 64 * 1024
+
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# PDF-Zeilen werden bis zum Satzende zusammengeführt
+_SENTENCE_END = re.compile(r'[.!?…:;"“”»«]\s*$')
+_HYPHENATED = re.compile(r'\w-$')
+
+class IngestError(Exception):
+    """The uploaded file cannot be read"""
+
+def file_type(name: str) -> str:
+    """Lower-case extension, checked against SUPPORTED_TYPES"""
+    ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    if ext not in SUPPORTED_TYPES:
+        raise IngestError(f"Nicht unterstütztes Dateiformat: {name}")
+    return ext
+
+def split_units(units):
+    """Statements from text units, splitting at | and dropping empty ones"""
+    for unit in units:
+        if '|' in unit:
+            for part in unit.split('|'):
+                part = part.strip()
+                if part:
+                    yield part
+        else:
+            unit = unit.strip()
+            if unit:
+                yield unit
+
+def open_text(file):
+    """Decode a binary file incrementally (UTF-8, optional BOM)"""
+    return io.TextIOWrapper(file, encoding='utf-8-sig', errors='replace', newline='')
+
+def iter_txt(file):
+    """One unit per line"""
+    text = open_text(file)
+    try:
+        for line in text:
+            yield line.rstrip('\r\n')
+    finally:
+        # Die hochgeladene Datei gehört dem Aufrufer
+        text.detach()
+
+def sniff_csv(file) -> tuple:
+    """(dialect, sample) from the start of a CSV file; the file position is restored"""
+    position = file.tell()
+    try:
+        sample = file.read(CSV_SNIFF_BYTES).decode('utf-8-sig', errors='replace')
+    finally:
+        file.seek(position)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',;\t'), sample
+    except csv.Error:
+        return csv.excel, sample
+
+def csv_columns(file) -> list:
+    """Header row of a CSV file"""
+    dialect, sample = sniff_csv(file)
+    return next(csv.reader(io.StringIO(sample), dialect), [])
+
+def default_csv_column(columns: list) -> int:
+    """Index of the statement column: a known name, else the first column"""
+    for idx, name in enumerate(columns):
+        if name.strip().lower() in CSV_TEXT_COLUMNS:
+            return idx
+    return 0
+
+def iter_csv(file, column: str = None):
+    """One unit per row from the given (or detected) column, header row skipped"""
+    dialect, _ = sniff_csv(file)
+    text = open_text(file)
+    try:
+        rows = csv.reader(text, dialect)
+        header = next(rows, None)
+        if header is None:
+            return
+        if column is None:
+            idx = default_csv_column(header)
+        elif column in header:
+            idx = header.index(column)
+        else:
+            raise IngestError(f"Spalte {column!r} nicht gefunden")
+        for row in rows:
+            if idx < len(row):
+                yield row[idx]
+    except csv.Error as e:
+        raise IngestError(f"CSV-Zeile {rows.line_num}: {e}")
+    finally:
+        text.detach()
+
+def iter_docx(file):
+    """One unit per paragraph, parsed with iterparse instead of loading the whole document"""
+    try:
+        archive = zipfile.ZipFile(file)
+        part = archive.open('word/document.xml')
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise IngestError(f"Keine gültige DOCX-Datei: {e}")
+    
+    with archive, part:
+        for event, elem in ElementTree.iterparse(part, events=('end',)):
+            if elem.tag == f'{_W_NS}p':
+                yield ''.join(node.text or '' for node in elem.iter(f'{_W_NS}t'))
+                elem.clear()
+
+def reflow_lines(lines):
+    """Join layout lines into units: until a sentence end or an empty line, undoing hyphenation"""
+    buffer = ''
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if buffer:
+                yield buffer
+                buffer = ''
+            continue
+        if not buffer:
+            buffer = line
+        elif _HYPHENATED.search(buffer) and line[:1].islower():
+            buffer = buffer[:-1] + line
+        else:
+            buffer = f'{buffer} {line}'
+        if _SENTENCE_END.search(buffer):
+            yield buffer
+            buffer = ''
+    if buffer:
+        yield buffer
+
+def iter_pdf(file):
+    """Reflowed text lines, extracted page by page"""
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+    
+    try:
+        reader = PdfReader(file)
+    except PdfReadError as e:
+        raise IngestError(f"Keine gültige PDF-Datei: {e}")
+    
+    def page_lines():
+        for number, page in enumerate(reader.pages, 1):
+            try:
+                text = page.extract_text() or ''
+            except PdfReadError as e:
+                raise IngestError(f"PDF-Seite {number}: {e}")
+            yield from text.splitlines()
+            yield ''  # Seitenende beendet den Absatz, damit Kopf- und Fußzeilen nicht angehängt werden
+    
+    yield from reflow_lines(page_lines())
+
+def iter_file_statements(file, name: str, csv_column: str = None, mode: str = SPLIT_LINES):
+    """Statements from an uploaded file, produced lazily while it is read"""
+    ext = file_type(name)
+    if ext == 'txt':
+        units = iter_txt(file)
+    elif ext == 'csv':
+        units = iter_csv(file, csv_column)
+    elif ext == 'docx':
+        units = iter_docx(file)
+    else:
+        units = iter_pdf(file)
+    
+    if mode != SPLIT_SENTENCES:
+        yield from split_units(units)
+    elif ext == 'txt':
+        # Sätze laufen über Zeilenumbrüche hinweg, Leerzeilen trennen Absätze
+        yield from segment_stream(units)
+    else:
+        for unit in units:
+            yield from segment_sentences(unit)
@@ -0,0 +1,278 @@
+"""
+Background analysis jobs that outlive Streamlit reruns, disconnects and restarts.
+
+Jobs run on a process-level thread pool. Every completed batch is written to
+SQLite, so a job that was interrupted (process restart, failure, cancellation)
+continues with the statements that are still missing when it is started again.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .analysis import AnalysisError, iter_analysis
+from .api import TRANSPORT_GET, ApiClient
+from .cache import ResultCache
+from .text import normalize_statement
+
+JOB_WORKERS = 4                    # gleichzeitig laufende Jobs pro Prozess
+JOB_RETENTION = 7 * 24 * 3600      # Sekunden, danach werden Jobs gelöscht
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_UNFINISHED = (JOB_QUEUED, JOB_RUNNING)
+
+class Job:
+    """Input, settings and (partial) results of one analysis job"""
+    
+    __slots__ = ('job_id', 'model_id', 'transport', 'batched', 'use_cache', 'statements', 'results',
+                 'status', 'error', 'cache_hits', 'created_at', 'updated_at', 'started_at', 'scored')
+    
+    def __init__(self, job_id: str, model_id: int, statements: list, transport: str = TRANSPORT_GET,
+                 batched: bool = True, use_cache: bool = True, results: list = None, status: str = JOB_QUEUED,
+                 error: str = None, cache_hits: int = 0, created_at: float = None, updated_at: float = None,
+                 started_at: float = None, scored: int = 0):
+        self.job_id = job_id
+        self.model_id = model_id
+        self.transport = transport
+        self.batched = batched
+        self.use_cache = use_cache
+        self.statements = statements
+        self.results = results if results is not None else [None] * len(statements)
+        self.status = status
+        self.error = error
+        self.cache_hits = cache_hits
+        self.created_at = created_at or time.time()
+        self.updated_at = updated_at or self.created_at
+        # Nur im laufenden Prozess, Basis für die ETA: Start des aktuellen Laufs und seither vom Backend bewertete Aussagen
+        self.started_at = started_at
+        self.scored = scored
+    
+    @property
+    def total(self) -> int:
+        return len(self.statements)
+    
+    @property
+    def done(self) -> int:
+        return sum(item is not None for item in self.results)
+    
+    @property
+    def finished(self) -> bool:
+        return self.status not in JOB_UNFINISHED
+    
+    @property
+    def data(self) -> list:
+        """Results received so far, in input order"""
+        return [item for item in self.results if item is not None]
+    
+    def snapshot(self) -> 'Job':
+        """Copy that the worker thread no longer changes"""
+        return Job(self.job_id, self.model_id, self.statements, self.transport, self.batched, self.use_cache,
+                   list(self.results), self.status, self.error, self.cache_hits, self.created_at, self.updated_at,
+                   self.started_at, self.scored)
+
+class JobStore:
+    """Jobs and their completed batches in SQLite"""
+    
+    def __init__(self, path: str, retention: float = JOB_RETENTION):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                model_id INTEGER NOT NULL,
+                transport TEXT NOT NULL,
+                batched INTEGER NOT NULL,
+                use_cache INTEGER NOT NULL,
+                statements TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                cache_hits INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                item TEXT NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            )
+        """)
+    
+    def create(self, job: Job):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.job_id, job.model_id, job.transport, int(job.batched), int(job.use_cache),
+                 json.dumps(job.statements, ensure_ascii=False), job.status, job.error, job.cache_hits,
+                 job.created_at, job.updated_at)
+            )
+    
+    def update(self, job: Job):
+        """Persist status, error and counters"""
+        job.updated_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, cache_hits = ?, updated_at = ? WHERE job_id = ?",
+                (job.status, job.error, job.cache_hits, job.updated_at, job.job_id)
+            )
+    
+    def save_results(self, job_id: str, updates: list):
+        """Persist [(input index, result)] of a completed batch"""
+        rows = [(job_id, idx, json.dumps(item, ensure_ascii=False)) for idx, item in updates]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO job_results VALUES (?, ?, ?)", rows)
+            self._conn.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+            self._conn.execute("COMMIT")
+    
+    def load(self, job_id: str):
+        """The stored job with its results, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            results = self._conn.execute("SELECT idx, item FROM job_results WHERE job_id = ?", (job_id,)).fetchall()
+        job_id, model_id, transport, batched, use_cache, statements, status, error, cache_hits, created, updated = row
+        job = Job(job_id, model_id, json.loads(statements), transport, bool(batched), bool(use_cache),
+                  status=status, error=error, cache_hits=cache_hits, created_at=created, updated_at=updated)
+        for idx, item in results:
+            job.results[idx] = json.loads(item)
+        return job
+    
+    def unfinished(self) -> list:
+        """IDs of jobs that were queued or running, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id FROM jobs WHERE status IN ({','.join('?' * len(JOB_UNFINISHED))}) ORDER BY created_at",
+                JOB_UNFINISHED
+            ).fetchall()
+        return [job_id for (job_id,) in rows]
+    
+    def prune(self):
+        """Delete jobs not touched within the retention period"""
+        cutoff = time.time() - self.retention
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "DELETE FROM job_results WHERE job_id IN (SELECT job_id FROM jobs WHERE updated_at < ?)", (cutoff,)
+            )
+            self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+            self._conn.execute("COMMIT")
+
+class JobQueue:
+    """Process-level worker pool for analysis jobs; resumes unfinished jobs on start"""
+    
+    def __init__(self, store: JobStore, client: ApiClient, cache: ResultCache = None, max_workers: int = JOB_WORKERS):
+        self.store = store
+        self.client = client
+        self.cache = cache
+        self._jobs = {}      # Job-ID -> Job, solange er in diesem Prozess läuft
+        self._cancel = {}    # Job-ID -> Event
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        store.prune()
+        for job_id in store.unfinished():
+            self.restart(job_id)
+    
+    def submit(self, statements: list, model_id: int, transport: str = TRANSPORT_GET, batched: bool = True,
+               use_cache: bool = True, known: dict = None) -> str:
+        """Queue a new job and return its ID; statements found in `known` (see previous_results) are not sent"""
+        job = Job(uuid.uuid4().hex, model_id, list(statements), transport, batched, use_cache)
+        self.store.create(job)
+        if known:
+            reused = []
+            for idx, statement in enumerate(job.statements):
+                item = known.get(normalize_statement(statement))
+                if item is not None:
+                    job.results[idx] = {**item, 'aussage': statement}
+                    reused.append((idx, job.results[idx]))
+            if reused:
+                self.store.save_results(job.job_id, reused)
+        self._start(job)
+        return job.job_id
+    
+    def get(self, job_id: str):
+        """Current state of a job: a snapshot if it runs in this process, else the stored one (None if unknown)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job.snapshot()
+        return self.store.load(job_id)
+    
+    def cancel(self, job_id: str):
+        with self._lock:
+            event = self._cancel.get(job_id)
+        if event:
+            event.set()
+    
+    def restart(self, job_id: str) -> bool:
+        """Continue a stored job with its missing statements; False if unknown or already running"""
+        with self._lock:
+            if job_id in self._jobs:
+                return False
+        job = self.store.load(job_id)
+        if job is None:
+            return False
+        job.status = JOB_QUEUED
+        job.error = None
+        self.store.update(job)
+        self._start(job)
+        return True
+    
+    def _start(self, job: Job):
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._cancel[job.job_id] = threading.Event()
+        self._pool.submit(self._run, job)
+    
+    def _run(self, job: Job):
+        cancelled = self._cancel[job.job_id]
+        # Bereits gespeicherte Teilpakete werden nicht erneut gesendet
+        pending = [idx for idx, item in enumerate(job.results) if item is None]
+        updates_iter = iter_analysis(
+            (job.statements[idx] for idx in pending), job.model_id, job.transport, job.batched,
+            self.cache if job.use_cache else None, self.client
+        )
+        try:
+            if cancelled.is_set():
+                job.status = JOB_CANCELLED
+                return
+            job.status = JOB_RUNNING
+            job.started_at, job.scored = time.time(), 0
+            self.store.update(job)
+            for updates, from_cache in updates_iter:
+                updates = [(pending[idx], item) for idx, item in updates]
+                for idx, item in updates:
+                    job.results[idx] = item
+                if from_cache:
+                    job.cache_hits += len(updates)
+                else:
+                    job.scored += len(updates)
+                self.store.save_results(job.job_id, updates)
+                if cancelled.is_set():
+                    job.status = JOB_CANCELLED
+                    break
+            else:
+                job.status = JOB_DONE
+        except AnalysisError as e:
+            job.status, job.error = JOB_FAILED, str(e)
+        except Exception as e:
+            job.status, job.error = JOB_FAILED, f"{type(e).__name__}: {e}"
+        finally:
+            updates_iter.close()
+            self.store.update(job)
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+                self._cancel.pop(job.job_id, None)
@@ -0,0 +1,94 @@
+"""
+Adaptive concurrency limit for backend calls (AIMD).
+
+The limit grows by one per round trip while calls finish within the latency
+target. It is halved on timeouts, connection errors, 429 and 5xx responses,
+and on calls slower than the target. Only calls that started after the last
+decrease can trigger the next one, so one slow burst halves the limit once.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+
+from .metrics import METRICS
+
+LIMITER_INITIAL = 8            # parallele Backend-Requests beim Start, für alle Sessions zusammen
+LIMITER_MIN = 1
+LIMITER_MAX = 64
+LIMITER_BACKOFF = 0.5          # Faktor bei Überlast
+LIMITER_LATENCY_TARGET = 60.0  # Sekunden pro Request, darüber gilt das Backend als überlastet
+
+def is_overload(error: Exception) -> bool:
+    """Timeouts, connection errors, 429 and 5xx indicate an overloaded backend"""
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+class Permit:
+    """One granted slot; the caller marks it overloaded if the call failed that way"""
+    
+    __slots__ = ('started', 'overloaded')
+    
+    def __init__(self, started: float):
+        self.started = started
+        self.overloaded = False
+
+class AdaptiveLimiter:
+    """Thread-safe AIMD limit on concurrent calls, shared by everything that holds it"""
+    
+    def __init__(self, initial: int = LIMITER_INITIAL, min_limit: int = LIMITER_MIN, max_limit: int = LIMITER_MAX,
+                 backoff: float = LIMITER_BACKOFF, latency_target: float = LIMITER_LATENCY_TARGET):
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.backoff = backoff
+        self.latency_target = latency_target
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.inflight = 0
+        self.waiting = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._publish()
+    
+    def _publish(self):
+        METRICS.set_gauge("limiter_limit", int(self.limit))
+        METRICS.set_gauge("limiter_inflight", self.inflight)
+        METRICS.set_gauge("limiter_queue_depth", self.waiting)
+    
+    @contextmanager
+    def slot(self):
+        """Wait for a free slot and hold it for the enclosed call"""
+        queued = time.monotonic()
+        with self._cond:
+            self.waiting += 1
+            self._publish()
+            while self.inflight >= int(self.limit):
+                self._cond.wait()
+            self.waiting -= 1
+            self.inflight += 1
+            self._publish()
+        
+        permit = Permit(time.monotonic())
+        METRICS.observe("limiter_wait", permit.started - queued)
+        try:
+            yield permit
+        finally:
+            self._release(permit)
+    
+    def _release(self, permit: Permit):
+        now = time.monotonic()
+        with self._cond:
+            self.inflight -= 1
+            if permit.overloaded or now - permit.started > self.latency_target:
+                if permit.started >= self._last_decrease:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+                    METRICS.inc("limiter_decreases")
+            else:
+                # +1 pro Runde: jeder erfolgreiche Request erhöht um 1/Limit
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._publish()
+            self._cond.notify_all()
@@ -0,0 +1,175 @@
+"""
+In-process timing spans and counters for the hot paths.
+
+Stages keep their most recent durations in a bounded window, from which p50/p95
+are computed on demand; counters only grow and gauges hold the last value set.
+The registry renders itself as Prometheus text or as JSON, and can serve both
+on a local port.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_WINDOW = 1024   # letzte Messwerte pro Stage für die Perzentile
+METRICS_PREFIX = "desinfo"
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list, i.e. its ceil(q * n)-th value
+    
+    >>> percentile(list(range(1, 11)), 0.5)
+    5
+    >>> percentile(list(range(1, 101)), 0.95)
+    95
+    >>> percentile(list(range(1, 21)), 0.95)
+    19
+    >>> percentile(list(range(1, 101)), 0.07), percentile([3], 0.0), percentile([], 0.5)
+    (7, 3, 0.0)
+    """
+    if not sorted_values:
+        return 0.0
+    # q * n liegt bei ganzzahligem Rang evtl. knapp darüber (0.07 * 100 = 7.000000000000001)
+    rank = math.ceil(q * len(sorted_values) - 1e-9) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+class Metrics:
+    """Thread-safe registry of timing spans and counters"""
+    
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self._samples = {}   # Stage -> deque der letzten Dauern
+        self._totals = {}    # Stage -> [Anzahl, Summe] seit Start
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, stage: str, seconds: float):
+        """Record one duration of a stage"""
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._totals[stage] = [0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+    
+    @contextmanager
+    def span(self, stage: str):
+        """Time the enclosed block, also when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+    
+    def timed(self, stage: str):
+        """Decorator form of span"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def inc(self, counter: str, value: int = 1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+    
+    def set_gauge(self, gauge: str, value: float):
+        with self._lock:
+            self._gauges[gauge] = value
+    
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._counters.clear()
+    
+    def snapshot(self) -> dict:
+        """{'stages': {stage: {count, sum, p50, p95, max}}, 'counters': {...}, 'gauges': {...}}, durations in seconds"""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            totals = {stage: tuple(values) for stage, values in self._totals.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        stages = {}
+        for stage in sorted(samples):
+            values = samples[stage]
+            count, total = totals[stage]
+            stages[stage] = {
+                'count': count,
+                'sum': total,
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95),
+                'max': values[-1] if values else 0.0
+            }
+        return {'stages': stages, 'counters': dict(sorted(counters.items())), 'gauges': dict(sorted(gauges.items()))}
+    
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+    
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (summaries for stages, counters, gauges)"""
+        snapshot = self.snapshot()
+        name = f"{METRICS_PREFIX}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Duration of instrumented stages (quantiles over the last {self.window} calls).",
+            f"# TYPE {name} summary",
+        ]
+        for stage, values in snapshot['stages'].items():
+            lines.append(f'{name}{{stage="{stage}",quantile="0.5"}} {values["p50"]:.6f}')
+            lines.append(f'{name}{{stage="{stage}",quantile="0.95"}} {values["p95"]:.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {values["sum"]:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {values["count"]}')
+        for counter, value in snapshot['counters'].items():
+            counter_name = f"{METRICS_PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {counter_name} counter")
+            lines.append(f"{counter_name} {value}")
+        for gauge, value in snapshot['gauges'].items():
+            gauge_name = f"{METRICS_PREFIX}_{gauge}"
+            lines.append(f"# TYPE {gauge_name} gauge")
+            lines.append(f"{gauge_name} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve /metrics (Prometheus) and /metrics.json on a daemon thread"""
+        registry = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = registry.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics-server").start()
+        return server
+
+# Prozessweite Registry, geteilt von App, CLI und Kernmodulen
+METRICS = Metrics()
+
+# Report-Worker werden geforkt (siehe reports.py); ein Lock, den ein anderer Thread
+# im Moment des Forks hält, bliebe im Kindprozess für immer belegt
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: setattr(METRICS, "_lock", threading.Lock()))
@@ -0,0 +1,817 @@
+"""
+PDF/DOCX report rendering, JSON/CSV exports and the content-addressed report cache.
+
+reportlab and python-docx are imported inside the render functions, so
+importing this module stays cheap for UI-only code paths.
+"""
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from functools import lru_cache
+from io import BytesIO
+from itertools import islice
+
+from .metrics import METRICS
+from .scoring import (
+    CATEGORIES,
+    CATEGORY_COLORS,
+    CATEGORY_DESCRIPTIONS,
+    DEFAULT_CATEGORY_COLOR,
+    SCORE_GRADES,
+    AnalysisResult,
+)
+
+# Reports ab dieser Größe werden als Datei gerendert und nur auf der Platte gecacht
+LARGE_REPORT_THRESHOLD = 2000                   # Aussagen
+PDF_FLOWABLE_BUFFER = 256                       # Flowables, die gleichzeitig im Speicher liegen
+PDF_SPOOL_MAX_MEMORY = 4 * 1024 * 1024          # danach schreibt SpooledTemporaryFile auf die Platte
+
+# Report-Cache
+REPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024       # im Speicher, danach Auslagerung auf die Platte
+REPORT_CACHE_MAX_DISK_BYTES = 512 * 1024 * 1024
+
+# Export-Paket: alle Formate in einem ZIP; PDF und DOCX sind bereits komprimiert
+EXPORT_BUNDLE_NAME = "DesInfo_Report"
+EXPORT_STORED_FORMATS = ('pdf', 'docx')
+
+# Report-Worker per fork: spawn und forkserver führen im Worker das __main__-Modul
+# aus, und das ist unter Streamlit das App-Skript. Ohne fork wird im Thread gerendert.
+REPORT_START_METHOD = "fork"
+
+# Stages der Render-Funktionen; mit Worker-Prozessen misst der aufrufende Prozess
+REPORT_STAGES = {'pdf': "generate_pdf_report", 'docx': "generate_docx_report"}
+
+@lru_cache(maxsize=None)
+def get_category_color(category: str) -> tuple:
+    """Get hex and reportlab color for category"""
+    from reportlab.lib import colors
+    
+    if category in CATEGORY_COLORS:
+        return CATEGORY_COLORS[category], colors.HexColor(CATEGORY_COLORS[category])
+    return DEFAULT_CATEGORY_COLOR, colors.grey
+
+def iter_pdf_flowables(result: AnalysisResult, summary: dict):
+    """Yield the report flowables one by one, so they never all exist at once"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, Spacer, PageBreak, Table, TableStyle
+    
+    styles = getSampleStyleSheet()
+    
+    title_style = ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontSize=24,
+        leading=28,
+        textColor=colors.black,
+        spaceAfter=20,
+        alignment=TA_LEFT,
+        fontName='Helvetica-Bold'
+    )
+    
+    heading_style = ParagraphStyle(
+        'Heading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        leading=20,
+        textColor=colors.black,
+        spaceAfter=10,
+        spaceBefore=15,
+        fontName='Helvetica-Bold'
+    )
+    
+    body_style = ParagraphStyle(
+        'Body',
+        parent=styles['Normal'],
+        fontSize=11,
+        leading=15,
+        alignment=TA_JUSTIFY,
+        fontName='Helvetica'
+    )
+    
+    italic_style = ParagraphStyle(
+        'Italic',
+        parent=body_style,
+        fontName='Helvetica-Oblique'
+    )
+    
+    # Title
+    yield Paragraph("Vollständige Auswertung", title_style)
+    yield Spacer(1, 0.3*cm)
+    
+    # Line
+    line = Table([['']], colWidths=[16*cm])
+    line.setStyle(TableStyle([('LINEABOVE', (0,0), (-1,0), 1, colors.grey)]))
+    yield line
+    yield Spacer(1, 0.8*cm)
+    
+    # Summary
+    yield Paragraph("Zusammenfassung", heading_style)
+    total = summary['total_statements']
+    
+    summary_text = f"Die vorliegende Analyse untersucht {total} Aussagen nach ihrer faktischen Richtigkeit und kommunikativen Qualität. Das Ergebnis zeigt eine ausgeprägte Tendenz zu {summary['grade_label']}en Darstellungen."
+    
+    yield Paragraph(summary_text, body_style)
+    yield Spacer(1, 0.8*cm)
+    yield line
+    yield Spacer(1, 0.8*cm)
+    
+    # Quantification
+    yield Paragraph("Quantifizierung", heading_style)
+    yield Paragraph(f"Anzahl Aussagen gesamt: {total}", body_style)
+    yield Spacer(1, 0.3*cm)
+    
+    for cat in CATEGORIES:
+        count = result.counts.get(cat, 0)
+        percentage = result.percentages[cat]
+        hex_color, _ = get_category_color(cat)
+        cat_text = f'<font color="{hex_color}">■</font> {cat}: {count} ({percentage:.0f} %)'
+        yield Paragraph(cat_text, body_style)
+    
+    yield Spacer(1, 0.8*cm)
+    yield line
+    yield Spacer(1, 0.8*cm)
+    
+    # Scoring
+    yield Paragraph("Scoring", heading_style)
+    score_text = f"<b>Desinfo-Score: {summary['desinfo_score']}</b><br/>{summary['grade']}: {summary['grade_label']}<br/><br/>{summary['grade_description']}"
+    yield Paragraph(score_text, body_style)
+    yield Spacer(1, 0.8*cm)
+    yield line
+    yield Spacer(1, 0.8*cm)
+    
+    # Grade Scale
+    yield Paragraph("Einteilung", heading_style)
+    for grade, (min_s, max_s, label, _) in SCORE_GRADES.items():
+        yield Paragraph(f"{grade}: {min_s} bis {max_s}: {label}", body_style)
+    
+    yield PageBreak()
+    
+    # Detailed Results
+    yield Paragraph("Vollständige Auswertung des Textes", title_style)
+    yield Spacer(1, 0.3*cm)
+    yield line
+    yield Spacer(1, 0.8*cm)
+    
+    for category in CATEGORIES:
+        cat_items = result.items(category)
+        if not cat_items:
+            continue
+        
+        yield Paragraph(f"<b>{category} ({len(cat_items)})</b>", heading_style)
+        yield Paragraph(CATEGORY_DESCRIPTIONS[category], italic_style)
+        yield Spacer(1, 0.5*cm)
+        
+        for idx, item in enumerate(cat_items, 1):
+            hex_color, _ = get_category_color(category)
+            symbol = '✓' if category == 'WAHR' else '■'
+            
+            stmt_text = f'{idx}. <font color="{hex_color}">{symbol}</font> <b>"{item.aussage}"</b>'
+            yield Paragraph(stmt_text, body_style)
+            yield Spacer(1, 0.2*cm)
+            
+            beg_text = f"– {item.begruendung}"
+            yield Paragraph(beg_text, body_style)
+            yield Spacer(1, 0.5*cm)
+        
+        yield Spacer(1, 0.5*cm)
+
+class LazyFlowables(list):
+    """Flowable list for doc.build that is refilled from a generator as pages are laid out"""
+    
+    def __init__(self, source, buffer_size: int = PDF_FLOWABLE_BUFFER):
+        super().__init__()
+        self._source = iter(source)
+        self._buffer_size = buffer_size
+    
+    def __len__(self) -> int:
+        # doc.build prüft vor jedem Flowable len(flowables), dort wird nachgefüllt
+        missing = self._buffer_size - super().__len__()
+        if missing > 0 and self._source is not None:
+            chunk = list(islice(self._source, missing))
+            if len(chunk) < missing:
+                self._source = None
+            self.extend(chunk)
+        return super().__len__()
+
+def build_pdf(target, analysis_data, summary: dict):
+    """Lay out the report into a file-like target"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate
+    
+    doc = SimpleDocTemplate(
+        target,
+        pagesize=A4,
+        topMargin=2*cm,
+        bottomMargin=2*cm,
+        leftMargin=2.5*cm,
+        rightMargin=2.5*cm
+    )
+    with METRICS.span("generate_pdf_report"):
+        doc.build(LazyFlowables(iter_pdf_flowables(AnalysisResult.of(analysis_data), summary)))
+
+def generate_pdf_report(analysis_data, summary: dict, model_info: dict = None) -> BytesIO:
+    """Generate PDF report - NO LOGO"""
+    buffer = BytesIO()
+    build_pdf(buffer, analysis_data, summary)
+    buffer.seek(0)
+    return buffer
+
+def generate_pdf_report_file(analysis_data, summary: dict, model_info: dict = None, target=None):
+    """Large-report mode: render into a spooled temporary file (or target) instead of RAM"""
+    if target is None:
+        target = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_MEMORY)
+    build_pdf(target, analysis_data, summary)
+    target.seek(0)
+    return target
+
+def get_docx_color(category: str) -> tuple:
+    """Get RGB color tuple for DOCX (R, G, B values 0-255)"""
+    color_map = {
+        'FALSCH': (220, 53, 69),        # Red
+        'DELEGITIMIERUNG': (253, 126, 20),  # Orange  
+        'VERZERRUNG': (255, 193, 7),    # Yellow
+        'FRAME': (40, 167, 69),         # Green
+        'WAHR': (0, 123, 255)           # Blue
+    }
+    return color_map.get(category, (108, 117, 125))  # Default grey
+
+# Benannte Styles der DOCX-Vorlage: (Name, kurze Style-ID für kompaktes XML)
+DOCX_STYLE_BULLET = ('DESINFO Aufzählung {category}', 'DIb{index}')
+DOCX_STYLE_SYMBOL = ('DESINFO Symbol {category}', 'DIs{index}')
+DOCX_STYLE_HEADING = ('DESINFO Überschrift {category}', 'DIh{index}')
+DOCX_STYLE_COUNT = ('DESINFO Anzahl', 'DIc')
+DOCX_STYLE_SCORE = ('DESINFO Score', 'DIsc')
+DOCX_STYLE_STATEMENT = ('DESINFO Aussage', 'DIa')
+
+def docx_style_id(style: tuple, category: str = None) -> str:
+    """Style ID of a template style, per category where applicable"""
+    index = CATEGORIES.index(category) if category in CATEGORIES else len(CATEGORIES)
+    return style[1].format(index=index)
+
+@lru_cache(maxsize=1)
+def docx_template() -> bytes:
+    """Build the report template with all named styles once per process"""
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.shared import Pt, RGBColor
+    
+    doc = Document()
+    styles = doc.styles
+    
+    def add_style(style: tuple, style_type, category: str = None):
+        new_style = styles.add_style(style[0].format(category=category or 'Sonstige'), style_type)
+        new_style.style_id = docx_style_id(style, category)
+        return new_style
+    
+    # Begründungen in 10 pt; bisher wurde dafür die Normal-Vorlage im Loop überschrieben
+    styles['Normal'].font.size = Pt(10)
+    
+    for category in CATEGORIES + [None]:
+        color = RGBColor(*get_docx_color(category))
+        
+        bullet = add_style(DOCX_STYLE_BULLET, WD_STYLE_TYPE.CHARACTER, category)
+        bullet.font.color.rgb = color
+        bullet.font.size = Pt(12)
+        
+        symbol = add_style(DOCX_STYLE_SYMBOL, WD_STYLE_TYPE.CHARACTER, category)
+        symbol.font.color.rgb = color
+        
+        heading = add_style(DOCX_STYLE_HEADING, WD_STYLE_TYPE.CHARACTER, category)
+        heading.font.color.rgb = color
+    
+    add_style(DOCX_STYLE_COUNT, WD_STYLE_TYPE.CHARACTER).font.size = Pt(11)
+    
+    score = add_style(DOCX_STYLE_SCORE, WD_STYLE_TYPE.CHARACTER)
+    score.font.bold = True
+    score.font.size = Pt(12)
+    
+    # Aussagen: fett über die Absatzvorlage, das Symbol erbt es
+    statement = add_style(DOCX_STYLE_STATEMENT, WD_STYLE_TYPE.PARAGRAPH)
+    statement.base_style = styles['Normal']
+    statement.font.bold = True
+    
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def add_styled_run(paragraph, text: str, style_id: str):
+    """Add a run with a template character style, set by ID (python-docx's by-name lookup scans all styles)"""
+    run = paragraph.add_run(text)
+    run._r.style = style_id
+    return run
+
+@METRICS.timed("generate_docx_report")
+def generate_docx_report(analysis_data, summary: dict, model_info: dict = None) -> BytesIO:
+    """Generate DOCX report with colors"""
+    from docx import Document
+    
+    result = AnalysisResult.of(analysis_data)
+    doc = Document(BytesIO(docx_template()))
+    
+    doc.add_heading('Vollständige Auswertung', 0)
+    doc.add_heading('Zusammenfassung', 1)
+    
+    total = summary['total_statements']
+    summary_text = f"Die vorliegende Analyse untersucht {total} Aussagen nach ihrer faktischen Richtigkeit und kommunikativen Qualität."
+    doc.add_paragraph(summary_text)
+    
+    doc.add_heading('Quantifizierung', 1)
+    doc.add_paragraph(f"Anzahl Aussagen gesamt: {total}")
+    
+    # Add colored category counts
+    for cat in CATEGORIES:
+        count = result.counts.get(cat, 0)
+        percentage = result.percentages[cat]
+        
+        p = doc.add_paragraph()
+        add_styled_run(p, "■ ", docx_style_id(DOCX_STYLE_BULLET, cat))
+        add_styled_run(p, f"{cat}: {count} ({percentage:.0f} %)", docx_style_id(DOCX_STYLE_COUNT))
+    
+    doc.add_heading('Scoring', 1)
+    
+    score_p = doc.add_paragraph()
+    add_styled_run(score_p, f"Desinfo-Score: {summary['desinfo_score']}", docx_style_id(DOCX_STYLE_SCORE))
+    
+    doc.add_paragraph(f"{summary['grade']}: {summary['grade_label']}")
+    doc.add_paragraph(summary['grade_description'])
+    
+    doc.add_heading('Einteilung', 1)
+    for grade, (min_s, max_s, label, _) in SCORE_GRADES.items():
+        doc.add_paragraph(f"{grade}: {min_s} bis {max_s}: {label}")
+    
+    doc.add_page_break()
+    doc.add_heading('Vollständige Auswertung des Textes', 1)
+    
+    statement_style = docx_style_id(DOCX_STYLE_STATEMENT)
+    
+    for category in CATEGORIES:
+        cat_items = result.items(category)
+        if not cat_items:
+            continue
+        
+        symbol_style = docx_style_id(DOCX_STYLE_SYMBOL, category)
+        symbol = '✓' if category == 'WAHR' else '■'
+        
+        heading = doc.add_heading(level=2)
+        add_styled_run(heading, f"{category} ({len(cat_items)})", docx_style_id(DOCX_STYLE_HEADING, category))
+        
+        doc.add_paragraph(CATEGORY_DESCRIPTIONS[category])
+        
+        # Jede Aussage fügt nur Text und Style-IDs hinzu, keine Formatierung pro Run
+        for idx, item in enumerate(cat_items, 1):
+            stmt_p = doc.add_paragraph()
+            stmt_p._p.style = statement_style
+            add_styled_run(stmt_p, f'{idx}. {symbol} ', symbol_style)
+            stmt_p.add_run(f'"{item.aussage}"')
+            
+            doc.add_paragraph(f"– {item.begruendung}")
+    
+    buffer = BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+def comparison_rows(comparison) -> list:
+    """Score table rows of a model comparison (shared by PDF and DOCX)"""
+    rows = [['Model', 'Score', 'Grade', 'Aussagen', 'Dauer']]
+    for run in comparison.runs:
+        if run.ok:
+            rows.append([run.label, str(run.summary['desinfo_score']), f"{run.summary['grade']}: {run.summary['grade_label']}",
+                         str(len(run.result)), f"{run.elapsed:.1f} s"])
+        else:
+            rows.append([run.label, '–', 'Fehler', '–', f"{run.elapsed:.1f} s"])
+    return rows
+
+def agreement_rows(comparison) -> list:
+    """Agreement matrix rows with model labels, values in percent"""
+    runs = comparison.ok_runs
+    matrix = comparison.agreement_matrix()
+    rows = [[''] + [run.label for run in runs]]
+    for run, values in zip(runs, matrix):
+        rows.append([run.label] + [f"{value:.0%}" for value in values])
+    return rows
+
+def generate_comparison_pdf(comparison) -> BytesIO:
+    """PDF report of a model comparison: scores, agreement matrix and disagreements"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    from xml.sax.saxutils import escape
+    
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=24, leading=28,
+                                 spaceAfter=20, fontName='Helvetica-Bold')
+    heading_style = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=16, leading=20,
+                                   spaceAfter=10, spaceBefore=15, fontName='Helvetica-Bold')
+    body_style = ParagraphStyle('Body', parent=styles['Normal'], fontSize=11, leading=15, fontName='Helvetica')
+    cell_style = ParagraphStyle('Cell', parent=body_style, fontSize=9, leading=11)
+    table_style = TableStyle([
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
+    
+    def table(rows):
+        flowable = Table([[Paragraph(escape(cell), cell_style) for cell in row] for row in rows], repeatRows=1)
+        flowable.setStyle(table_style)
+        return flowable
+    
+    runs = comparison.ok_runs
+    story = [
+        Paragraph("Modellvergleich", title_style),
+        Paragraph(f"{len(comparison.statements)} Aussagen, {len(comparison.runs)} Models, "
+                  f"Gesamtdauer {comparison.elapsed:.1f} s", body_style),
+        Paragraph("Scores", heading_style),
+        table(comparison_rows(comparison)),
+    ]
+    if len(runs) > 1:
+        story += [
+            Paragraph("Übereinstimmung", heading_style),
+            Paragraph("Anteil der Aussagen, die beide Models derselben Kategorie zuordnen.", body_style),
+            Spacer(1, 0.3*cm),
+            table(agreement_rows(comparison)),
+        ]
+    
+    disagreements = comparison.disagreements()
+    story.append(Paragraph(f"Abweichende Bewertungen ({len(disagreements)})", heading_style))
+    for idx, statement, cats in disagreements:
+        story.append(Paragraph(f'{idx + 1}. <b>"{escape(statement)}"</b>', body_style))
+        labels = ', '.join(
+            f'{escape(run.label)}: <font color="{get_category_color(cat)[0]}">{cat or "–"}</font>'
+            for run, cat in zip(runs, cats)
+        )
+        story.append(Paragraph(labels, cell_style))
+        story.append(Spacer(1, 0.3*cm))
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm,
+                            leftMargin=2.5*cm, rightMargin=2.5*cm)
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+def generate_comparison_docx(comparison) -> BytesIO:
+    """DOCX report of a model comparison: scores, agreement matrix and disagreements"""
+    from docx import Document
+    
+    doc = Document(BytesIO(docx_template()))
+    doc.add_heading('Modellvergleich', 0)
+    doc.add_paragraph(f"{len(comparison.statements)} Aussagen, {len(comparison.runs)} Models, "
+                      f"Gesamtdauer {comparison.elapsed:.1f} s")
+    
+    def add_table(rows):
+        table = doc.add_table(rows=len(rows), cols=len(rows[0]))
+        table.style = 'Table Grid'
+        for row_cells, row in zip(table.rows, rows):
+            for cell, text in zip(row_cells.cells, row):
+                cell.text = text
+    
+    doc.add_heading('Scores', 1)
+    add_table(comparison_rows(comparison))
+    
+    runs = comparison.ok_runs
+    if len(runs) > 1:
+        doc.add_heading('Übereinstimmung', 1)
+        doc.add_paragraph("Anteil der Aussagen, die beide Models derselben Kategorie zuordnen.")
+        add_table(agreement_rows(comparison))
+    
+    disagreements = comparison.disagreements()
+    doc.add_heading(f'Abweichende Bewertungen ({len(disagreements)})', 1)
+    statement_style = docx_style_id(DOCX_STYLE_STATEMENT)
+    for idx, statement, cats in disagreements:
+        stmt_p = doc.add_paragraph()
+        stmt_p._p.style = statement_style
+        stmt_p.add_run(f'{idx + 1}. "{statement}"')
+        
+        p = doc.add_paragraph()
+        for position, (run, cat) in enumerate(zip(runs, cats)):
+            p.add_run(f"{', ' if position else ''}{run.label}: ")
+            add_styled_run(p, cat or '–', docx_style_id(DOCX_STYLE_HEADING, cat))
+    
+    buffer = BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+def generate_json_export(analysis_data, summary: dict, model_info: dict = None) -> BytesIO:
+    """Raw results with summary and model as JSON"""
+    payload = {'model': model_info, 'summary': summary, 'results': AnalysisResult.of(analysis_data).to_list()}
+    return BytesIO(json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8'))
+
+def generate_csv_export(analysis_data, summary: dict, model_info: dict = None) -> BytesIO:
+    """One row per statement; UTF-8 with BOM so Excel detects the encoding"""
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(['Nr', 'Aussage', 'Kategorie', 'Punkte', 'Begründung'])
+    for idx, record in enumerate(AnalysisResult.of(analysis_data).records, 1):
+        writer.writerow([idx, record.aussage, record.kategorie, record.punkte, record.begruendung])
+    return BytesIO(text.getvalue().encode('utf-8-sig'))
+
+REPORT_FORMATS = {
+    'pdf': generate_pdf_report,
+    'docx': generate_docx_report
+}
+
+EXPORT_FORMATS = {
+    **REPORT_FORMATS,
+    'json': generate_json_export,
+    'csv': generate_csv_export
+}
+
+def render_export(fmt: str, analysis_data, summary: dict, model_info: dict = None) -> bytes:
+    """Render one export format to bytes; module-level so report worker processes can run it"""
+    if fmt == 'pdf' and len(AnalysisResult.of(analysis_data)) >= LARGE_REPORT_THRESHOLD:
+        with generate_pdf_report_file(analysis_data, summary, model_info) as f:
+            return f.read()
+    return EXPORT_FORMATS[fmt](analysis_data, summary, model_info).getvalue()
+
+def render_pdf_to_path(path: str, analysis_data, summary: dict, model_info: dict = None):
+    """Large-report mode into a file; module-level so report worker processes can run it"""
+    with open(path, 'wb') as f:
+        generate_pdf_report_file(analysis_data, summary, model_info, target=f)
+
+COMPARISON_FORMATS = {
+    'pdf': generate_comparison_pdf,
+    'docx': generate_comparison_docx
+}
+
+def report_digest(analysis_data: list, summary: dict, model_info: dict = None) -> str:
+    """Content hash of an analysis and its model, the base of all report cache keys"""
+    if isinstance(analysis_data, AnalysisResult):
+        analysis_data = analysis_data.to_list()
+    # Reports und Exporte nennen das Model: gleiche Ergebnisse eines anderen Models sind ein anderer Report
+    payload = json.dumps([analysis_data, summary, model_info], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def read_report(report) -> bytes:
+    """Bytes of a cached report (bytes, or the file path of a large report), None if missing or pruned"""
+    if report is None or isinstance(report, bytes):
+        return report
+    try:
+        with open(report, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def comparison_digest(comparison) -> str:
+    """Content hash of a model comparison, the base of its report cache keys"""
+    payload = json.dumps(comparison.to_dict(), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ReportCache:
+    """Content-addressed cache of rendered reports, LRU-bounded in memory with optional disk spill"""
+    
+    def __init__(self, max_bytes: int = REPORT_CACHE_MAX_BYTES, spill_dir: str = None,
+                 max_disk_bytes: int = REPORT_CACHE_MAX_DISK_BYTES, processes: int = 0):
+        self.max_bytes = max_bytes
+        # Größere Reports bleiben auf der Platte und werden als Datei ausgeliefert
+        self.max_entry_bytes = max_bytes // 8
+        self.spill_dir = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._inflight = {}
+        self._disk_only = set()
+        self._lock = threading.Lock()
+        # Ein Worker: Vorab-Rendering läuft nacheinander und blockiert keine Session
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-prerender")
+        # processes > 0: Rendern in eigenen Prozessen, damit reportlab nicht den GIL
+        # des Streamlit-Prozesses blockiert; 0 = im aufrufenden Thread
+        self.processes = processes if REPORT_START_METHOD in multiprocessing.get_all_start_methods() else 0
+        self._process_pool = None
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+    
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, key)
+    
+    def _spill(self, key: str, data: bytes):
+        """Write a report to the spill directory atomically, so get() never sees half a file"""
+        path = self._spill_path(key)
+        # Eigene .tmp-Datei pro Thread: derselbe Report kann gleichzeitig ausgelagert werden
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def get(self, key: str):
+        """Return the cached bytes, the file path of a large spilled report, or None
+        
+        Large reports are returned as a path rather than an open file, so callers
+        that only check for a cached report do not leak a file handle; read them
+        with read_report.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        path = self._spill_path(key) if self.spill_dir else None
+        if path and os.path.exists(path):
+            if key in self._disk_only or os.path.getsize(path) > self.max_entry_bytes:
+                return path
+            with open(path, 'rb') as f:
+                data = f.read()
+            self.put(key, data)
+            return data
+        return None
+    
+    def put(self, key: str, data: bytes):
+        """Store bytes, evicting least recently used entries to disk (or dropping them)"""
+        if self.spill_dir and len(data) > self.max_entry_bytes:
+            self._spill(key, data)
+            self._disk_only.add(key)
+            self._prune_disk()
+            return
+        
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                old_key, old_data = self._entries.popitem(last=False)
+                self._size -= len(old_data)
+                evicted.append((old_key, old_data))
+        if self.spill_dir and evicted:
+            for old_key, old_data in evicted:
+                self._spill(old_key, old_data)
+            self._prune_disk()
+    
+    def _prune_disk(self):
+        """Delete the oldest spilled reports beyond max_disk_bytes"""
+        # *.tmp sind Reports, die gerade (evtl. in einem anderen Thread) gerendert werden
+        files = [os.path.join(self.spill_dir, name) for name in os.listdir(self.spill_dir) if not name.endswith(".tmp")]
+        files = sorted((os.path.getmtime(path), os.path.getsize(path), path) for path in files)
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+    
+    def start_workers(self):
+        """Fork the report worker processes now; call it before the process starts its own threads
+        
+        A forked child inherits only the forking thread, so a lock another thread
+        holds at that moment stays locked in the worker forever. Forking once at
+        startup keeps the job, prerender, HTTP and metrics threads out of that
+        window; only the server's own threads remain.
+        """
+        with self._lock:
+            if not self.processes or self._process_pool is not None:
+                return self._process_pool
+            # Mit fork startet der Pool alle Worker beim ersten Auftrag und behält sie
+            pool = self._process_pool = ProcessPoolExecutor(self.processes,
+                                                            multiprocessing.get_context(REPORT_START_METHOD))
+            pool.submit(os.getpid).result()
+        return pool
+    
+    def _render(self, func, *args, stage: str = None):
+        """Run a module-level render function in a worker process, or here if processes is 0"""
+        pool = self.start_workers()
+        if pool is None:
+            return func(*args)
+        args = [arg.to_list() if isinstance(arg, AnalysisResult) else arg for arg in args]
+        try:
+            # Spans im Worker gehen mit dessen Prozess verloren: hier messen, samt Übergabe an den Worker
+            with METRICS.span(stage) if stage else nullcontext():
+                return pool.submit(func, *args).result()
+        except BrokenProcessPool:
+            # Abgestürzter Worker (z.B. OOM): nicht aus dem laufenden Prozess neu forken,
+            # sondern ab jetzt im aufrufenden Thread rendern
+            with self._lock:
+                if self._process_pool is pool:
+                    self._process_pool = None
+                    self.processes = 0
+            METRICS.inc("report_pool_broken")
+            raise
+    
+    def _render_large_pdf(self, key: str, analysis_data, summary: dict, model_info: dict = None):
+        """Render a large PDF straight to disk and return its path"""
+        if not self.spill_dir:
+            return self._render(render_export, 'pdf', analysis_data, summary, model_info, stage=REPORT_STAGES['pdf'])
+        path = self._spill_path(key)
+        try:
+            self._render(render_pdf_to_path, f"{path}.tmp", analysis_data, summary, model_info,
+                         stage=REPORT_STAGES['pdf'])
+        except BaseException:
+            # Halb geschriebene Datei nicht liegen lassen; _prune_disk übergeht *.tmp
+            if os.path.exists(f"{path}.tmp"):
+                os.remove(f"{path}.tmp")
+            raise
+        os.replace(f"{path}.tmp", path)
+        self._disk_only.add(key)
+        self._prune_disk()
+        return path
+    
+    def _get_or_build(self, key: str, build):
+        """Return the cached entry or build it, at most once per key across threads"""
+        data = self.get(key)
+        if data is not None:
+            return data
+        
+        with self._lock:
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+        
+        if not owner:
+            # Gleicher Report wird gerade gerendert (z.B. im Hintergrund)
+            event.wait()
+            data = self.get(key)
+            if data is not None:
+                return data
+        
+        try:
+            return build()
+        finally:
+            if owner:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+    
+    def get_or_render(self, fmt: str, analysis_data, summary: dict, model_info: dict = None,
+                      digest: str = None):
+        """Return the report (bytes, or the file path of a large report), rendering it at most once per content hash"""
+        key = f"{digest or report_digest(analysis_data, summary, model_info)}.{fmt}"
+        
+        def build():
+            if fmt == 'pdf' and len(AnalysisResult.of(analysis_data)) >= LARGE_REPORT_THRESHOLD:
+                return self._render_large_pdf(key, analysis_data, summary, model_info)
+            data = self._render(render_export, fmt, analysis_data, summary, model_info, stage=REPORT_STAGES.get(fmt))
+            self.put(key, data)
+            return data
+        
+        return self._get_or_build(key, build)
+    
+    def get_or_render_bundle(self, analysis_data, summary: dict, model_info: dict = None, digest: str = None):
+        """ZIP with all EXPORT_FORMATS, rendered concurrently (in worker processes if configured)"""
+        digest = digest or report_digest(analysis_data, summary, model_info)
+        key = f"{digest}.zip"
+        
+        def build():
+            with METRICS.span("export_bundle"), ThreadPoolExecutor(len(EXPORT_FORMATS)) as threads:
+                futures = {fmt: threads.submit(self.get_or_render, fmt, analysis_data, summary, model_info, digest)
+                           for fmt in EXPORT_FORMATS}
+                buffer = BytesIO()
+                created = time.localtime()[:6]
+                with zipfile.ZipFile(buffer, 'w') as bundle:
+                    for fmt, future in futures.items():
+                        compression = zipfile.ZIP_STORED if fmt in EXPORT_STORED_FORMATS else zipfile.ZIP_DEFLATED
+                        info = zipfile.ZipInfo(f"{EXPORT_BUNDLE_NAME}.{fmt}", created)
+                        info.compress_type = compression
+                        report = future.result()
+                        if isinstance(report, bytes):
+                            bundle.writestr(info, report)
+                        else:
+                            # Große Reports liegen als Datei vor und werden durchgereicht
+                            with open(report, 'rb') as source, bundle.open(info, 'w', force_zip64=True) as target:
+                                shutil.copyfileobj(source, target)
+            data = buffer.getvalue()
+            self.put(key, data)
+            return data
+        
+        return self._get_or_build(key, build)
+    
+    def get_or_render_comparison(self, fmt: str, comparison, digest: str = None):
+        """Return the comparison report as bytes, rendering it at most once per content hash"""
+        key = f"{digest or comparison_digest(comparison)}.compare.{fmt}"
+        
+        def build():
+            data = COMPARISON_FORMATS[fmt](comparison).getvalue()
+            self.put(key, data)
+            return data
+        
+        return self._get_or_build(key, build)
+    
+    def prerender(self, analysis_data, summary: dict, model_info: dict = None):
+        """Render all formats in the background so downloads are instant"""
+        digest = report_digest(analysis_data, summary, model_info)
+        for fmt in REPORT_FORMATS:
+            self._executor.submit(self.get_or_render, fmt, analysis_data, summary, model_info, digest)
+
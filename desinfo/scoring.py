@@ -0,0 +1,161 @@
+"""
+DESINFO scoring: categories, grades and the indexed analysis result model.
+"""
+from collections import deque
+
+from .metrics import METRICS
+
+# Kategorie Scoring
+CATEGORY_POINTS = {
+    'FALSCH': 5,
+    'DELEGITIMIERUNG': 4,
+    'VERZERRUNG': 3,
+    'FRAME': 1,
+    'WAHR': 0
+}
+
+# Score-Grade Mapping
+SCORE_GRADES = {
+    'A': (0.0, 0.4, 'wahr', 'Die Aussagen entsprechen nachprüfbaren Fakten und sind wahrheitsgetreu.'),
+    'B': (0.5, 1.4, 'geframed', 'Die Aussagen enthalten wahre Kernaussagen, die durch normative Framings eingefärbt werden.'),
+    'C': (1.5, 2.4, 'verzerrend', 'Die Aussagen enthalten formal richtige Kernaussagen, die durch Übertreibung, Verkürzung oder Kontextausblendung ein schiefes Bild erzeugen.'),
+    'D': (2.5, 3.4, 'demokratisch dysfunktional', 'Die Aussagen enthalten substanzielle Falschbehauptungen und delegitimierende Elemente, die den demokratischen Diskurs belasten.'),
+    'E': (3.5, 5.0, 'demokratisch destruktiv', 'Die Aussagen sind überwiegend falsch und delegitimierend, untergraben systematisch Vertrauen und demokratische Institutionen.')
+}
+
+CATEGORIES = ['FALSCH', 'DELEGITIMIERUNG', 'VERZERRUNG', 'FRAME', 'WAHR']
+
+CATEGORY_COLORS = {
+    'FALSCH': '#dc3545',
+    'DELEGITIMIERUNG': '#fd7e14',
+    'VERZERRUNG': '#ffc107',
+    'FRAME': '#28a745',
+    'WAHR': '#007bff'
+}
+DEFAULT_CATEGORY_COLOR = '#6c757d'
+
+CATEGORY_DESCRIPTIONS = {
+    'FALSCH': 'Objektiv widerlegte Behauptungen. Es liegen belastbare Daten oder Ereignisprotokolle vor, die das Gegenteil zeigen.',
+    'DELEGITIMIERUNG': 'Abwertung oder Untergrabung von Personen, Gruppen oder Institutionen. Sprachliche Diskreditierungen, Kampfbegriffe oder systematische Diffamierungen.',
+    'VERZERRUNG': 'Formal richtige Kernaussagen, die durch Übertreibung, Verkürzung oder Kontextausblendung ein schiefes Bild erzeugen.',
+    'FRAME': 'Sprachliche Deutungsrahmen, die neutrale Sachverhalte emotional oder normativ aufladen.',
+    'WAHR': 'Sachlich zutreffende Aussagen, die überprüfbar sind und keinen überzogenen Frame, keine Verzerrung oder Delegitimierung enthalten.'
+}
+
+# ============================================
+# RESULT MODEL
+# ============================================
+
+def get_category_hex(category: str) -> str:
+    """Get hex color for category (UI paths, no reportlab needed)"""
+    return CATEGORY_COLORS.get(category, DEFAULT_CATEGORY_COLOR)
+
+class StatementResult:
+    """One analysed statement"""
+    __slots__ = ('aussage', 'kategorie', 'begruendung', 'punkte')
+    
+    def __init__(self, aussage: str, kategorie: str, begruendung: str, punkte: int):
+        self.aussage = aussage
+        self.kategorie = kategorie
+        self.begruendung = begruendung
+        self.punkte = punkte
+    
+    def to_dict(self) -> dict:
+        return {'aussage': self.aussage, 'kategorie': self.kategorie,
+                'begründung': self.begruendung, 'punkte': self.punkte}
+
+class AnalysisResult:
+    """API response indexed in a single pass: records, per-category index, counts, percentages and points"""
+    __slots__ = ('records', 'by_category', 'counts', 'percentages', 'total_points')
+    
+    def __init__(self, analysis_data: list):
+        self.records = []
+        self.by_category = {cat: [] for cat in CATEGORIES}
+        self.total_points = 0
+        for item in analysis_data:
+            category = item['kategorie']
+            record = StatementResult(
+                item.get('aussage', ''),
+                category,
+                item.get('begründung', ''),
+                item.get('punkte', CATEGORY_POINTS.get(category, 0))
+            )
+            self.records.append(record)
+            self.by_category.setdefault(category, []).append(record)
+            self.total_points += CATEGORY_POINTS.get(category, 0)
+        
+        total = len(self.records)
+        self.counts = {cat: len(records) for cat, records in self.by_category.items() if records}
+        self.percentages = {cat: (len(records) / total * 100) if total > 0 else 0
+                            for cat, records in self.by_category.items()}
+    
+    @classmethod
+    def of(cls, analysis_data) -> 'AnalysisResult':
+        """Accept an AnalysisResult or a raw API result list"""
+        return analysis_data if isinstance(analysis_data, cls) else cls(analysis_data)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def items(self, category: str) -> list:
+        return self.by_category.get(category, [])
+    
+    def to_list(self) -> list:
+        return [record.to_dict() for record in self.records]
+
+class RunningSummary:
+    """Counts, points and the newest statements per category, updated one result at a time (live view)"""
+    __slots__ = ('counts', 'total_points', 'total', 'preview', 'newest')
+    
+    def __init__(self, preview: int = 3):
+        self.preview = preview
+        self.counts = {}
+        self.total_points = 0
+        self.total = 0
+        self.newest = {cat: deque(maxlen=preview) for cat in CATEGORIES}
+    
+    def add(self, item: dict):
+        category = item['kategorie']
+        self.counts[category] = self.counts.get(category, 0) + 1
+        self.total_points += CATEGORY_POINTS.get(category, 0)
+        self.total += 1
+        self.newest.setdefault(category, deque(maxlen=self.preview)).append(StatementResult(
+            item.get('aussage', ''),
+            category,
+            item.get('begründung', ''),
+            item.get('punkte', CATEGORY_POINTS.get(category, 0))
+        ))
+    
+    def percentage(self, category: str) -> float:
+        return self.counts.get(category, 0) / self.total * 100 if self.total else 0
+    
+    def summary(self) -> dict:
+        """Same keys as calculate_summary"""
+        return _summary(self.counts, self.total_points, self.total)
+
+def score_grade(desinfo_score: float) -> tuple:
+    """(grade, label, description) for a DESINFO score"""
+    for grade, (min_score, max_score, label, desc) in SCORE_GRADES.items():
+        if min_score <= desinfo_score <= max_score:
+            return grade, label, desc
+    return 'E', '', ''
+
+@METRICS.timed("calculate_summary")
+def calculate_summary(analysis_data) -> dict:
+    """Calculate summary statistics"""
+    result = AnalysisResult.of(analysis_data)
+    return _summary(result.counts, result.total_points, len(result))
+
+def _summary(category_counts: dict, total_points: int, total_statements: int) -> dict:
+    desinfo_score = total_points / total_statements if total_statements > 0 else 0
+    grade, grade_label, grade_description = score_grade(desinfo_score)
+    
+    return {
+        'total_statements': total_statements,
+        'category_counts': dict(category_counts),
+        'total_points': total_points,
+        'desinfo_score': round(desinfo_score, 1),
+        'grade': grade,
+        'grade_label': grade_label,
+        'grade_description': grade_description
+    }
@@ -0,0 +1,140 @@
+"""
+Splitting input text into statements and normalizing them for lookups.
+"""
+import re
+import unicodedata
+
+# Aufteilung: pro Zeile bzw. an | (Standard) oder Satzsegmentierung für Fließtext
+SPLIT_LINES = "lines"
+SPLIT_SENTENCES = "sentences"
+
+SENTENCE_MAX_CHARS = 600   # längere Sätze werden an Satzzeichen bzw. Leerzeichen geteilt
+SEGMENT_CHUNK_CHARS = 64 * 1024  # Puffer beim Segmentieren von Zeilenströmen ohne Leerzeilen
+
+# Abkürzungen ohne Punkt, kleingeschrieben; einzelne Buchstaben (z. B., d. h.) gelten immer als Abkürzung
+ABBREVIATIONS = frozenset("""
+    abb abs abschn abt adr allg art aufl bd bde betr bspw bzgl bzw ca chr dgl dipl dr dt ebd einschl engl
+    etc evtl exkl fa fam ff fr frl gebr gegr gem ggf ggü hd hg hr hrsg inkl jh jhd jr kap kfm kl lt max
+    mio mind min mrd mrs mr nachf nr od pkt prof rd rel sog spr st std str tel tsd usw verf vgl vs wg
+    zb zit zt zzgl
+    jan feb febr mär apr jun jul aug sep sept okt nov dez
+""".split())
+
+# Kandidat für ein Satzende: Satzzeichen, optional schließende Anführungszeichen/Klammern, dann Leerraum
+_BOUNDARY = re.compile(r'[.!?…]+[\'"»«“”‘’)\]]*(?=\s)')
+_PARAGRAPH = re.compile(r'\n[ \t]*\n\s*')
+_SOFT_BREAK = re.compile(r'.*[,;:–—]\s', re.S)
+
+def parse_statements(text: str, mode: str = SPLIT_LINES) -> list:
+    """Parse statements from text"""
+    if mode == SPLIT_SENTENCES:
+        return list(segment_sentences(text))
+    if '|' in text:
+        statements = [s.strip() for s in text.split('|') if s.strip()]
+    else:
+        statements = [s.strip() for s in text.split('\n') if s.strip()]
+    return statements
+
+def normalize_statement(text: str) -> str:
+    """Normalize a statement for cache lookups (Unicode NFC, collapsed whitespace)"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+def _is_sentence_end(text: str, start: int, match) -> bool:
+    """Decide a boundary candidate: abbreviations and ordinals do not end a sentence"""
+    # Leerraum ist bereits auf einzelne Leerzeichen reduziert
+    end = match.end()
+    if end + 1 >= len(text):
+        return True
+    next_char = text[end + 1]
+    punct = text[match.start()]
+    
+    if punct == '.':
+        token_start = max(start, text.rfind(' ', start, match.start()) + 1)
+        token = text[token_start:match.start()].lstrip('(„»"\'')
+        word = token.replace('.', '').lower()
+        # z. B., d. h., u. a. und bekannte Abkürzungen
+        if len(word) == 1 and word.isalpha() or word in ABBREVIATIONS:
+            return False
+        # Zusammengeschriebene Abkürzungen (u.a., z.B., Dipl.-Ing.), aber keine Zahlen oder Domains
+        if '.' in token and not word.isdigit() and all(len(part) <= 4 for part in token.split('.')):
+            return False
+        # Ordinalzahlen: "am 3. Oktober", "im 20. Jahrhundert"; Jahreszahlen beenden Sätze
+        if token.isdigit() and len(token) <= 2:
+            return False
+    
+    # Ein neuer Satz beginnt groß, mit einer Ziffer oder einem Anführungszeichen
+    return next_char.isupper() or next_char.isdigit() or next_char in '„»"\'(['
+
+def _quote_balance(text: str, start: int, end: int) -> tuple:
+    """(opening minus closing typographic quotes, straight quotes) in text[start:end]"""
+    depth = (text.count('„', start, end) + text.count('»', start, end)
+             - text.count('“', start, end) - text.count('«', start, end))
+    return depth, text.count('"', start, end)
+
+def cap_length(sentence: str, max_chars: int = SENTENCE_MAX_CHARS):
+    """Split an overlong sentence at the last clause break (or space) before the limit"""
+    while len(sentence) > max_chars:
+        head = sentence[:max_chars]
+        soft = _SOFT_BREAK.match(head)
+        cut = soft.end() if soft else head.rfind(' ') + 1
+        if cut <= 0:
+            cut = max_chars
+        yield sentence[:cut].strip()
+        sentence = sentence[cut:].strip()
+    if sentence:
+        yield sentence
+
+def segment_sentences(text: str, max_chars: int = SENTENCE_MAX_CHARS):
+    """Split continuous German text into sentences; paragraphs (blank lines) always end a sentence"""
+    for paragraph in _PARAGRAPH.split(text):
+        paragraph = ' '.join(paragraph.split())
+        start = scanned = 0
+        depth = straight = 0   # Zitatstand seit start, fortlaufend gezählt
+        pending = []           # Satzenden, die nur wegen eines offenen Zitats verworfen wurden
+        for match in _BOUNDARY.finditer(paragraph):
+            end = match.end()
+            opened, quotes = _quote_balance(paragraph, scanned, end)
+            depth += opened
+            straight += quotes
+            scanned = end
+            if not _is_sentence_end(paragraph, start, match):
+                continue
+            too_long = end - start > max_chars
+            if (depth > 0 or straight % 2) and not too_long:
+                pending.append(end)
+                continue
+            # Zu lang für ein Zitat: das Anführungszeichen war unpaarig, also doch an jedem Satzende teilen
+            for cut in (pending + [end] if too_long else [end]):
+                yield from cap_length(paragraph[start:cut], max_chars)
+                start = cut + 1
+            pending = []
+            depth = straight = 0
+            scanned = start
+        # Zitat bis zum Absatzende offen: unpaarig
+        for cut in pending:
+            yield from cap_length(paragraph[start:cut], max_chars)
+            start = cut + 1
+        if start < len(paragraph):
+            yield from cap_length(paragraph[start:], max_chars)
+
+def segment_stream(lines, chunk_chars: int = SEGMENT_CHUNK_CHARS):
+    """Sentences from a stream of lines, buffering one paragraph (or chunk_chars) at a time"""
+    buffer = []
+    size = 0
+    for line in lines:
+        if not line.strip():
+            if buffer:
+                yield from segment_sentences(' '.join(buffer))
+                buffer = []
+                size = 0
+            continue
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= chunk_chars:
+            # Der letzte Satz kann in den nächsten Zeilen weitergehen
+            sentences = list(segment_sentences(' '.join(buffer)))
+            yield from sentences[:-1]
+            buffer = sentences[-1:]
+            size = len(buffer[0]) if buffer else 0
+    if buffer:
+        yield from segment_sentences(' '.join(buffer))